@@ -0,0 +1,268 @@
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from .base import AgentType, BaseAgent
+
+logger = logging.getLogger(__name__)
+
+Operation = Callable[[BaseAgent], Awaitable[Any]]
+
+@dataclass
+class PoolStats:
+    completed: int = 0
+    failed: int = 0
+    stolen: int = 0
+    scaled_up: int = 0
+    scaled_down: int = 0
+
+@dataclass
+class _Job:
+    operation: Operation
+    future: asyncio.Future
+    queued_at: float = field(default_factory=time.monotonic)
+
+class _Instance:
+    """One agent with its local job queue and a worker per task slot"""
+
+    def __init__(self, agent: BaseAgent):
+        self.agent = agent
+        self.jobs: Deque[_Job] = deque()
+        self.workers: List[asyncio.Task] = []
+        self.busy = 0
+        self.retired = False
+
+class AgentPool:
+    """A pool of interchangeable agent instances of one AgentType.
+
+    Work submitted to the pool queues instead of failing when every
+    instance is at its max_concurrent_tasks. Each instance runs one worker
+    per task slot, so an instance never exceeds its limit.
+
+    Jobs go to a local queue per instance: the instance an affinity key
+    (e.g. a session id) hashes to, otherwise the shortest queue. Workers
+    take the oldest job from their own queue and, when it is empty, steal
+    the oldest job from the longest queue of another instance, so no job
+    waits behind a busy instance while another sits idle.
+
+    The pool grows by one instance whenever more than scale_up_depth jobs
+    per instance are waiting, up to max_size, and retires instances that
+    stay idle for idle_timeout seconds, down to min_size.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], BaseAgent],
+        min_size: int = 1,
+        max_size: int = 4,
+        scale_up_depth: int = 2,
+        idle_timeout: float = 30.0
+    ):
+        if min_size < 1 or max_size < min_size:
+            raise ValueError("Pool size must satisfy 1 <= min_size <= max_size")
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.scale_up_depth = scale_up_depth
+        self.idle_timeout = idle_timeout
+        self.agent_type: Optional[AgentType] = None
+        self.stats = PoolStats()
+        self._instances: List[_Instance] = []
+        self._idle: Deque[Tuple[_Instance, asyncio.Future]] = deque()
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return len(self._instances)
+
+    @property
+    def agents(self) -> List[BaseAgent]:
+        return [instance.agent for instance in self._instances]
+
+    def start(self) -> None:
+        """Create the minimum number of instances (must run on the event loop)"""
+        while len(self._instances) < self.min_size:
+            self._add_instance()
+
+    async def shutdown(self) -> None:
+        """Stop all workers; queued jobs are cancelled"""
+        self._closed = True
+        workers = [worker for instance in self._instances for worker in instance.workers]
+        for instance in self._instances:
+            for job in instance.jobs:
+                job.future.cancel()
+            instance.jobs.clear()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._instances.clear()
+        self._idle.clear()
+
+    async def submit(self, operation: Operation, affinity: Optional[Hashable] = None) -> Any:
+        """Run operation(agent) on a pooled agent, waiting for capacity if needed"""
+        return await self._enqueue(operation, affinity)
+
+    @asynccontextmanager
+    async def acquire(self, affinity: Optional[Hashable] = None) -> AsyncIterator[BaseAgent]:
+        """Lease an agent task slot for the duration of the block.
+
+        Leases wait in the same queues as submitted jobs, oldest first.
+        """
+        loop = asyncio.get_running_loop()
+        leased: asyncio.Future = loop.create_future()
+        released = asyncio.Event()
+
+        async def lease(agent: BaseAgent) -> None:
+            if leased.done():
+                return  # The caller gave up waiting
+            leased.set_result(agent)
+            await released.wait()
+
+        job = self._enqueue(lease, affinity)
+        try:
+            yield await leased
+        finally:
+            released.set()
+            if leased.cancelled():
+                job.cancel()  # Still queued; workers skip cancelled jobs
+
+    def get_metrics(self) -> Dict[str, Any]:
+        queued = sum(len(instance.jobs) for instance in self._instances)
+        oldest = min(
+            (instance.jobs[0].queued_at for instance in self._instances if instance.jobs),
+            default=None
+        )
+        return {
+            "agent_type": self.agent_type.value if self.agent_type else None,
+            "size": len(self._instances),
+            "queued": queued,
+            "busy": sum(instance.busy for instance in self._instances),
+            "capacity": sum(instance.agent.config.max_concurrent_tasks for instance in self._instances),
+            "oldest_wait_seconds": time.monotonic() - oldest if oldest is not None else 0.0,
+            "completed": self.stats.completed,
+            "failed": self.stats.failed,
+            "stolen": self.stats.stolen,
+            "scaled_up": self.stats.scaled_up,
+            "scaled_down": self.stats.scaled_down
+        }
+
+    def _enqueue(self, operation: Operation, affinity: Optional[Hashable]) -> asyncio.Future:
+        if self._closed:
+            raise RuntimeError("Agent pool is shut down")
+        if not self._instances:
+            self.start()
+
+        if affinity is not None:
+            instance = self._instances[hash(affinity) % len(self._instances)]
+        else:
+            instance = min(self._instances, key=lambda candidate: len(candidate.jobs) + candidate.busy)
+        job = _Job(operation, asyncio.get_running_loop().create_future())
+        instance.jobs.append(job)
+
+        queued = sum(len(candidate.jobs) for candidate in self._instances)
+        if queued > self.scale_up_depth * len(self._instances) and len(self._instances) < self.max_size:
+            self._add_instance()
+            self.stats.scaled_up += 1
+            logger.info(f"Scaled {self.agent_type.value} pool up to {len(self._instances)} ({queued} queued)")
+
+        self._wake(instance)
+        return job.future
+
+    def _add_instance(self) -> None:
+        agent = self.factory()
+        if self.agent_type is None:
+            self.agent_type = agent.type
+        elif agent.type != self.agent_type:
+            raise ValueError(f"Pool of {self.agent_type.value} agents got a {agent.type.value} agent")
+        instance = _Instance(agent)
+        instance.workers = [
+            asyncio.ensure_future(self._work(instance))
+            for _ in range(agent.config.max_concurrent_tasks)
+        ]
+        self._instances.append(instance)
+
+    def _wake(self, preferred: _Instance) -> None:
+        """Wake an idle worker, preferably one of the instance that got the job"""
+        for index, (instance, waiter) in enumerate(self._idle):
+            if instance is preferred and not waiter.done():
+                del self._idle[index]
+                waiter.set_result(None)
+                return
+        while self._idle:
+            _, waiter = self._idle.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def _next_job(self, instance: _Instance) -> Optional[_Job]:
+        while instance.jobs:
+            job = instance.jobs.popleft()
+            if not job.future.done():
+                return job
+
+        # Steal the oldest job of the longest other queue
+        while True:
+            victim = max(
+                (other for other in self._instances if other is not instance and other.jobs),
+                key=lambda other: len(other.jobs),
+                default=None
+            )
+            if victim is None:
+                return None
+            job = victim.jobs.popleft()
+            if not job.future.done():
+                self.stats.stolen += 1
+                return job
+
+    async def _work(self, instance: _Instance) -> None:
+        loop = asyncio.get_running_loop()
+        while not instance.retired:
+            job = self._next_job(instance)
+            if job is None:
+                waiter = loop.create_future()
+                self._idle.append((instance, waiter))
+                try:
+                    await asyncio.wait_for(waiter, self.idle_timeout)
+                except asyncio.TimeoutError:
+                    self._maybe_retire(instance)
+                finally:
+                    if not waiter.done():
+                        waiter.cancel()
+                    try:
+                        self._idle.remove((instance, waiter))
+                    except ValueError:
+                        pass
+                continue
+
+            instance.busy += 1
+            try:
+                result = await job.operation(instance.agent)
+            except asyncio.CancelledError:
+                job.future.cancel()
+                raise
+            except Exception as e:
+                self.stats.failed += 1
+                if not job.future.done():
+                    job.future.set_exception(e)
+            else:
+                self.stats.completed += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                instance.busy -= 1
+
+    def _maybe_retire(self, instance: _Instance) -> None:
+        if instance.retired or instance.busy or instance.jobs or len(self._instances) <= self.min_size:
+            return
+        instance.retired = True
+        self._instances.remove(instance)
+        self.stats.scaled_down += 1
+        logger.info(f"Scaled {self.agent_type.value} pool down to {len(self._instances)}")
+        # Let the instance's other idle workers exit now
+        for other, waiter in list(self._idle):
+            if other is instance and not waiter.done():
+                waiter.set_result(None)
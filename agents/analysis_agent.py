@@ -2,8 +2,18 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel
+import logging
 
 from .base import BaseAgent, AgentType, AgentStatus, AgentContext
+from .analysis_history import AnalysisHistoryStore, DatabaseAnalysisHistory, HistoryPoint
+from .message_bus import MetricUpdate
+from .result_cache import ResultCache, content_hash
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever scoring, priority or recommendation rules (or the shape of
+# the cached scoring) change so that entries from older rules are not reused
+ANALYSIS_RULES_VERSION = "1.1"
 
 class AnalysisResult(BaseModel):
     """Model for analysis outputs"""
@@ -19,8 +29,17 @@ class AnalysisResult(BaseModel):
 class AnalysisAgent(BaseAgent):
     """Agent responsible for analyzing assessment data and generating insights"""
     
-    def __init__(self, name: str = "analysis_agent"):
+    def __init__(
+        self,
+        name: str = "analysis_agent",
+        history: Optional[AnalysisHistoryStore] = None,
+        result_cache: Optional[ResultCache] = None,
+        history_db: Optional[DatabaseAnalysisHistory] = None
+    ):
         super().__init__(AgentType.ANALYSIS, name)
+        self.history = history if history is not None else AnalysisHistoryStore()
+        self.history_db = history_db  # System of record for history, if any
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
         
     async def analyze_assessment(
         self, 
@@ -33,49 +52,56 @@ class AnalysisAgent(BaseAgent):
         try:
             self.update_status(AgentStatus.BUSY)
             
-            # Extract key components
-            functional_changes = assessment_data.get("functional_changes", {})
-            risk_factors = assessment_data.get("risk_factors", [])
             metrics = assessment_data.get("metrics", {})
+            client_id = assessment_data["client_id"]
+            timestamp = datetime.utcnow()
             
-            # Generate insights
-            insights = self._generate_insights(
-                functional_changes,
-                risk_factors,
-                metrics
-            )
-            
-            # Calculate risk score
-            risk_score = self._calculate_risk_score(
-                functional_changes,
-                risk_factors,
-                metrics
-            )
-            
-            # Determine priority level
-            priority_level = self._determine_priority(risk_score, risk_factors)
+            # Scoring depends only on the payload, so retries and re-renders of
+            # unchanged data reuse it. Trends depend on the client's history,
+            # so they are computed, and the observation recorded, every run.
+            cache_key = content_hash(assessment_data, self.type.value, ANALYSIS_RULES_VERSION)
+            scored = self.result_cache.get(cache_key)
+            if scored is None:
+                scored = self._score(assessment_data)
+                self.result_cache.set(cache_key, scored)
+            insights = scored["insights"]
+            risk_score = scored["risk_score"]
             
-            # Generate recommendations
-            recommendations = self._generate_recommendations(
-                insights,
-                risk_score,
-                priority_level
+            # Current observation, used for trends against prior assessments.
+            # A re-analysis keeps the assessment's original time and replaces
+            # its point rather than adding another.
+            assessment_id = assessment_data["id"]
+            await self._load_client_history(client_id)
+            previous = self.history.recorded(client_id, assessment_id)
+            if previous is not None:
+                timestamp = previous.recorded_at
+            current_point = HistoryPoint.from_metrics(timestamp, risk_score, metrics)
+            insights["functional_impact"]["trends"] = self._analyze_trends(
+                metrics, client_id, current_point, assessment_id
             )
             
             # Update metrics
             await self._update_metrics(insights, risk_score)
             
             result = AnalysisResult(
-                client_id=assessment_data["client_id"],
-                assessment_id=assessment_data["id"],
-                timestamp=datetime.utcnow(),
+                client_id=client_id,
+                assessment_id=assessment_id,
+                timestamp=timestamp,
                 insights=insights,
-                recommendations=recommendations,
+                recommendations=scored["recommendations"],
                 metrics=metrics,
                 risk_score=risk_score,
-                priority_level=priority_level
+                priority_level=scored["priority_level"]
             )
             
+            # Record for future trajectory calculations; a retry of an
+            # unchanged assessment has nothing new to record
+            if current_point != previous:
+                self.history.record(
+                    client_id, current_point, therapist_id=context.therapist_id, assessment_id=assessment_id
+                )
+                await self._save_history_point(client_id, assessment_id, current_point, context.therapist_id)
+            
             self.update_status(AgentStatus.IDLE)
             return result
             
@@ -85,18 +111,37 @@ class AnalysisAgent(BaseAgent):
         finally:
             await self.end_session(session_id)
             
+    def _score(self, assessment_data: Dict[str, Any]) -> Dict[str, Any]:
+        """History-independent part of an analysis: risk score, priority,
+        insights (trends are filled in per run) and recommendations"""
+        functional_changes = assessment_data.get("functional_changes", {})
+        risk_factors = assessment_data.get("risk_factors", [])
+        metrics = assessment_data.get("metrics", {})
+        
+        risk_score = self._calculate_risk_score(functional_changes, risk_factors, metrics)
+        insights = self._generate_insights(functional_changes, risk_factors, metrics)
+        priority_level = self._determine_priority(risk_score, risk_factors)
+        return {
+            "risk_score": risk_score,
+            "priority_level": priority_level,
+            "insights": insights,
+            "recommendations": self._generate_recommendations(insights, risk_score, priority_level)
+        }
+            
     def _generate_insights(
         self,
         functional_changes: Dict[str, Any],
         risk_factors: List[Dict[str, Any]],
-        metrics: Dict[str, Any]
+        metrics: Dict[str, Any],
+        client_id: Optional[UUID] = None,
+        current: Optional[HistoryPoint] = None
     ) -> Dict[str, Any]:
         """Generate insights from assessment data"""
         insights = {
             "functional_impact": {
                 "overall_status": self._analyze_functional_status(functional_changes),
                 "key_areas": self._identify_key_impact_areas(functional_changes),
-                "trends": self._analyze_trends(metrics)
+                "trends": self._analyze_trends(metrics, client_id, current)
             },
             "risk_analysis": {
                 "primary_risks": self._analyze_primary_risks(risk_factors),
@@ -193,15 +238,11 @@ class AnalysisAgent(BaseAgent):
         risk_score: float
     ) -> None:
         """Update dashboard metrics based on analysis"""
-        await self.message_queue.put({
-            "type": "metric_update",
-            "metric": "analysis_completed",
-            "data": {
-                "risk_score": risk_score,
-                "insights_generated": len(insights["functional_impact"]["key_areas"]),
-                "timestamp": datetime.utcnow()
-            }
-        })
+        await self.publish(MetricUpdate(self.id, "analysis_completed", {
+            "risk_score": risk_score,
+            "insights_generated": len(insights["functional_impact"]["key_areas"]),
+            "timestamp": datetime.utcnow()
+        }))
         
     def _analyze_functional_status(
         self,
@@ -236,14 +277,67 @@ class AnalysisAgent(BaseAgent):
         
     def _analyze_trends(
         self,
-        metrics: Dict[str, Any]
+        metrics: Dict[str, Any],
+        client_id: Optional[UUID] = None,
+        current: Optional[HistoryPoint] = None,
+        assessment_id: Optional[UUID] = None
     ) -> Dict[str, Any]:
         """Analyze trends in metrics"""
+        history = self._client_history_trajectory(client_id, current, assessment_id)
         return {
-            "functional_trajectory": self._calculate_trajectory(metrics),
-            "risk_trajectory": self._calculate_risk_trajectory(metrics)
+            "functional_trajectory": self._calculate_trajectory(metrics, history),
+            "risk_trajectory": self._calculate_risk_trajectory(metrics, history)
         }
         
+    def _client_history_trajectory(
+        self,
+        client_id: Optional[UUID],
+        current: Optional[HistoryPoint] = None,
+        assessment_id: Optional[UUID] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Trajectory across the client's prior assessments, if any exist"""
+        if client_id is None:
+            return None
+        return self.history.client_trajectory(client_id, current, assessment_id)
+        
+    def get_caseload_trends(self, therapist_id: UUID) -> Dict[UUID, Dict[str, Any]]:
+        """Get trajectories for the caseload clients held in memory"""
+        return self.history.caseload_trajectories(therapist_id)
+        
+    async def load_caseload_trends(self, therapist_id: UUID) -> Dict[UUID, Dict[str, Any]]:
+        """Get trajectories for every client in a therapist's caseload, from
+        the database when there is one"""
+        if self.history_db is None:
+            return self.get_caseload_trends(therapist_id)
+        return await self.history_db.caseload_trajectories(therapist_id)
+        
+    async def _load_client_history(self, client_id: UUID) -> None:
+        """Load a client's history from the database unless already held"""
+        if self.history_db is None or client_id in self.history:
+            return
+        try:
+            rows = await self.history_db.load(client_id)
+        except Exception as e:
+            logger.warning(f"Could not load analysis history for client {client_id}: {str(e)}")
+            return
+        if client_id not in self.history:  # Not recorded while loading
+            self.history.hydrate(client_id, rows)
+        
+    async def _save_history_point(
+        self,
+        client_id: UUID,
+        assessment_id: UUID,
+        point: HistoryPoint,
+        therapist_id: Optional[UUID]
+    ) -> None:
+        """Persist a recorded point; analysis does not fail on database errors"""
+        if self.history_db is None:
+            return
+        try:
+            await self.history_db.save(client_id, assessment_id, point, therapist_id)
+        except Exception as e:
+            logger.warning(f"Could not save analysis history for client {client_id}: {str(e)}")
+        
     def _analyze_primary_risks(
         self,
         risk_factors: List[Dict[str, Any]]
@@ -276,9 +370,14 @@ class AnalysisAgent(BaseAgent):
         
     def _calculate_trajectory(
         self,
-        metrics: Dict[str, Any]
+        metrics: Dict[str, Any],
+        history: Optional[Dict[str, Any]] = None
     ) -> str:
         """Calculate functional trajectory"""
+        if history:
+            return history["functional_trajectory"]
+        
+        # Single snapshot, fall back to current status
         if metrics.get("functional_status", {}).get("independent", 0) > 0.7:
             return "improving"
         elif metrics.get("functional_status", {}).get("unable", 0) > 0.3:
@@ -288,9 +387,13 @@ class AnalysisAgent(BaseAgent):
             
     def _calculate_risk_trajectory(
         self,
-        metrics: Dict[str, Any]
+        metrics: Dict[str, Any],
+        history: Optional[Dict[str, Any]] = None
     ) -> str:
         """Calculate risk trajectory"""
+        if history:
+            return history["risk_trajectory"]
+        
         risk_count = len(metrics.get("risk_factors", []))
         
         if risk_count > 5:
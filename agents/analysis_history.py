@@ -0,0 +1,355 @@
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
+from uuid import UUID
+
+_EPOCH = datetime(1970, 1, 1)
+_SECONDS_PER_DAY = 86400.0
+
+# Clients whose history is held in memory; least recently used ones are
+# dropped beyond this and reloaded from the database when next analyzed
+DEFAULT_MAX_CLIENTS = 10000
+
+# Slopes are expressed per 30 days of elapsed time
+RISK_SLOPE_THRESHOLD = 0.5
+INDEPENDENCE_SLOPE_THRESHOLD = 0.05
+
+@dataclass
+class HistoryPoint:
+    """Single observation in a client's analysis history"""
+    recorded_at: datetime
+    risk_score: float
+    independent: float = 0.0
+    unable: float = 0.0
+    total_activities: float = 0.0
+
+    @classmethod
+    def from_metrics(
+        cls,
+        recorded_at: datetime,
+        risk_score: float,
+        metrics: Dict[str, Any]
+    ) -> "HistoryPoint":
+        """Build a point from an assessment metrics snapshot"""
+        functional_status = metrics.get("functional_status", {})
+        return cls(
+            recorded_at=recorded_at,
+            risk_score=float(risk_score),
+            independent=float(functional_status.get("independent", 0)),
+            unable=float(functional_status.get("unable", 0)),
+            total_activities=float(functional_status.get("total_activities", 0))
+        )
+
+class _ClientColumns:
+    """Time-ordered typed columns for one client, with the assessment each
+    point came from (None for points recorded without one)"""
+
+    __slots__ = ("days", "risk_score", "independent", "unable", "total_activities", "assessments", "therapists")
+
+    def __init__(self):
+        self.therapists: Set[UUID] = set()
+        self.assessments: List[Optional[UUID]] = []
+        self.days = array("d")
+        self.risk_score = array("d")
+        self.independent = array("d")
+        self.unable = array("d")
+        self.total_activities = array("d")
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def index(self, assessment_id: Optional[UUID]) -> Optional[int]:
+        if assessment_id is None or assessment_id not in self.assessments:
+            return None
+        return self.assessments.index(assessment_id)
+
+    def point(self, index: int) -> HistoryPoint:
+        return HistoryPoint(
+            recorded_at=_EPOCH + timedelta(days=self.days[index]),
+            risk_score=self.risk_score[index],
+            independent=self.independent[index],
+            unable=self.unable[index],
+            total_activities=self.total_activities[index]
+        )
+
+    def insert(self, point: HistoryPoint, assessment_id: Optional[UUID] = None) -> None:
+        """Add a point; a point for an assessment already held replaces it"""
+        replaced = self.index(assessment_id)
+        if replaced is not None:
+            for column in (self.assessments, self.days, self.risk_score,
+                           self.independent, self.unable, self.total_activities):
+                del column[replaced]
+        day = _to_days(point.recorded_at)
+        # Appends are the common case; bisect keeps out-of-order loads sorted
+        index = bisect_right(self.days, day)
+        self.assessments.insert(index, assessment_id)
+        self.days.insert(index, day)
+        self.risk_score.insert(index, point.risk_score)
+        self.independent.insert(index, point.independent)
+        self.unable.insert(index, point.unable)
+        self.total_activities.insert(index, point.total_activities)
+
+def _to_days(moment: datetime) -> float:
+    if moment.tzinfo is not None:
+        moment = moment.replace(tzinfo=None) - moment.utcoffset()
+    return (moment - _EPOCH).total_seconds() / _SECONDS_PER_DAY
+
+def _independence_ratio(independent: float, total_activities: float) -> float:
+    """Metrics carry either activity counts with a total, or ratios directly"""
+    return independent / total_activities if total_activities else independent
+
+def _slopes(
+    days: Iterable[float],
+    risk_scores: Iterable[float],
+    ratios: Iterable[float]
+) -> Tuple[int, float, float]:
+    """Least-squares slopes of risk and independence over time in one pass"""
+    n = 0
+    sum_x = sum_xx = 0.0
+    sum_risk = sum_x_risk = 0.0
+    sum_ratio = sum_x_ratio = 0.0
+    origin = None
+
+    for x, risk, ratio in zip(days, risk_scores, ratios):
+        if origin is None:
+            origin = x
+        x -= origin  # Keep magnitudes small for numerical stability
+        n += 1
+        sum_x += x
+        sum_xx += x * x
+        sum_risk += risk
+        sum_x_risk += x * risk
+        sum_ratio += ratio
+        sum_x_ratio += x * ratio
+
+    denominator = n * sum_xx - sum_x * sum_x
+    if n < 2 or denominator == 0:
+        return n, 0.0, 0.0
+
+    risk_slope = (n * sum_x_risk - sum_x * sum_risk) / denominator
+    ratio_slope = (n * sum_x_ratio - sum_x * sum_ratio) / denominator
+    return n, risk_slope * 30, ratio_slope * 30
+
+def _trajectory(n: int, risk_slope: float, ratio_slope: float) -> Dict[str, Any]:
+    """Trajectory summary from slopes per 30 days"""
+    return {
+        "assessments": n,
+        "risk_slope": round(risk_slope, 3),
+        "independence_slope": round(ratio_slope, 3),
+        "functional_trajectory": _functional_trajectory(ratio_slope),
+        "risk_trajectory": _risk_trajectory(risk_slope)
+    }
+
+class AnalysisHistoryStore:
+    """Columnar per-client history of analysis risk scores and functional counts.
+
+    At most max_clients clients are held, in LRU order. The database
+    (DatabaseAnalysisHistory) is the system of record: AnalysisAgent loads a
+    client's history from it with hydrate() before analyzing, so an evicted
+    client costs one query on its next analysis. Without a database the
+    store is in-memory only and evicted history is lost.
+    """
+
+    def __init__(self, max_clients: int = DEFAULT_MAX_CLIENTS):
+        if max_clients < 1:
+            raise ValueError("max_clients must be at least 1")
+        self.max_clients = max_clients
+        self._clients: "OrderedDict[UUID, _ClientColumns]" = OrderedDict()
+        self._caseloads: Dict[UUID, Set[UUID]] = {}
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return sum(len(columns) for columns in self._clients.values())
+
+    def __contains__(self, client_id: UUID) -> bool:
+        return client_id in self._clients
+
+    def _columns(self, client_id: UUID) -> _ClientColumns:
+        columns = self._clients.get(client_id)
+        if columns is None:
+            columns = self._clients[client_id] = _ClientColumns()
+            while len(self._clients) > self.max_clients:
+                self._evict()
+        else:
+            self._clients.move_to_end(client_id)
+        return columns
+
+    def _evict(self) -> None:
+        client_id, columns = self._clients.popitem(last=False)
+        for therapist_id in columns.therapists:
+            caseload = self._caseloads.get(therapist_id)
+            if caseload is not None:
+                caseload.discard(client_id)
+                if not caseload:
+                    del self._caseloads[therapist_id]
+        self.evicted += 1
+
+    def record(
+        self,
+        client_id: UUID,
+        point: HistoryPoint,
+        therapist_id: Optional[UUID] = None,
+        assessment_id: Optional[UUID] = None
+    ) -> None:
+        """Add an observation to a client's history. There is one point per
+        assessment: recording an assessment again replaces its point."""
+        columns = self._columns(client_id)
+        columns.insert(point, assessment_id)
+
+        if therapist_id is not None:
+            columns.therapists.add(therapist_id)
+            self._caseloads.setdefault(therapist_id, set()).add(client_id)
+
+    def recorded(self, client_id: UUID, assessment_id: UUID) -> Optional[HistoryPoint]:
+        """The point held for an assessment, if it was already recorded"""
+        columns = self._clients.get(client_id)
+        index = columns.index(assessment_id) if columns else None
+        return columns.point(index) if index is not None else None
+
+    def hydrate(self, client_id: UUID, rows: Iterable[Tuple]) -> int:
+        """Load a client's full history (rows as for load()), marking the
+        client as held even when it has no history yet"""
+        self._columns(client_id)
+        return self.load(rows)
+
+    def load(self, rows: Iterable[Tuple]) -> int:
+        """Bulk load rows of (client_id, therapist_id, assessment_id,
+        recorded_at, risk_score, independent, unable, total_activities) as
+        returned by AsyncDatabaseService.get_analysis_history"""
+        count = 0
+        for client_id, therapist_id, assessment_id, recorded_at, risk_score, independent, unable, total in rows:
+            self.record(
+                client_id,
+                HistoryPoint(
+                    recorded_at=recorded_at,
+                    risk_score=risk_score,
+                    independent=independent or 0.0,
+                    unable=unable or 0.0,
+                    total_activities=total or 0.0
+                ),
+                therapist_id=therapist_id,
+                assessment_id=assessment_id
+            )
+            count += 1
+        return count
+
+    def client_ids(self, therapist_id: Optional[UUID] = None) -> List[UUID]:
+        """Clients with history, optionally restricted to a therapist's caseload"""
+        if therapist_id is None:
+            return list(self._clients)
+        return list(self._caseloads.get(therapist_id, ()))
+
+    def client_trajectory(
+        self,
+        client_id: UUID,
+        current: Optional[HistoryPoint] = None,
+        assessment_id: Optional[UUID] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Compute a client's trajectory, including an optional not-yet-recorded
+        observation, which stands in for assessment_id's point if one is held.
+        Returns None when fewer than two points exist."""
+        columns = self._clients.get(client_id)
+        days: Iterable[float] = columns.days if columns else ()
+        risk_scores: Iterable[float] = columns.risk_score if columns else ()
+        ratios: Iterable[float] = (
+            map(_independence_ratio, columns.independent, columns.total_activities)
+            if columns else ()
+        )
+
+        replaced = columns.index(assessment_id) if current is not None and columns else None
+        if replaced is not None:
+            keep = [index for index in range(len(columns)) if index != replaced]
+            days = [columns.days[index] for index in keep]
+            risk_scores = [columns.risk_score[index] for index in keep]
+            ratios = [
+                _independence_ratio(columns.independent[index], columns.total_activities[index])
+                for index in keep
+            ]
+
+        if current is not None:
+            days = [*days, _to_days(current.recorded_at)]
+            risk_scores = [*risk_scores, current.risk_score]
+            ratios = [*ratios, _independence_ratio(current.independent, current.total_activities)]
+
+        n, risk_slope, ratio_slope = _slopes(days, risk_scores, ratios)
+        if n < 2:
+            return None
+
+        return _trajectory(n, risk_slope, ratio_slope)
+
+    def caseload_trajectories(self, therapist_id: UUID) -> Dict[UUID, Dict[str, Any]]:
+        """Compute trajectories for the caseload clients held in memory (with
+        a database, DatabaseAnalysisHistory.caseload_trajectories covers the
+        whole caseload in one query). A client is in a therapist's caseload
+        if the therapist recorded any of its points; its trajectory uses all
+        of them."""
+        trajectories = {}
+        for client_id in self._caseloads.get(therapist_id, ()):
+            trajectory = self.client_trajectory(client_id)
+            if trajectory is not None:
+                trajectories[client_id] = trajectory
+        return trajectories
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Memory gauges for the dashboard"""
+        return {
+            "clients": len(self._clients),
+            "points": len(self),
+            "caseloads": len(self._caseloads),
+            "evicted": self.evicted
+        }
+
+class DatabaseAnalysisHistory:
+    """Persists analysis history points to the analysis_history table, one
+    row per assessment, through an AsyncDatabaseService"""
+
+    def __init__(self, database):
+        self.database = database
+
+    async def save(
+        self,
+        client_id: UUID,
+        assessment_id: UUID,
+        point: HistoryPoint,
+        therapist_id: Optional[UUID] = None
+    ) -> None:
+        await self.database.add_analysis_history(
+            client_id,
+            assessment_id,
+            point.recorded_at,
+            point.risk_score,
+            {
+                "independent": point.independent,
+                "unable": point.unable,
+                "total_activities": point.total_activities
+            },
+            therapist_id
+        )
+
+    async def load(self, client_id: UUID) -> List[Tuple]:
+        return await self.database.get_analysis_history(client_id=client_id)
+
+    async def caseload_trajectories(self, therapist_id: UUID) -> Dict[UUID, Dict[str, Any]]:
+        """Trajectories for a whole caseload from one grouped regression query"""
+        rows = await self.database.get_caseload_slopes(therapist_id)
+        return {
+            client_id: _trajectory(n, risk_slope * 30, ratio_slope * 30)
+            for client_id, n, risk_slope, ratio_slope in rows
+        }
+
+def _functional_trajectory(independence_slope: float) -> str:
+    if independence_slope > INDEPENDENCE_SLOPE_THRESHOLD:
+        return "improving"
+    elif independence_slope < -INDEPENDENCE_SLOPE_THRESHOLD:
+        return "declining"
+    return "stable"
+
+def _risk_trajectory(risk_slope: float) -> str:
+    if risk_slope > RISK_SLOPE_THRESHOLD:
+        return "escalating"
+    elif risk_slope < -RISK_SLOPE_THRESHOLD:
+        return "de-escalating"
+    return "stable"
@@ -4,6 +4,8 @@ from uuid import UUID, uuid4
 from pydantic import ValidationError, BaseModel
 
 from .base import BaseAgent, AgentType, AgentStatus, AgentContext
+from .message_bus import MetricUpdate
+from .result_cache import ResultCache, content_hash
 from backend.models.assessment import (
     Assessment, PhysicalSymptom, CognitiveSymptom, EmotionalSymptom,
     Tolerance, RangeOfMotion, DailyActivity, EnvironmentalAssessment,
@@ -17,12 +19,17 @@ class AssessmentValidationRule(BaseModel):
     parameters: Dict[str, Any]
     error_message: str
 
+# Bump whenever validation, risk or metric rules change so that cached
+# results from older rules are not reused
+ASSESSMENT_RULES_VERSION = "1.0"
+
 class AssessmentAgent(BaseAgent):
     """Agent responsible for processing and validating OT assessments"""
     
-    def __init__(self, name: str = "assessment_agent"):
+    def __init__(self, name: str = "assessment_agent", result_cache: Optional[ResultCache] = None):
         super().__init__(AgentType.ASSESSMENT, name)
         self.validation_rules: List[AssessmentValidationRule] = self._setup_validation_rules()
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
         
     def _setup_validation_rules(self) -> List[AssessmentValidationRule]:
         """Setup validation rules for assessments"""
@@ -113,6 +120,15 @@ class AssessmentAgent(BaseAgent):
         try:
             self.update_status(AgentStatus.BUSY)
             
+            # Retries of unchanged assessments skip validation and processing
+            cache_key = content_hash(assessment, self.type.value, ASSESSMENT_RULES_VERSION)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                cached["session_id"] = session_id
+                await self._update_metrics(assessment, cached["metrics"])
+                self.update_status(AgentStatus.IDLE)
+                return cached
+            
             # Validate assessment data
             errors = await self.validate_assessment(assessment)
             if errors:
@@ -148,6 +164,7 @@ class AssessmentAgent(BaseAgent):
             
             # Update dashboard metrics
             await self._update_metrics(assessment, metrics)
+            self.result_cache.set(cache_key, result)
             
             self.update_status(AgentStatus.IDLE)
             return result
@@ -367,14 +384,10 @@ class AssessmentAgent(BaseAgent):
         
     async def _update_metrics(self, assessment: Assessment, metrics: Dict[str, Any]) -> None:
         """Update dashboard metrics based on assessment data"""
-        await self.message_queue.put({
-            "type": "metric_update",
-            "metric": "assessment_completed",
-            "data": {
-                "client_id": assessment.id,
-                "type": assessment.type,
-                "status": "completed",
-                "metrics": metrics,
-                "timestamp": datetime.utcnow()
-            }
-        })
\ No newline at end of file
+        await self.publish(MetricUpdate(self.id, "assessment_completed", {
+            "client_id": assessment.id,
+            "type": assessment.type,
+            "status": "completed",
+            "metrics": metrics,
+            "timestamp": datetime.utcnow()
+        }))
\ No newline at end of file
@@ -0,0 +1,104 @@
+from typing import Any, Dict, Optional
+from uuid import UUID
+import asyncio
+
+from .agent_pool import AgentPool
+from .pipeline import Pipeline, Stage
+from .session_status import ANALYZING, FAILED, REPORT_READY, REPORTING
+from .session_store import SessionStore
+
+# Workers and inter-stage queue capacity for each pipeline stage
+DEFAULT_STAGE_WORKERS = {'documentation': 4, 'analysis': 4, 'report': 2}
+DEFAULT_STAGE_QUEUE_SIZE = 100
+
+class AssessmentPipeline:
+    """Routes assessment events to the session status projection and runs
+    completed assessments through the documentation, analysis and report
+    stages.
+
+    Every event updates the projection in arrival order. Only
+    assessment_completed starts a trip through the stages, so each session
+    is in the pipeline at most once and its earlier events cannot be
+    reordered by concurrent stage workers.
+    """
+
+    def __init__(
+        self,
+        sessions: SessionStore,
+        assessment_agent,
+        documentation_agent,
+        analysis_pool: AgentPool,
+        report_agent,
+        stage_workers: Optional[Dict[str, int]] = None,
+        stage_queue_size: int = DEFAULT_STAGE_QUEUE_SIZE
+    ):
+        self.sessions = sessions
+        self.assessment_agent = assessment_agent
+        self.documentation_agent = documentation_agent
+        self.analysis_pool = analysis_pool
+        self.report_agent = report_agent
+        # Each stage's result is the next stage's input, so different
+        # sessions occupy different stages at the same time
+        workers = {**DEFAULT_STAGE_WORKERS, **(stage_workers or {})}
+        self.pipeline = Pipeline([
+            Stage('documentation', self._document, workers['documentation'], stage_queue_size),
+            Stage('analysis', self._analyze, workers['analysis'], stage_queue_size),
+            Stage('report', self._report, workers['report'], stage_queue_size)
+        ])
+
+    def start(self) -> None:
+        self.pipeline.start()
+
+    async def shutdown(self) -> None:
+        await self.pipeline.shutdown()
+
+    async def handle(self, message: Dict[str, Any]) -> Optional[asyncio.Future]:
+        """Apply an assessment event; returns the pipeline future for a
+        completed assessment, None for progress events"""
+        await self._project(message)
+        if message['type'] != 'assessment_completed':
+            return None
+
+        # Waits only while the documentation stage's queue is full
+        result = await self.pipeline.submit(message)
+        result.add_done_callback(lambda future, session_id=message['session_id']:
+                                 self._pipeline_done(session_id, future))
+        return result
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-stage queue depths, throughput and latency histograms"""
+        return self.pipeline.get_metrics()
+
+    async def _project(self, message: Dict[str, Any]) -> None:
+        """Update the status projection from an assessment event"""
+        session = self.sessions.apply(message)
+        if session is not None and message['type'] != 'assessment_completed' and message.get('next_step') is None:
+            # Events without the next step cost one lookup per step, not per poll
+            next_step = await self.assessment_agent.get_next_step(message['session_id'])
+            self.sessions.update(message['session_id'], next_step=next_step)
+
+    def _pipeline_done(self, session_id: UUID, future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            self.sessions.update(session_id, status=FAILED, error=str(future.exception()))
+
+    async def _document(self, message: Dict[str, Any]) -> Any:
+        """Documentation stage; returns the documentation for analysis, if any"""
+        documentation = await self.documentation_agent.process_message(message)
+        if documentation is not None:
+            self.sessions.update(message['session_id'], status=ANALYZING)
+        return documentation
+
+    async def _analyze(self, documentation) -> Any:
+        """Analysis stage; waits for a pooled analysis agent instead of failing"""
+        analysis = await self.analysis_pool.submit(
+            lambda agent: agent.process_documentation(documentation)
+        )
+        if analysis is not None:
+            self.sessions.update(documentation['session_id'], status=REPORTING, analysis=analysis)
+        return analysis
+
+    async def _report(self, analysis) -> Any:
+        """Report stage; marks the session's report as ready"""
+        report = await self.report_agent.process_analysis(analysis)
+        self.sessions.update(analysis['session_id'], status=REPORT_READY, report=report)
+        return report
@@ -1,11 +1,20 @@
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Optional, Any, List
-from uuid import UUID, uuid4
+from typing import Deque, Dict, Optional, Any, List
 import asyncio
+from uuid import UUID, uuid4
 from pydantic import BaseModel, Field, validator
 
+from .message_bus import (
+    ALL_TOPICS, AgentError, Message, MessageBus, OverflowPolicy, SessionEnded, SessionStarted
+)
+
+# Standalone agents keep their recent messages for inspection; older ones
+# are dropped rather than accumulating when nothing drains the outbox
+OUTBOX_SIZE = 100
+
 class AgentType(Enum):
     ASSESSMENT = "assessment"
     ANALYSIS = "analysis"
@@ -66,7 +75,23 @@ class BaseAgent:
         self.last_active = None
         self.error_count = 0
         self.active_contexts: Dict[UUID, AgentContext] = {}
-        self.message_queue: asyncio.Queue = asyncio.Queue()
+        # Sessions waiting for a task slot, oldest first, and slots handed
+        # to a waiter that has not resumed yet
+        self._slot_waiters: Deque[asyncio.Future] = deque()
+        self._handed_off = 0
+        self.message_bus = MessageBus()
+        self.message_queue = self.message_bus.subscribe(
+            [ALL_TOPICS], name=f"{self.name}-outbox", maxsize=OUTBOX_SIZE, policy=OverflowPolicy.DROP_OLDEST
+        )
+
+    def attach_bus(self, bus: MessageBus) -> None:
+        """Publish to a shared bus instead of this agent's own outbox"""
+        self.message_queue.close()
+        self.message_queue = None
+        self.message_bus = bus
+
+    async def publish(self, message: Message) -> None:
+        await self.message_bus.publish(message)
 
     @staticmethod
     def _validate_name(name: str) -> str:
@@ -88,23 +113,20 @@ class BaseAgent:
         # Add more type-specific validations as needed
 
     async def start_session(self, context: AgentContext) -> UUID:
-        """Start a new agent session with validation"""
+        """Start a new agent session with validation.
+        
+        When all max_concurrent_tasks slots are taken, waits in line for one
+        for up to timeout_seconds instead of failing straight away.
+        """
         if self.status == AgentStatus.DISABLED:
             raise ValueError("Agent is disabled")
         
-        if len(self.active_contexts) >= self.config.max_concurrent_tasks:
-            raise ValueError("Maximum concurrent tasks limit reached")
-
         self.validate_context(context)
+        await self._acquire_slot()
         self.active_contexts[context.session_id] = context
         self.last_active = datetime.utcnow()
         
-        await self.message_queue.put({
-            "type": "session_started",
-            "session_id": context.session_id,
-            "agent_id": self.id,
-            "agent_type": self.type.value
-        })
+        await self.publish(SessionStarted(self.id, context.session_id, self.type.value))
         
         return context.session_id
 
@@ -112,11 +134,42 @@ class BaseAgent:
         """End an agent session with cleanup"""
         if session_id in self.active_contexts:
             del self.active_contexts[session_id]
-            await self.message_queue.put({
-                "type": "session_ended",
-                "session_id": session_id,
-                "agent_id": self.id
-            })
+            self._release_slot()
+            await self.publish(SessionEnded(self.id, session_id))
+
+    def _has_free_slot(self) -> bool:
+        return len(self.active_contexts) + self._handed_off < self.config.max_concurrent_tasks
+
+    async def _acquire_slot(self) -> None:
+        """Wait, first come first served, until a task slot is free"""
+        if not self._slot_waiters and self._has_free_slot():
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._slot_waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.config.timeout_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # Got a slot just as it gave up; pass it on
+                self._handed_off -= 1
+                self._release_slot()
+            if isinstance(e, asyncio.TimeoutError):
+                raise ValueError("Maximum concurrent tasks limit reached") from None
+            raise
+        finally:
+            try:
+                self._slot_waiters.remove(waiter)
+            except ValueError:
+                pass
+        self._handed_off -= 1
+
+    def _release_slot(self) -> None:
+        """Hand a free slot to the oldest waiting session"""
+        while self._slot_waiters and self._has_free_slot():
+            waiter = self._slot_waiters.popleft()
+            if not waiter.done():
+                self._handed_off += 1
+                waiter.set_result(None)
 
     def update_status(self, status: AgentStatus) -> None:
         """Update agent status with validation"""
@@ -131,10 +184,4 @@ class BaseAgent:
         if self.error_count >= self.config.retry_attempts:
             self.update_status(AgentStatus.ERROR)
         
-        await self.message_queue.put({
-            "type": "agent_error",
-            "agent_id": self.id,
-            "session_id": context.session_id,
-            "error": str(error),
-            "error_count": self.error_count
-        })
\ No newline at end of file
+        await self.publish(AgentError(self.id, context.session_id, str(error), self.error_count))
\ No newline at end of file
@@ -68,4 +68,8 @@ class ClientManager:
             
         client = self.clients[client_id]
         client.is_active = False
-        client.updated_at = datetime.utcnow()
\ No newline at end of file
+        client.updated_at = datetime.utcnow()
+
+    def get_memory_metrics(self) -> dict:
+        """Size of the in-memory client records"""
+        return {"clients": len(self.clients)}
@@ -0,0 +1,172 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .parse_cache import file_fingerprint
+from .record_extraction import HISTORY_SECTIONS
+
+# Conditions in medical history that are reported as risks
+RISK_CONDITIONS = [
+    "diabetes",
+    "hypertension",
+    "stroke",
+    "falls",
+    "dizziness",
+    "vision impairment"
+]
+
+def medication_key(medication: Dict[str, str]) -> str:
+    """Dedup key for a medication, the same one the full recombination uses"""
+    return f"{medication['name']}-{medication['dosage']}"
+
+@dataclass
+class SourceEntry:
+    """One file's contribution to the combined records; a file deferred by
+    triage contributes an empty record and keeps the triage decision"""
+    fingerprint: Tuple[int, int]
+    record: Dict[str, Any]
+    deferred: Optional[Dict[str, Any]] = None
+
+class _KeyedIndex:
+    """Values deduplicated by key, remembering which sources contributed them.
+
+    Keys keep the position where they were first added, and a value stays
+    as long as any source still provides it, so adding or removing a source
+    only touches that source's own items.
+    """
+
+    def __init__(self):
+        self._items: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, source: str, key: str, value: Any) -> None:
+        self._items.setdefault(key, {}).setdefault(source, value)
+
+    def discard(self, source: str, key: str) -> None:
+        contributors = self._items.get(key)
+        if contributors is None:
+            return
+        contributors.pop(source, None)
+        if not contributors:
+            del self._items[key]
+
+    def values(self) -> List[Any]:
+        return [next(iter(contributors.values())) for contributors in self._items.values()]
+
+class CombinedRecords:
+    """Combined diagnoses, medications and history for a claim's documents,
+    updated one file at a time.
+
+    Each source (a file path) is tracked with the fingerprint it was parsed
+    or deferred at. Replacing or removing a source costs time proportional
+    to that source's own record, never to the size of the whole package.
+    """
+
+    def __init__(self):
+        self.sources: Dict[str, SourceEntry] = {}
+        self._diagnoses = _KeyedIndex()
+        self._medications = _KeyedIndex()
+        self._history = {key: _KeyedIndex() for key in HISTORY_SECTIONS}
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def __contains__(self, source: str) -> bool:
+        return source in self.sources
+
+    def pending(self, pdf_paths: Iterable[Path]) -> Tuple[List[Path], List[str]]:
+        """Split a document set into files needing a parse (new or changed
+        since they were merged) and sources no longer in the set"""
+        changed = []
+        current = set()
+        for path in pdf_paths:
+            source = str(path)
+            current.add(source)
+            entry = self.sources.get(source)
+            try:
+                fingerprint = file_fingerprint(path)
+            except OSError:
+                fingerprint = None
+            if entry is None or entry.fingerprint != fingerprint:
+                changed.append(path)
+        removed = [source for source in self.sources if source not in current]
+        return changed, removed
+
+    def put(self, source: str, record: Dict[str, Any], fingerprint: Tuple[int, int]) -> None:
+        """Merge a file's parsed record, replacing any earlier version of it"""
+        self.remove(source)
+        self.sources[source] = SourceEntry(fingerprint, record)
+        for diagnosis in record.get("diagnoses", []):
+            self._diagnoses.add(source, diagnosis, diagnosis)
+        for medication in record.get("medications", []):
+            self._medications.add(source, medication_key(medication), medication)
+        history = record.get("medical_history", {})
+        for key, index in self._history.items():
+            for item in history.get(key, []):
+                index.add(source, item, item)
+
+    def defer(self, source: str, decision: Dict[str, Any], fingerprint: Tuple[int, int]) -> None:
+        """Track a file triage set aside, so it is not re-triaged until it changes"""
+        self.remove(source)
+        self.sources[source] = SourceEntry(fingerprint, {}, decision)
+
+    def remove(self, source: str) -> None:
+        """Take a file's contribution out of the combined records"""
+        entry = self.sources.pop(source, None)
+        if entry is None:
+            return
+        record = entry.record
+        for diagnosis in record.get("diagnoses", []):
+            self._diagnoses.discard(source, diagnosis)
+        for medication in record.get("medications", []):
+            self._medications.discard(source, medication_key(medication))
+        history = record.get("medical_history", {})
+        for key, index in self._history.items():
+            for item in history.get(key, []):
+                index.discard(source, item)
+
+    def parsed_count(self) -> int:
+        return sum(1 for entry in self.sources.values() if entry.deferred is None)
+
+    def deferred(self) -> List[Dict[str, Any]]:
+        """Triage decisions for the deferred files, in the order they were added"""
+        return [entry.deferred for entry in self.sources.values() if entry.deferred is not None]
+
+    def diagnoses(self) -> List[str]:
+        return self._diagnoses.values()
+
+    def medications(self) -> List[Dict[str, str]]:
+        return self._medications.values()
+
+    def history(self) -> Dict[str, List[str]]:
+        return {key: index.values() for key, index in self._history.items()}
+
+    def condition_risks(self) -> List[Dict[str, Any]]:
+        """Risks for high-risk conditions anywhere in the combined history"""
+        return [
+            {
+                "type": "medical_condition",
+                "description": condition,
+                "source": "medical_records"
+            }
+            for condition in self._history["conditions"].values()
+            if any(risk in condition.lower() for risk in RISK_CONDITIONS)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form for storing alongside the claim"""
+        sources = {}
+        for source, entry in self.sources.items():
+            sources[source] = {"fingerprint": list(entry.fingerprint), "record": entry.record}
+            if entry.deferred is not None:
+                sources[source]["deferred"] = entry.deferred
+        return {"sources": sources}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "CombinedRecords":
+        combined = cls()
+        for source, entry in (data or {}).get("sources", {}).items():
+            if entry.get("deferred") is not None:
+                combined.defer(source, entry["deferred"], tuple(entry["fingerprint"]))
+            else:
+                combined.put(source, entry["record"], tuple(entry["fingerprint"]))
+        return combined
@@ -0,0 +1,100 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+import re
+
+import pypdf
+
+from .medication_extraction import extract_medications
+from .record_extraction import DIAGNOSIS_HEADINGS, HISTORY_SECTIONS
+
+DEFAULT_SAMPLE_PAGES = 2
+
+# A line that starts with a section header the record extractors act on
+CLINICAL_HEADERS = re.compile(
+    r"^[ \t]*(?:"
+    + "|".join(re.escape(name) for name in DIAGNOSIS_HEADINGS + list(HISTORY_SECTIONS.values()))
+    + r")[ \t]*(?::|$)",
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Document types that never contribute diagnoses, medications or history.
+# Letters often cover attached records, so correspondence is only set aside
+# when the sample covered the whole document.
+LOW_VALUE_MARKERS = {
+    "invoice": re.compile(
+        r"\b(?:invoice|amount due|balance due|remittance|payment terms)\b", re.IGNORECASE
+    ),
+    "correspondence": re.compile(
+        r"^[ \t]*(?:dear\b|sincerely\b|yours truly\b|kind regards\b)", re.IGNORECASE | re.MULTILINE
+    )
+}
+
+@dataclass
+class TriageSample:
+    """Text of a document's first pages and its outline titles"""
+    text: str = ""
+    outline: List[str] = field(default_factory=list)
+    page_count: int = 0
+    sampled_pages: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.sampled_pages >= self.page_count
+
+@dataclass
+class TriageDecision:
+    document_type: str
+    parse: bool
+    reason: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"document_type": self.document_type, "reason": self.reason}
+
+def _outline_titles(outline: List[Any]) -> List[str]:
+    titles = []
+    for item in outline:
+        if isinstance(item, list):
+            titles.extend(_outline_titles(item))
+        else:
+            titles.append(str(getattr(item, "title", "")))
+    return titles
+
+# Runs in the ingestion worker processes, so it must stay module-level
+
+def sample_document(pdf_path: str, sample_pages: int = DEFAULT_SAMPLE_PAGES) -> TriageSample:
+    """Extract only what triage needs: the first pages and the outline"""
+    with open(pdf_path, 'rb') as file:
+        pdf = pypdf.PdfReader(file)
+        pages = [page.extract_text() or "" for page in pdf.pages[:sample_pages]]
+        try:
+            outline = _outline_titles(pdf.outline)
+        except Exception:
+            outline = []  # A damaged outline should not keep the document from triage
+        return TriageSample(
+            text="\n".join(pages),
+            outline=outline,
+            page_count=len(pdf.pages),
+            sampled_pages=len(pages)
+        )
+
+def classify(sample: TriageSample) -> TriageDecision:
+    """Decide whether a document is worth a full parse.
+
+    Anything showing a clinical header (in its text or outline) or a
+    medication entry is parsed. Documents are only set aside when they look
+    like a known low-value type and show no clinical content; anything
+    unrecognized, including image-only scans, is parsed to be safe.
+    """
+    outline = "\n".join(sample.outline)
+    header = CLINICAL_HEADERS.search(sample.text) or CLINICAL_HEADERS.search(outline)
+    if header:
+        return TriageDecision("medical_record", True, f"header {header.group().strip()!r}")
+    if extract_medications(sample.text):
+        return TriageDecision("medical_record", True, "medication entry")
+
+    for document_type, marker in LOW_VALUE_MARKERS.items():
+        match = marker.search(sample.text)
+        if match and (document_type != "correspondence" or sample.complete):
+            return TriageDecision(document_type, False, f"marker {match.group().strip()!r}")
+
+    return TriageDecision("unknown", True, "no known headers or markers")
@@ -1,18 +1,65 @@
-from dataclasses import dataclass
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict, Optional, Any, List
-from uuid import UUID
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, Optional, Any, List, Tuple
+from uuid import UUID, uuid4
+import asyncio
+import hashlib
+import json
+import logging
+import time
 
+import jinja2
 from pydantic import BaseModel, Field
 
-from .base import BaseAgent, AgentType, AgentConfig, AgentContext
+from .base import BaseAgent, AgentType, AgentConfig, AgentContext, AgentStatus
+from .message_bus import BulkProgress
+from .parse_cache import file_fingerprint
+from .pdf_rendering import DEFAULT_MAX_PENDING, DEFAULT_RENDER_TIMEOUT, PDFRenderService
+from .report_batch import BatchCheckpoint, BatchProgress, BatchResult, batch_job_key
+from .report_sections import SECTION_RENDERERS, FragmentLibrary, SectionRegistry
+from .report_store import ReportStore
+from .result_cache import ResultCache, content_hash
+
+if TYPE_CHECKING:
+    from database.service import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+# Bump when section generation changes so memoized sections are not reused
+SECTION_GENERATOR_VERSION = "3"
 
 class DocumentationAgentConfig(AgentConfig):
     """Configuration specific to the Documentation Agent"""
     template_dir: Path = Field(..., description="Directory containing report templates")
     output_dir: Path = Field(..., description="Directory for generated reports")
     stylesheet_path: Optional[Path] = Field(None, description="Custom CSS for PDF generation")
+    template_check_interval: float = Field(
+        2.0, ge=0, description="Seconds between checks of cached templates for edits on disk"
+    )
+    section_concurrency: int = Field(
+        8, ge=1, description="Report sections generated at the same time"
+    )
+    section_workers: Optional[int] = Field(
+        None, ge=1, description="Threads for CPU-heavy sections (defaults to section_concurrency)"
+    )
+    bulk_concurrency: int = Field(
+        8, ge=1, description="Reports generated at the same time by generate_bulk"
+    )
+    section_cache_entries: int = Field(
+        1024, ge=0, description="Generated sections kept for reuse across regenerations (0 disables)"
+    )
+    pdf_workers: Optional[int] = Field(
+        None, ge=1, description="WeasyPrint worker processes (defaults to the CPU count)"
+    )
+    pdf_max_pending: int = Field(
+        DEFAULT_MAX_PENDING, ge=1, description="PDF renders queued or running before callers wait"
+    )
+    pdf_timeout_seconds: Optional[float] = Field(
+        DEFAULT_RENDER_TIMEOUT, gt=0, description="Time limit for a single PDF render"
+    )
     
     class Config:
         arbitrary_types_allowed = True
@@ -24,6 +71,38 @@ class Template:
     content: str
     sections: List[Dict[str, Any]]
     metadata: Dict[str, Any]
+    compiled: Optional[jinja2.Template] = field(default=None, repr=False, compare=False)
+    fragments: Optional[FragmentLibrary] = field(default=None, repr=False, compare=False)
+    
+    def render(self, **context: Any) -> str:
+        """Render the template; the source is compiled at most once"""
+        return self._compiled().render(**context)
+    
+    def stream(
+        self,
+        assessment: Dict[str, Any],
+        analysis: Dict[str, Any],
+        sections: Dict[str, str]
+    ) -> Iterator[str]:
+        """The report document as a lazy stream of chunks. The template gets
+        the data, the generated section bodies and its fragment library."""
+        return self._compiled().generate(
+            assessment=assessment,
+            analysis=analysis,
+            sections=sections,
+            fragments=self.fragment_library()
+        )
+    
+    def _compiled(self) -> jinja2.Template:
+        if self.compiled is None:
+            self.compiled = jinja2.Template(self.content)
+        return self.compiled
+    
+    def fragment_library(self) -> FragmentLibrary:
+        """Static HTML and bound section renderers, built at most once"""
+        if self.fragments is None:
+            self.fragments = FragmentLibrary(self.metadata.get('name', self.id), self.sections, self.metadata)
+        return self.fragments
 
 @dataclass
 class ReportContent:
@@ -42,118 +121,307 @@ class Report:
     assessment_id: UUID
     analysis_id: UUID
 
+@dataclass
+class _CachedTemplate:
+    template: Template
+    fingerprint: Tuple[Any, ...]
+    digest: str
+    checked_at: float
+
 class TemplateManager:
-    """Manages loading and caching of report templates"""
+    """Manages loading and caching of report templates.
+    
+    Templates are cached compiled. Files are read and compiled in a worker
+    thread so the event loop never blocks on disk. A cached template is
+    checked against its files' size and mtime at most every check_interval
+    seconds; when they change, a content hash decides whether it really
+    needs recompiling.
+    """
     
-    def __init__(self, template_dir: Path):
+    def __init__(self, template_dir: Path, check_interval: float = 2.0):
         self.template_dir = template_dir
+        self.check_interval = check_interval
         self.template_cache: Dict[str, Template] = {}
+        self.environment = jinja2.Environment(keep_trailing_newline=True)
+        self.compile_count = 0
+        self._entries: Dict[str, _CachedTemplate] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
     
     async def get_template(self, template_id: str) -> Template:
         """Load and cache template by ID"""
-        if template_id not in self.template_cache:
-            template_path = self.template_dir / f"{template_id}.jinja2"
-            if not template_path.exists():
-                raise ValueError(f"Template not found: {template_id}")
-            
-            # Load template and metadata
-            template_content = template_path.read_text()
-            metadata_path = template_path.with_suffix('.json')
-            metadata = {}
-            if metadata_path.exists():
-                import json
-                metadata = json.loads(metadata_path.read_text())
+        entry = self._entries.get(template_id)
+        if entry is not None and self._is_fresh(entry):
+            return entry.template
+        
+        lock = self._locks.setdefault(template_id, asyncio.Lock())
+        async with lock:
+            # Another caller may have refreshed it while we waited
+            entry = self._entries.get(template_id)
+            if entry is not None and self._is_fresh(entry):
+                return entry.template
             
-            self.template_cache[template_id] = Template(
-                id=template_id,
-                content=template_content,
-                sections=metadata.get('sections', []),
-                metadata=metadata
-            )
+            entry = await asyncio.to_thread(self._load, template_id, entry)
+            self._entries[template_id] = entry
+            self.template_cache[template_id] = entry.template
+            return entry.template
+    
+    async def preload(self) -> List[str]:
+        """Compile every template in template_dir, e.g. at startup"""
+        paths = await asyncio.to_thread(lambda: sorted(self.template_dir.glob("*.jinja2")))
+        template_ids = [path.stem for path in paths]
+        await asyncio.gather(*[self.get_template(template_id) for template_id in template_ids])
+        logger.info(f"Preloaded {len(template_ids)} report templates")
+        return template_ids
+    
+    def invalidate(self, template_id: Optional[str] = None) -> None:
+        """Drop one cached template, or all of them"""
+        if template_id is None:
+            self._entries.clear()
+            self.template_cache.clear()
+        else:
+            self._entries.pop(template_id, None)
+            self.template_cache.pop(template_id, None)
+    
+    def _is_fresh(self, entry: _CachedTemplate) -> bool:
+        return time.monotonic() - entry.checked_at < self.check_interval
+    
+    def _load(self, template_id: str, previous: Optional[_CachedTemplate]) -> _CachedTemplate:
+        """Read and compile a template unless its files are unchanged (runs in a thread)"""
+        if not template_id or "/" in template_id or "\\" in template_id or template_id.startswith("."):
+            raise ValueError(f"Template not found: {template_id}")
+        template_path = self.template_dir / f"{template_id}.jinja2"
+        metadata_path = template_path.with_suffix('.json')
+        
+        fingerprint = (file_fingerprint(template_path), file_fingerprint(metadata_path))
+        if fingerprint[0] is None:
+            raise ValueError(f"Template not found: {template_id}")
+        if previous is not None and previous.fingerprint == fingerprint:
+            previous.checked_at = time.monotonic()
+            return previous
+        
+        # Load template and metadata
+        source = template_path.read_bytes()
+        metadata_source = metadata_path.read_bytes() if fingerprint[1] is not None else b""
+        digest = hashlib.sha256(source + b"\0" + metadata_source).hexdigest()
+        if previous is not None and previous.digest == digest:
+            # Touched but not edited
+            previous.fingerprint = fingerprint
+            previous.checked_at = time.monotonic()
+            return previous
         
-        return self.template_cache[template_id]
+        content = source.decode("utf-8")
+        metadata = json.loads(metadata_source) if metadata_source else {}
+        compiled = self.environment.from_string(content)
+        self.compile_count += 1
+        if previous is not None:
+            logger.info(f"Recompiled edited template {template_id}")
+        
+        template = Template(
+            id=template_id,
+            content=content,
+            sections=metadata.get('sections', []),
+            metadata=metadata,
+            compiled=compiled
+        )
+        template.fragment_library()
+        return _CachedTemplate(template, fingerprint, digest, time.monotonic())
 
 class ContentGenerator:
-    """Generates report content based on assessment and analysis data"""
+    """Generates report content based on assessment and analysis data.
+    
+    Sections are independent, so generate_sections runs up to concurrency
+    of them at once. Section types in THREADED_SECTION_TYPES (or any section
+    configured with "threaded": true) run in a thread pool so CPU-heavy
+    generation does not stall the event loop. Section bodies come from the
+    renderers registered for their type; callers holding a template's
+    FragmentLibrary pass its pre-bound renderers to skip the lookup.
+    
+    With a cache, each section is memoized under a fingerprint of its config
+    and the data it reads, as declared by its renderer in the registry, so
+    regenerating after an edit only rebuilds the sections whose inputs
+    changed.
+    """
+    
+    THREADED_SECTION_TYPES = frozenset({'assessment', 'analysis'})
+    
+    def __init__(
+        self,
+        concurrency: int = 8,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        cache: Optional[ResultCache] = None,
+        registry: SectionRegistry = SECTION_RENDERERS
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.max_workers = max_workers or concurrency
+        self.cache = cache
+        self.registry = registry
+        self._executor = executor
+        self._owns_executor = executor is None
+    
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="report-section"
+            )
+        return self._executor
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the section thread pool if this generator created it"""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+    
+    async def generate_sections(
+        self,
+        sections: List[Dict[str, Any]],
+        assessment_data: Dict[str, Any],
+        analysis_results: Dict[str, Any],
+        renderers: Optional[Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], str]]] = None
+    ) -> Dict[str, str]:
+        """Generate all sections concurrently, keyed by section id in template order"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        renderers = renderers or {}
+        
+        async def bounded(section_config: Dict[str, Any]) -> str:
+            async with semaphore:
+                return await self.generate_section(
+                    section_config, assessment_data, analysis_results, renderers.get(section_config['id'])
+                )
+        
+        tasks = [asyncio.ensure_future(bounded(section)) for section in sections]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # One failed section fails the report; don't leave the rest running
+            for task in tasks:
+                task.cancel()
+            raise
+        
+        return {section['id']: content for section, content in zip(sections, results)}
     
     async def generate_section(
         self,
         section_config: Dict[str, Any],
         assessment_data: Dict[str, Any],
-        analysis_results: Dict[str, Any]
+        analysis_results: Dict[str, Any],
+        renderer: Optional[Callable[[Dict[str, Any], Dict[str, Any]], str]] = None
     ) -> str:
-        """Generate content for a single report section"""
-        section_type = section_config['type']
-        
-        if section_type == 'summary':
-            return self._generate_summary(assessment_data, analysis_results)
-        elif section_type == 'assessment':
-            return self._generate_assessment_section(assessment_data)
-        elif section_type == 'analysis':
-            return self._generate_analysis_section(analysis_results)
-        elif section_type == 'recommendations':
-            return self._generate_recommendations(analysis_results)
+        """Generate content for a single report section, reusing a memoized
+        result when its inputs are unchanged"""
+        if renderer is not None:
+            build = partial(renderer, assessment_data, analysis_results)
         else:
-            raise ValueError(f"Unknown section type: {section_type}")
-    
-    def _generate_summary(self, assessment_data: Dict[str, Any], analysis_results: Dict[str, Any]) -> str:
-        # Implement summary generation logic
-        pass
-    
-    def _generate_assessment_section(self, assessment_data: Dict[str, Any]) -> str:
-        # Implement assessment section generation logic
-        pass
+            build = self._section_builder(section_config, assessment_data, analysis_results)
+        
+        fingerprint = None
+        if self.cache is not None:
+            fingerprint = self.section_fingerprint(section_config, assessment_data, analysis_results)
+            cached = self.cache.get(fingerprint)
+            if cached is not None:
+                return cached
+        
+        threaded = section_config.get('threaded', section_config['type'] in self.THREADED_SECTION_TYPES)
+        if threaded:
+            loop = asyncio.get_running_loop()
+            content = await loop.run_in_executor(self.executor, build)
+        else:
+            content = build()
+        
+        if fingerprint is not None and content is not None:
+            self.cache.set(fingerprint, content)
+        return content
     
-    def _generate_analysis_section(self, analysis_results: Dict[str, Any]) -> str:
-        # Implement analysis section generation logic
-        pass
+    def section_fingerprint(
+        self,
+        section_config: Dict[str, Any],
+        assessment_data: Dict[str, Any],
+        analysis_results: Dict[str, Any]
+    ) -> str:
+        """Hash of a section's config and the slice of data it reads"""
+        inputs = self.registry.inputs(section_config, assessment_data, analysis_results)
+        return content_hash(
+            {'section': section_config, 'inputs': inputs},
+            "report_section",
+            SECTION_GENERATOR_VERSION
+        )
     
-    def _generate_recommendations(self, analysis_results: Dict[str, Any]) -> str:
-        # Implement recommendations generation logic
-        pass
+    def _section_builder(
+        self,
+        section_config: Dict[str, Any],
+        assessment_data: Dict[str, Any],
+        analysis_results: Dict[str, Any]
+    ) -> Callable[[], str]:
+        renderer = self.registry.bind(section_config)
+        return partial(renderer, assessment_data, analysis_results)
 
 class PDFGenerator:
     """Handles conversion of report content to PDF format"""
     
-    def __init__(self, stylesheet_path: Optional[Path] = None):
+    def __init__(
+        self,
+        stylesheet_path: Optional[Path] = None,
+        render_service: Optional[PDFRenderService] = None
+    ):
         self.stylesheet_path = stylesheet_path
+        self.render_service = render_service or PDFRenderService(stylesheet_path=stylesheet_path)
     
-    async def generate_pdf(self, report: Report) -> bytes:
-        """Convert report content to PDF"""
-        try:
-            from weasyprint import HTML, CSS
-            
-            # Convert report content to HTML
-            html_content = self._report_to_html(report)
-            
-            # Apply custom stylesheet if provided
-            stylesheets = []
-            if self.stylesheet_path and self.stylesheet_path.exists():
-                stylesheets.append(CSS(filename=str(self.stylesheet_path)))
-            
-            # Generate PDF
-            html = HTML(string=html_content)
-            return html.write_pdf(stylesheets=stylesheets)
+    async def generate_pdf(self, report: Report, chunks: Optional[Iterable[str]] = None) -> bytes:
+        """Convert report content to PDF in the render worker pool.
         
-        except ImportError:
-            raise RuntimeError("WeasyPrint is required for PDF generation")
+        chunks is the HTML document as a stream, normally Template.stream();
+        it is consumed by the render service and never joined into one
+        string here. Without it, the sections are laid out plainly.
+        """
+        if chunks is None:
+            fragments = FragmentLibrary.for_sections(report.template_id, list(report.content.sections))
+            chunks = fragments.iter_html(report.content.sections)
+        return await self.render_service.render_document(chunks)
     
-    def _report_to_html(self, report: Report) -> str:
-        # Implement HTML conversion logic
-        pass
+    def shutdown(self) -> None:
+        self.render_service.shutdown()
 
 class DocumentationAgent(BaseAgent):
     """Agent responsible for generating standardized OT reports"""
     
-    def __init__(self, config: DocumentationAgentConfig):
+    def __init__(self, config: DocumentationAgentConfig, database: Optional["DatabaseService"] = None):
         super().__init__(
             agent_type=AgentType.DOCUMENTATION,
             name="documentation_agent",
             config=config
         )
-        self.template_manager = TemplateManager(config.template_dir)
-        self.content_generator = ContentGenerator()
-        self.pdf_generator = PDFGenerator(config.stylesheet_path)
+        self.database = database
+        self.report_store = ReportStore(config.output_dir)
+        self.template_manager = TemplateManager(
+            config.template_dir,
+            check_interval=config.template_check_interval
+        )
+        self.content_generator = ContentGenerator(
+            concurrency=config.section_concurrency,
+            max_workers=config.section_workers,
+            cache=ResultCache(max_entries=config.section_cache_entries) if config.section_cache_entries else None
+        )
+        self.pdf_generator = PDFGenerator(
+            config.stylesheet_path,
+            PDFRenderService(
+                max_workers=config.pdf_workers,
+                stylesheet_path=config.stylesheet_path,
+                max_pending=config.pdf_max_pending,
+                timeout=config.pdf_timeout_seconds
+            )
+        )
+    
+    def shutdown(self) -> None:
+        """Release the section generation threads and PDF render workers"""
+        self.content_generator.shutdown()
+        self.pdf_generator.shutdown()
+    
+    async def preload_templates(self) -> List[str]:
+        """Compile all report templates ahead of the first request"""
+        return await self.template_manager.preload()
     
     async def process_assessment(
         self,
@@ -168,50 +436,92 @@ class DocumentationAgent(BaseAgent):
             await self.start_session(context)
             self.update_status(AgentStatus.BUSY)
             
-            # Load template
-            template = await self.template_manager.get_template(template_id)
+            return await self._generate_report(context, assessment_data, analysis_results, template_id)
             
-            # Generate report content
-            sections = {}
-            for section in template.sections:
-                section_content = await self.content_generator.generate_section(
-                    section,
-                    assessment_data,
-                    analysis_results
-                )
-                sections[section['id']] = section_content
-            
-            # Create report
-            report = Report(
-                id=UUID(),
-                content=ReportContent(
-                    sections=sections,
-                    metadata={
-                        'template_id': template_id,
-                        'generated_at': datetime.utcnow().isoformat(),
-                        'context': {
-                            'session_id': str(context.session_id),
-                            'user_id': str(context.user_id) if context.user_id else None,
-                            'therapist_id': str(context.therapist_id) if context.therapist_id else None,
-                            'client_id': str(context.client_id) if context.client_id else None
-                        }
-                    }
-                ),
-                template_id=template_id,
-                created_at=datetime.utcnow(),
-                version="1.0",
-                assessment_id=UUID(assessment_data['id']),
-                analysis_id=UUID(analysis_results['id'])
-            )
+        except Exception as e:
+            await self.handle_error(e, context)
+            raise
+        
+        finally:
+            self.update_status(AgentStatus.IDLE)
+            await self.end_session(context.session_id)
+    
+    async def generate_bulk(
+        self,
+        context: AgentContext,
+        jobs: List[Tuple[Dict[str, Any], Dict[str, Any], str]],
+        batch_id: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        progress: Optional[Callable[[BatchProgress], None]] = None
+    ) -> BatchResult:
+        """Generate many reports in one session, e.g. for a billing run.
+        
+        jobs are (assessment_data, analysis_results, template_id) tuples.
+        Templates are loaded once and the PDF workers started up front, then
+        up to concurrency reports are generated, rendered and saved at once.
+        A failed report is recorded and does not stop the batch.
+        
+        Completed reports are checkpointed under batch_id; running the same
+        batch_id again skips them, so an interrupted run resumes where it
+        stopped. progress is called, and a "bulk_progress" message queued,
+        after every report.
+        """
+        batch_id = batch_id or uuid4().hex
+        concurrency = concurrency or self.config.bulk_concurrency
+        checkpoint = BatchCheckpoint(self.config.output_dir / "batches" / f"{batch_id}.jsonl")
+        done = await asyncio.to_thread(checkpoint.load)
+        
+        keyed = [(batch_job_key(*job), job) for job in jobs]
+        pending = [(key, job) for key, job in keyed if key not in done]
+        state = BatchProgress(batch_id=batch_id, total=len(jobs), skipped=len(jobs) - len(pending))
+        result = BatchResult(batch_id=batch_id, progress=state)
+        
+        try:
+            await self.start_session(context)
+            self.update_status(AgentStatus.BUSY)
             
-            # Generate PDF
-            pdf_content = await self.pdf_generator.generate_pdf(report)
+            # Share compiled templates and warm render workers across the batch
+            for template_id in sorted({job[2] for _, job in pending}):
+                await self.template_manager.get_template(template_id)
+            self.pdf_generator.render_service.start()
             
-            # Save report and PDF
-            await self._save_report(report, pdf_content)
+            semaphore = asyncio.Semaphore(concurrency)
             
-            return report
+            async def run(key: str, job: Tuple[Dict[str, Any], Dict[str, Any], str]) -> None:
+                assessment_data, analysis_results, template_id = job
+                async with semaphore:
+                    try:
+                        report = await self._generate_report(
+                            context, assessment_data, analysis_results, template_id
+                        )
+                    except Exception as e:
+                        logger.warning(f"Bulk report for assessment {assessment_data.get('id')} failed: {e}")
+                        state.failed += 1
+                        result.failures.append({
+                            'key': key,
+                            'assessment_id': assessment_data.get('id'),
+                            'template_id': template_id,
+                            'error': str(e)
+                        })
+                    else:
+                        entry = {
+                            'key': key,
+                            'report_id': str(report.id),
+                            'assessment_id': str(report.assessment_id),
+                            'template_id': template_id,
+                            'pdf_sha256': report.content.metadata.get('pdf_sha256')
+                        }
+                        await asyncio.to_thread(checkpoint.record, entry)
+                        state.completed += 1
+                        result.reports.append(report)
+                
+                await self.publish(BulkProgress(self.id, context.session_id, **state.to_dict()))
+                if progress is not None:
+                    progress(state)
             
+            await asyncio.gather(*[run(key, job) for key, job in pending])
+            return result
+        
         except Exception as e:
             await self.handle_error(e, context)
             raise
@@ -220,7 +530,85 @@ class DocumentationAgent(BaseAgent):
             self.update_status(AgentStatus.IDLE)
             await self.end_session(context.session_id)
     
+    async def _generate_report(
+        self,
+        context: AgentContext,
+        assessment_data: Dict[str, Any],
+        analysis_results: Dict[str, Any],
+        template_id: str
+    ) -> Report:
+        """Generate, render and save one report within an open session"""
+        # Load template
+        template = await self.template_manager.get_template(template_id)
+        
+        # Generate report content
+        sections = await self.content_generator.generate_sections(
+            template.sections,
+            assessment_data,
+            analysis_results,
+            renderers=template.fragment_library().renderers
+        )
+        
+        # Create report
+        report = Report(
+            id=uuid4(),
+            content=ReportContent(
+                sections=sections,
+                metadata={
+                    'template_id': template_id,
+                    'generated_at': datetime.utcnow().isoformat(),
+                    'context': {
+                        'session_id': str(context.session_id),
+                        'user_id': str(context.user_id) if context.user_id else None,
+                        'therapist_id': str(context.therapist_id) if context.therapist_id else None,
+                        'client_id': str(context.client_id) if context.client_id else None
+                    }
+                }
+            ),
+            template_id=template_id,
+            created_at=datetime.utcnow(),
+            version="1.0",
+            assessment_id=UUID(assessment_data['id']),
+            analysis_id=UUID(analysis_results['id'])
+        )
+        
+        # Generate PDF, streaming the compiled template into the renderer
+        chunks = template.stream(assessment_data, analysis_results, sections)
+        pdf_content = await self.pdf_generator.generate_pdf(report, chunks)
+        
+        # Save report and PDF
+        await self._save_report(report, pdf_content)
+        
+        return report
+    
     async def _save_report(self, report: Report, pdf_content: bytes) -> None:
-        """Save report content and PDF to storage"""
-        # Implement storage logic (database + file system)
-        pass
\ No newline at end of file
+        """Save report content and PDF to storage.
+        
+        The PDF goes to the content-addressed report store first; the
+        assessment_documents row and its metadata are then written in one
+        transaction. A failed database write leaves at most an unreferenced
+        blob, never a row pointing at a missing file.
+        """
+        blob = await self.report_store.put(pdf_content)
+        report.content.metadata['pdf_sha256'] = blob.sha256
+        
+        if self.database is None:
+            return
+        metadata = {
+            'report_id': str(report.id),
+            'template_id': report.template_id,
+            'report_version': report.version,
+            'analysis_id': str(report.analysis_id),
+            'content_type': 'application/pdf',
+            'sections': list(report.content.sections),
+            **report.content.metadata
+        }
+        document = await asyncio.to_thread(
+            self.database.add_report_document,
+            report.assessment_id,
+            blob.sha256,
+            blob.size,
+            str(blob.path),
+            metadata
+        )
+        logger.info(f"Saved report {report.id} as version {document.version} of assessment {report.assessment_id}")
\ No newline at end of file
@@ -0,0 +1,243 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+import re
+
+# Headed sections of therapist assessment notes, keyed by output field
+ASSESSMENT_SECTIONS = {
+    "mobility": "Mobility",
+    "adl": "Activities of Daily Living",
+    "home_safety": "Home Safety",
+    "recommendations": "Recommendations",
+    "additional_notes": "Additional Notes"
+}
+
+@dataclass(frozen=True)
+class LineRule:
+    """A pattern applied to single lines.
+
+    Every match of the pattern contains one of the lowercase keywords; lines
+    without any of them are never handed to the pattern.
+    """
+    group: str
+    label: Optional[str]
+    pattern: Pattern
+    keywords: Tuple[str, ...]
+
+def _rule(group: str, label: Optional[str], pattern: str, *keywords: str) -> LineRule:
+    return LineRule(group, label, re.compile(pattern), keywords)
+
+# Marked observations (*, !, important, note)
+OBSERVATION_RULES = [
+    _rule("observations", None, r"\*(.*?)(?:\n|$)", "*"),
+    _rule("observations", None, r"!(.*?)(?:\n|$)", "!"),
+    _rule("observations", None, r"(?i)important:?\s*(.*?)(?:\n|$)", "important"),
+    _rule("observations", None, r"(?i)note:?\s*(.*?)(?:\n|$)", "note")
+]
+
+RISK_RULES = [
+    _rule("risk_factors", "fall_risk", r"(?i)(?:fall[s]? risk|balance|gait)\s*(.*?)(?:\n|$)",
+          "fall risk", "falls risk", "balance", "gait"),
+    _rule("risk_factors", "medication", r"(?i)(?:medication|drug) risk\s*(.*?)(?:\n|$)",
+          "medication risk", "drug risk"),
+    _rule("risk_factors", "safety", r"(?i)(?:safety[s]? risk|hazard)\s*(.*?)(?:\n|$)",
+          "safety risk", "safetys risk", "hazard"),
+    _rule("risk_factors", "cognitive", r"(?i)(?:cognitive|memory|confusion)\s*(.*?)(?:\n|$)",
+          "cognitive", "memory", "confusion")
+]
+
+CONCERN_RULES = [
+    _rule("immediate_concerns", None, r"(?i)urgent:?\s*(.*?)(?:\n|$)", "urgent"),
+    _rule("immediate_concerns", None, r"(?i)immediate:?\s*(.*?)(?:\n|$)", "immediate"),
+    _rule("immediate_concerns", None, r"(?i)critical:?\s*(.*?)(?:\n|$)", "critical"),
+    _rule("immediate_concerns", None, r"(?i)attention:?\s*(.*?)(?:\n|$)", "attention")
+]
+
+def trie_pattern(words: List[str]) -> str:
+    """Regex alternation of literal words factored by common prefix.
+
+    Python's re tries alternatives one by one at every position; sharing
+    prefixes keeps a many-keyword scanner close to a single literal search.
+    Longer words win over their prefixes.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+@dataclass
+class Section:
+    """One headed section: its output key, stripped non-empty body lines and
+    the offset of its heading in the text"""
+    key: str
+    lines: List[str] = field(default_factory=list)
+    start: int = 0
+
+@dataclass
+class ExtractionResult:
+    sections: Dict[str, List[str]]
+    matches: Dict[str, List[Tuple[Optional[str], str]]]
+    text_length: int = 0
+    chars_scanned: int = 0
+
+    @property
+    def passes(self) -> float:
+        """Characters handed to regexes, in multiples of the document length"""
+        return self.chars_scanned / self.text_length if self.text_length else 0.0
+
+    def values(self, group: str) -> List[str]:
+        return [value for _, value in self.matches.get(group, [])]
+
+class ExtractionEngine:
+    """Single-scan extractor for headed clinical text.
+
+    All patterns are compiled once. One scanner, built from the section
+    headings (at the start of a line) and every rule keyword, makes a single
+    pass over the document and each hit is dispatched to its handler:
+    headings open a section whose body runs to the next blank line or
+    heading, and keywords hand just their line to the rules that use them.
+    Only the first occurrence of each heading counts, except for repeated
+    section keys, and a rule capture never continues onto the following
+    line.
+    """
+
+    def __init__(self, sections: Dict[str, str], rules: List[LineRule], repeated: Iterable[str] = ()):
+        self.sections = sections
+        self.rules = rules
+        self.repeated = frozenset(repeated)
+        self._keys = {name.lower(): key for key, name in sections.items()}
+        self._dispatch: Dict[str, List[int]] = {}
+        for index, rule in enumerate(rules):
+            for keyword in rule.keywords:
+                self._dispatch.setdefault(keyword, []).append(index)
+
+        alternatives = []
+        if sections:
+            alternatives.append(
+                r"\n[ \t]*(?:" + trie_pattern(list(self._keys)) + r")(?=[ \t]*(?::|\n|$))"
+            )
+        if rules:
+            alternatives.append(trie_pattern(list(self._dispatch)))
+        pattern = "|".join(alternatives) or r"(?!)"
+        # Text is lowercased before scanning; the case-insensitive scanner is
+        # only needed where lowercasing changes string length
+        self._scanner = re.compile(pattern)
+        self._folding_scanner = re.compile(pattern, re.IGNORECASE)
+        self._body_end = re.compile(r"\n[ \t]*\n")
+
+    def tokenize(self, text: str, result: Optional[ExtractionResult] = None) -> List[Section]:
+        """Split text into headed sections, first occurrence of each heading
+        only unless its key is repeated; characters scanned are added to
+        result, if given"""
+        return self._scan(text, result or ExtractionResult(sections={}, matches={}))[0]
+
+    def extract(self, text: str) -> ExtractionResult:
+        """Extract every section and line rule match in one scan of the text"""
+        result = ExtractionResult(
+            sections={key: [] for key in self.sections},
+            matches={rule.group: [] for rule in self.rules},
+            text_length=len(text)
+        )
+        sections, line_matches = self._scan(text, result)
+        for section in sections:
+            result.sections[section.key].extend(section.lines)
+        # Group matches by rule, in rule order, like one finditer per pattern
+        for rule_matches, rule in zip(line_matches, self.rules):
+            result.matches[rule.group].extend(rule_matches)
+        return result
+
+    def _scan(
+        self,
+        text: str,
+        result: ExtractionResult
+    ) -> Tuple[List[Section], List[List[Tuple[Optional[str], str]]]]:
+        # A leading newline lets a heading on the first line match; every
+        # offset into the scanned text is one past the same offset in text
+        scanned = "\n" + text.lower()
+        scanner = self._scanner
+        if len(scanned) != len(text) + 1:
+            scanned, scanner = "\n" + text, self._folding_scanner
+
+        headings: List[Tuple[int, int, str]] = []
+        triggered: List[List[Tuple[int, int]]] = [[] for _ in self.rules]
+
+        result.chars_scanned += len(text)
+        for hit in scanner.finditer(scanned):
+            start, end = hit.start() - 1, hit.end() - 1
+            word = hit.group().lower()
+            rules = self._dispatch.get(word)
+            if rules is None:
+                key = self._keys.get(word.strip())
+                if key is not None:
+                    headings.append((start + 1, end, key))
+                continue
+            line_start = text.rfind("\n", 0, start) + 1
+            line_end = text.find("\n", end)
+            line = (line_start, len(text) if line_end == -1 else line_end)
+            for index in rules:
+                lines = triggered[index]
+                if not lines or lines[-1] != line:
+                    lines.append(line)
+
+        line_matches: List[List[Tuple[Optional[str], str]]] = []
+        for rule, lines in zip(self.rules, triggered):
+            found = []
+            for line_start, line_end in lines:
+                result.chars_scanned += line_end - line_start
+                found.extend(
+                    (rule.label, match.group(1).strip())
+                    for match in rule.pattern.finditer(text, line_start, line_end)
+                )
+            line_matches.append(found)
+
+        return self._sections(text, headings, result), line_matches
+
+    def _sections(
+        self,
+        text: str,
+        headings: List[Tuple[int, int, str]],
+        result: ExtractionResult
+    ) -> List[Section]:
+        sections: List[Section] = []
+        seen = set()
+        for index, (heading_start, heading_end, key) in enumerate(headings):
+            if key in seen and key not in self.repeated:
+                continue
+            seen.add(key)
+            limit = headings[index + 1][0] if index + 1 < len(headings) else len(text)
+            # Skip the colon and any blank lines before the body
+            body_start = heading_end
+            while body_start < limit and text[body_start] in " \t":
+                body_start += 1
+            if body_start < limit and text[body_start] == ":":
+                body_start += 1
+            while body_start < limit and text[body_start].isspace():
+                body_start += 1
+            blank = self._body_end.search(text, body_start, limit)
+            body_end = blank.start() if blank else limit
+            result.chars_scanned += body_end - heading_end
+            sections.append(Section(key, split_lines(text[body_start:body_end]), heading_start))
+        return sections
+
+def split_lines(body: str) -> List[str]:
+    return [item.strip() for item in body.split("\n") if item.strip()]
+
+ASSESSMENT_NOTES_ENGINE = ExtractionEngine(
+    ASSESSMENT_SECTIONS, OBSERVATION_RULES + RISK_RULES + CONCERN_RULES
+)
+
+@lru_cache(maxsize=64)
+def section_engine(section_name: str) -> ExtractionEngine:
+    """Compiled engine for a single ad hoc section heading"""
+    return ExtractionEngine({section_name: section_name}, [])
@@ -0,0 +1,59 @@
+from typing import Dict, Iterable, Iterator, List
+import re
+
+# "500mg", "10/325", "5ml": a number followed by a unit or ratio. Matched
+# against single tokens, so the work is bounded by the token length.
+DOSAGE_TOKEN = re.compile(r"\d+[\w/]+")
+WORD_TOKEN = re.compile(r"\w+")
+# An entry may end a sentence or list item: "... twice oral;"
+TRAILING_PUNCTUATION = ".,;:"
+
+def iter_line_medications(line: str) -> Iterator[Dict[str, str]]:
+    """Yield medications from one line in a single left-to-right token pass.
+
+    Grammar: NAME+ DOSAGE FREQUENCY ROUTE, where NAME, FREQUENCY and ROUTE
+    are word tokens (ROUTE may end in punctuation) and DOSAGE is a number
+    with a unit. The name is the run of word tokens before the dosage, back
+    to the previous entry or the nearest token that is not a word.
+    """
+    tokens = line.split()
+    name_start = 0
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        if (
+            index > name_start
+            and index + 2 < len(tokens)
+            and DOSAGE_TOKEN.fullmatch(token)
+            and WORD_TOKEN.fullmatch(tokens[index + 1])
+            and WORD_TOKEN.fullmatch(tokens[index + 2].rstrip(TRAILING_PUNCTUATION))
+        ):
+            yield {
+                "name": " ".join(tokens[name_start:index]),
+                "dosage": token,
+                "frequency": tokens[index + 1],
+                "route": tokens[index + 2].rstrip(TRAILING_PUNCTUATION)
+            }
+            index += 3
+            name_start = index
+            continue
+
+        if not WORD_TOKEN.fullmatch(token):
+            name_start = index + 1
+        index += 1
+
+def extract_medications(text: str) -> List[Dict[str, str]]:
+    """Extract medications line by line; runs in time linear in the text"""
+    return [
+        medication
+        for line in text.splitlines()
+        for medication in iter_line_medications(line)
+    ]
+
+def extract_page_medications(pages: Iterable[str]) -> List[Dict[str, str]]:
+    """Extract medications page by page.
+
+    Pages are independent, so ranges of pages can be handed to separate
+    workers and the results concatenated in page order.
+    """
+    return [medication for page in pages for medication in extract_medications(page or "")]
@@ -0,0 +1,374 @@
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+ALL_TOPICS = "*"
+DEFAULT_CHANNEL_SIZE = 1000
+
+class OverflowPolicy(Enum):
+    BLOCK = "block"  # Publishers wait for room (backpressure)
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+
+# Messages
+
+_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+class Message:
+    """Base class for bus messages; the class's topic routes it.
+
+    Messages are slotted to keep per-message memory small. Item access
+    (message["type"], message["session_id"]) is kept for consumers written
+    against the earlier dict messages.
+    """
+
+    __slots__ = ("agent_id", "session_id", "published_at")
+    topic = "message"
+
+    def __init__(self, agent_id: Optional[UUID] = None, session_id: Optional[UUID] = None):
+        self.agent_id = agent_id
+        self.session_id = session_id
+        self.published_at = 0.0
+
+    @classmethod
+    def _fields(cls) -> Tuple[str, ...]:
+        fields = _FIELDS.get(cls)
+        if fields is None:
+            names: List[str] = []
+            for klass in reversed(cls.__mro__):
+                names.extend(name for name in getattr(klass, "__slots__", ()) if name not in names)
+            fields = _FIELDS[cls] = tuple(name for name in names if name not in ("published_at", "topic"))
+        return fields
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "type":
+            return self.topic
+        if key in self._fields():
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": self.topic, **{name: getattr(self, name) for name in self._fields()}}
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields())
+        return f"{type(self).__name__}({fields})"
+
+class SessionStarted(Message):
+    __slots__ = ("agent_type",)
+    topic = "session_started"
+
+    def __init__(self, agent_id: UUID, session_id: UUID, agent_type: str):
+        super().__init__(agent_id, session_id)
+        self.agent_type = agent_type
+
+class SessionEnded(Message):
+    __slots__ = ()
+    topic = "session_ended"
+
+class AgentError(Message):
+    __slots__ = ("error", "error_count")
+    topic = "agent_error"
+
+    def __init__(self, agent_id: UUID, session_id: UUID, error: str, error_count: int):
+        super().__init__(agent_id, session_id)
+        self.error = error
+        self.error_count = error_count
+
+class MetricUpdate(Message):
+    __slots__ = ("metric", "data")
+    topic = "metric_update"
+
+    def __init__(self, agent_id: UUID, metric: str, data: Dict[str, Any], session_id: Optional[UUID] = None):
+        super().__init__(agent_id, session_id)
+        self.metric = metric
+        self.data = data
+
+class BulkProgress(Message):
+    __slots__ = ("batch_id", "total", "completed", "failed", "skipped", "remaining")
+    topic = "bulk_progress"
+
+    def __init__(self, agent_id: UUID, session_id: UUID, batch_id: str, total: int,
+                 completed: int, failed: int, skipped: int, remaining: int):
+        super().__init__(agent_id, session_id)
+        self.batch_id = batch_id
+        self.total = total
+        self.completed = completed
+        self.failed = failed
+        self.skipped = skipped
+        self.remaining = remaining
+
+class AgentEvent(Message):
+    """Message for workflow events without a dedicated class"""
+
+    __slots__ = ("topic", "data")
+
+    def __init__(self, topic: str, agent_id: Optional[UUID] = None,
+                 session_id: Optional[UUID] = None, data: Optional[Dict[str, Any]] = None):
+        super().__init__(agent_id, session_id)
+        self.topic = topic
+        self.data = data or {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return super().__getitem__(key)
+        except KeyError:
+            return self.data[key]
+
+# Channels and subscriptions
+
+class Channel:
+    """Bounded FIFO of one topic's messages for one subscriber"""
+
+    __slots__ = ("topic", "maxsize", "policy", "items", "dropped", "high_water", "space_waiters")
+
+    def __init__(self, topic: str, maxsize: int, policy: OverflowPolicy):
+        self.topic = topic
+        self.maxsize = maxsize
+        self.policy = policy
+        self.items: Deque[Message] = deque()
+        self.dropped = 0
+        self.high_water = 0
+        self.space_waiters: Deque[asyncio.Future] = deque()
+
+    def full(self) -> bool:
+        return len(self.items) >= self.maxsize
+
+    def release_space(self) -> None:
+        while self.space_waiters:
+            waiter = self.space_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+class LatencyGauge:
+    """Publish-to-receive latency of one topic"""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "received": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "max_ms": self.max * 1000
+        }
+
+class Subscription:
+    """A subscriber's view of some topics, with a bounded channel per topic.
+
+    Messages are received oldest first across topics. Iterate with
+    `async for message in subscription`, or call get().
+    """
+
+    def __init__(self, bus: "MessageBus", topics: Iterable[str], name: str,
+                 maxsize: Optional[int] = None, policy: Optional[OverflowPolicy] = None):
+        self.bus = bus
+        self.name = name
+        self.topics = frozenset(topics)
+        self.maxsize = maxsize
+        self.policy = policy
+        self.channels: Dict[str, Channel] = {}
+        self.closed = False
+        self._readers: Deque[asyncio.Future] = deque()
+
+    def channel(self, topic: str) -> Channel:
+        channel = self.channels.get(topic)
+        if channel is None:
+            maxsize, policy = self.bus.channel_config(topic)
+            channel = Channel(topic, self.maxsize or maxsize, self.policy or policy)
+            self.channels[topic] = channel
+        return channel
+
+    def qsize(self) -> int:
+        return sum(len(channel.items) for channel in self.channels.values())
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def get_nowait(self) -> Message:
+        oldest: Optional[Channel] = None
+        for channel in self.channels.values():
+            if channel.items and (oldest is None or channel.items[0].published_at < oldest.items[0].published_at):
+                oldest = channel
+        if oldest is None:
+            raise asyncio.QueueEmpty
+        message = oldest.items.popleft()
+        oldest.release_space()
+        self.bus._latency(message.topic).record(time.monotonic() - message.published_at)
+        return message
+
+    async def get(self) -> Message:
+        """Wait for the next message; raises QueueEmpty once closed and drained"""
+        while True:
+            try:
+                return self.get_nowait()
+            except asyncio.QueueEmpty:
+                if self.closed:
+                    raise
+            reader = asyncio.get_running_loop().create_future()
+            self._readers.append(reader)
+            try:
+                await reader
+            finally:
+                if not reader.done():
+                    reader.cancel()
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Message:
+        try:
+            return await self.get()
+        except asyncio.QueueEmpty:
+            raise StopAsyncIteration
+
+    def close(self) -> None:
+        """Unsubscribe; blocked publishers and readers are released"""
+        self.closed = True
+        self.bus._unsubscribe(self)
+        for channel in self.channels.values():
+            while channel.space_waiters:
+                channel.release_space()
+        self._wake_reader(all_readers=True)
+
+    async def _offer(self, message: Message) -> bool:
+        channel = self.channel(message.topic)
+        while channel.full() and channel.policy is OverflowPolicy.BLOCK and not self.closed:
+            waiter = asyncio.get_running_loop().create_future()
+            channel.space_waiters.append(waiter)
+            await waiter
+        if self.closed:
+            return False
+        if channel.full():
+            channel.dropped += 1
+            if channel.policy is OverflowPolicy.DROP_NEWEST:
+                return False
+            channel.items.popleft()
+        channel.items.append(message)
+        channel.high_water = max(channel.high_water, len(channel.items))
+        self._wake_reader()
+        return True
+
+    def _wake_reader(self, all_readers: bool = False) -> None:
+        while self._readers:
+            reader = self._readers.popleft()
+            if not reader.done():
+                reader.set_result(None)
+                if not all_readers:
+                    return
+
+class MessageBus:
+    """Routes typed messages from agents to topic subscribers.
+
+    Each subscription gets its own bounded channel per topic, so a slow or
+    absent consumer can never grow memory without limit. When a channel is
+    full its topic's policy applies: BLOCK makes the publisher wait, the
+    drop policies discard a message and count it. Messages on topics no
+    one subscribes to are counted and discarded immediately.
+    """
+
+    def __init__(self, default_size: int = DEFAULT_CHANNEL_SIZE,
+                 default_policy: OverflowPolicy = OverflowPolicy.BLOCK):
+        self.default_size = default_size
+        self.default_policy = default_policy
+        self._topic_config: Dict[str, Tuple[int, OverflowPolicy]] = {}
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+        self._published: Dict[str, int] = {}
+        self._unrouted: Dict[str, int] = {}
+        self._latencies: Dict[str, LatencyGauge] = {}
+
+    def configure(self, topic: str, maxsize: Optional[int] = None,
+                  policy: Optional[OverflowPolicy] = None) -> None:
+        """Set the channel size and overflow policy for a topic"""
+        current_size, current_policy = self.channel_config(topic)
+        self._topic_config[topic] = (maxsize or current_size, policy or current_policy)
+
+    def channel_config(self, topic: str) -> Tuple[int, OverflowPolicy]:
+        return self._topic_config.get(topic, (self.default_size, self.default_policy))
+
+    def subscribe(self, topics: Iterable[str], name: str = "subscriber",
+                  maxsize: Optional[int] = None, policy: Optional[OverflowPolicy] = None) -> Subscription:
+        """Subscribe to topics, or to every topic with ALL_TOPICS"""
+        subscription = Subscription(self, topics, name, maxsize, policy)
+        for topic in subscription.topics:
+            self._subscriptions.setdefault(topic, []).append(subscription)
+        return subscription
+
+    async def publish(self, message: Message) -> int:
+        """Deliver a message to its topic's subscribers; returns how many accepted it"""
+        topic = message.topic
+        message.published_at = time.monotonic()
+        self._published[topic] = self._published.get(topic, 0) + 1
+
+        # A subscription to both the topic and ALL_TOPICS gets the message once
+        subscribers = list(dict.fromkeys(
+            self._subscriptions.get(topic, []) + self._subscriptions.get(ALL_TOPICS, [])
+        ))
+        if not subscribers:
+            self._unrouted[topic] = self._unrouted.get(topic, 0) + 1
+            return 0
+        delivered = 0
+        for subscription in subscribers:
+            delivered += await subscription._offer(message)
+        return delivered
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-topic counts and latency, and per-subscriber queue depths"""
+        topics = set(self._published) | set(self._latencies)
+        subscribers = {id(sub): sub for subs in self._subscriptions.values() for sub in subs}
+        return {
+            "topics": {
+                topic: {
+                    "published": self._published.get(topic, 0),
+                    "unrouted": self._unrouted.get(topic, 0),
+                    **self._latency(topic).to_dict()
+                }
+                for topic in sorted(topics)
+            },
+            "subscribers": {
+                subscription.name: {
+                    channel.topic: {
+                        "depth": len(channel.items),
+                        "high_water": channel.high_water,
+                        "capacity": channel.maxsize,
+                        "dropped": channel.dropped
+                    }
+                    for channel in subscription.channels.values()
+                }
+                for subscription in subscribers.values()
+            }
+        }
+
+    def _latency(self, topic: str) -> LatencyGauge:
+        gauge = self._latencies.get(topic)
+        if gauge is None:
+            gauge = self._latencies[topic] = LatencyGauge()
+        return gauge
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        for topic in subscription.topics:
+            subscribers = self._subscriptions.get(topic, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
@@ -0,0 +1,70 @@
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import mmap
+import os
+
+from .record_extraction import PARSER_VERSION
+from .result_cache import ResultCache
+
+DEFAULT_PARSE_CACHE_BYTES = 256 * 1024 * 1024
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file's contents, read through a memory map so large
+    PDFs are hashed without copying them into Python memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        try:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        except ValueError:
+            pass  # Empty files cannot be mapped and hash as empty input
+    return digest.hexdigest()
+
+def file_fingerprint(path: Path) -> Optional[Tuple[int, int]]:
+    """Cheap change marker for a file: size and modification time, or None
+    if the file does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+class ParseCache:
+    """On-disk cache of parsed medical records keyed by file content.
+
+    Entries hold the diagnoses, medications and medical_history structures
+    for one file under its SHA-256 plus PARSER_VERSION, so identical PDFs
+    re-uploaded under any name skip pypdf and the extractors entirely.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = DEFAULT_PARSE_CACHE_BYTES,
+        memory_entries: int = 128
+    ):
+        self.store = ResultCache(
+            max_entries=memory_entries,
+            disk_dir=cache_dir,
+            max_disk_bytes=max_bytes
+        )
+
+    @staticmethod
+    def key(digest: str) -> str:
+        return f"{digest}-v{PARSER_VERSION}"
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached record for a file digest, or None"""
+        return self.store.get(self.key(digest))
+
+    def set(self, digest: str, record: Dict[str, Any]) -> None:
+        """Cache the extracted structures for a file digest"""
+        self.store.set(self.key(digest), {
+            "diagnoses": record["diagnoses"],
+            "medications": record["medications"],
+            "medical_history": record["medical_history"]
+        })
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return self.store.get_metrics()
@@ -0,0 +1,167 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import os
+
+import pypdf
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGES_PER_CHUNK = 50
+DEFAULT_LARGE_FILE_BYTES = 5 * 1024 * 1024
+
+# Worker functions run in child processes and must stay module-level so
+# they can be pickled by the executor
+
+def count_pages(pdf_path: str) -> int:
+    """Return the number of pages in a PDF"""
+    with open(pdf_path, 'rb') as file:
+        return len(pypdf.PdfReader(file).pages)
+
+def extract_page_range(pdf_path: str, start: int = 0, stop: Optional[int] = None) -> List[str]:
+    """Extract text for pages [start, stop) of a PDF"""
+    with open(pdf_path, 'rb') as file:
+        pdf = pypdf.PdfReader(file)
+        pages = pdf.pages[start:stop]
+        return [page.extract_text() or "" for page in pages]
+
+def iter_page_texts(pdf_path: str) -> Iterator[str]:
+    """Yield the text of each page in turn, without assembling the document"""
+    with open(pdf_path, 'rb') as file:
+        for page in pypdf.PdfReader(file).pages:
+            yield page.extract_text() or ""
+
+@dataclass
+class IngestedDocument:
+    """Extracted page texts for one PDF, or the error that prevented it"""
+    path: Path
+    pages: List[str] = field(default_factory=list)
+    error: Optional[BaseException] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self.pages)
+
+class PDFIngestionEngine:
+    """Extracts PDF text across a process pool, off the event loop.
+
+    Large files are split into page-range chunks so one long medical record
+    can use several workers. Documents are yielded in input order while later
+    files are still being extracted.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        pages_per_chunk: int = DEFAULT_PAGES_PER_CHUNK,
+        large_file_bytes: int = DEFAULT_LARGE_FILE_BYTES,
+        executor: Optional[Executor] = None
+    ):
+        if pages_per_chunk < 1:
+            raise ValueError("pages_per_chunk must be at least 1")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_chunk = pages_per_chunk
+        self.large_file_bytes = large_file_bytes
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker pool if this engine created it"""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    async def extract(self, pdf_path: Path) -> IngestedDocument:
+        """Extract all page texts from a single PDF"""
+        loop = asyncio.get_running_loop()
+        path = str(pdf_path)
+        try:
+            if os.path.getsize(path) < self.large_file_bytes:
+                pages = await loop.run_in_executor(self.executor, extract_page_range, path)
+                return IngestedDocument(path=Path(pdf_path), pages=pages)
+
+            page_count = await loop.run_in_executor(self.executor, count_pages, path)
+            chunks = await asyncio.gather(*[
+                loop.run_in_executor(self.executor, extract_page_range, path, start, stop)
+                for start, stop in self._chunk_ranges(page_count)
+            ])
+            return IngestedDocument(
+                path=Path(pdf_path),
+                pages=[page for chunk in chunks for page in chunk]
+            )
+        except Exception as e:
+            return IngestedDocument(path=Path(pdf_path), error=e)
+
+    async def iter_documents(self, pdf_paths: Sequence[Path]) -> AsyncIterator[IngestedDocument]:
+        """Yield extracted documents in input order as they become ready.
+
+        At most twice the worker count of documents are in flight, which keeps
+        every core busy without holding a whole claim package in memory.
+        """
+        window = self.max_workers * 2
+        pending: List[asyncio.Task] = []
+        paths = iter(pdf_paths)
+
+        def fill() -> None:
+            while len(pending) < window:
+                pdf_path = next(paths, None)
+                if pdf_path is None:
+                    return
+                pending.append(asyncio.ensure_future(self.extract(pdf_path)))
+
+        fill()
+        try:
+            while pending:
+                document = await pending.pop(0)
+                fill()
+                yield document
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream_pages(self, pdf_path: Path) -> AsyncIterator[str]:
+        """Yield page texts of one PDF in order as page-range jobs complete.
+
+        Only max_workers chunks are in flight, so at most
+        max_workers * pages_per_chunk page texts are held at once.
+        """
+        loop = asyncio.get_running_loop()
+        path = str(pdf_path)
+        page_count = await loop.run_in_executor(self.executor, count_pages, path)
+        ranges = iter(self._chunk_ranges(page_count))
+        pending: List[asyncio.Future] = []
+
+        def fill() -> None:
+            while len(pending) < self.max_workers:
+                page_range = next(ranges, None)
+                if page_range is None:
+                    return
+                pending.append(
+                    loop.run_in_executor(self.executor, extract_page_range, path, *page_range)
+                )
+
+        fill()
+        try:
+            while pending:
+                pages = await pending.pop(0)
+                fill()
+                for page_text in pages:
+                    yield page_text
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _chunk_ranges(self, page_count: int) -> List[Tuple[int, int]]:
+        return [
+            (start, min(start + self.pages_per_chunk, page_count))
+            for start in range(0, page_count, self.pages_per_chunk)
+        ]
@@ -1,15 +1,61 @@
-from typing import Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 from uuid import UUID
+import asyncio
 import logging
 from pathlib import Path
-import pypdf
-import re
 from datetime import datetime
 
+from pydantic import Field
+
 from .base import BaseAgent, AgentType, AgentConfig, AgentContext
+from .pdf_ingestion import (
+    PDFIngestionEngine, DEFAULT_PAGES_PER_CHUNK, DEFAULT_LARGE_FILE_BYTES
+)
+from .combined_records import CombinedRecords, RISK_CONDITIONS
+from .document_triage import DEFAULT_SAMPLE_PAGES, classify, sample_document
+from .extraction_engine import (
+    ASSESSMENT_NOTES_ENGINE, ExtractionResult, section_engine
+)
+from .parse_cache import DEFAULT_PARSE_CACHE_BYTES, ParseCache, file_fingerprint, file_sha256
+from .record_extraction import (
+    HISTORY_SECTIONS, StreamingRecordExtractor, extract_record, extract_record_pages
+)
 
 logger = logging.getLogger(__name__)
 
+class PDFParserAgentConfig(AgentConfig):
+    """Configuration specific to the PDF Parser Agent"""
+    ingestion_workers: Optional[int] = Field(
+        None, ge=1, description="Worker processes for PDF extraction (defaults to CPU count)"
+    )
+    pages_per_chunk: int = Field(
+        DEFAULT_PAGES_PER_CHUNK, ge=1, description="Pages per extraction job for large files"
+    )
+    large_file_bytes: int = Field(
+        DEFAULT_LARGE_FILE_BYTES, ge=0, description="File size above which PDFs are split into page chunks"
+    )
+    streaming: bool = Field(
+        False, description="Extract page by page with memory bounded by window_pages"
+    )
+    window_pages: int = Field(
+        8, ge=2, description="Pages held in memory at once in streaming mode"
+    )
+    parse_cache_dir: Optional[Path] = Field(
+        None, description="Directory for cached per-file parse results (disabled when unset)"
+    )
+    parse_cache_max_bytes: int = Field(
+        DEFAULT_PARSE_CACHE_BYTES, ge=0, description="Disk budget for the parse cache"
+    )
+    triage: bool = Field(
+        False, description="Sample each file first and defer invoices and correspondence"
+    )
+    triage_sample_pages: int = Field(
+        DEFAULT_SAMPLE_PAGES, ge=1, description="Leading pages read when triaging a file"
+    )
+    
+    class Config:
+        arbitrary_types_allowed = True
+
 class PDFParserAgent(BaseAgent):
     """Agent for parsing medical records and assessment notes from PDFs"""
     
@@ -19,6 +65,26 @@ class PDFParserAgent(BaseAgent):
             name="pdf_parser_agent",
             config=config
         )
+        self.ingestion = PDFIngestionEngine(
+            max_workers=getattr(config, "ingestion_workers", None),
+            pages_per_chunk=getattr(config, "pages_per_chunk", DEFAULT_PAGES_PER_CHUNK),
+            large_file_bytes=getattr(config, "large_file_bytes", DEFAULT_LARGE_FILE_BYTES)
+        )
+        self.streaming = getattr(config, "streaming", False)
+        self.window_pages = getattr(config, "window_pages", 8)
+        
+        self.triage = getattr(config, "triage", False)
+        self.triage_sample_pages = getattr(config, "triage_sample_pages", DEFAULT_SAMPLE_PAGES)
+        
+        cache_dir = getattr(config, "parse_cache_dir", None)
+        self.parse_cache = ParseCache(
+            cache_dir,
+            max_bytes=getattr(config, "parse_cache_max_bytes", DEFAULT_PARSE_CACHE_BYTES)
+        ) if cache_dir else None
+        
+    def shutdown(self) -> None:
+        """Release the PDF extraction worker pool"""
+        self.ingestion.shutdown()
         
     async def process_documents(self,
                               context: AgentContext,
@@ -30,13 +96,16 @@ class PDFParserAgent(BaseAgent):
             await self.start_session(context)
             
             # Parse medical records
-            medical_data = await self._parse_medical_records(pdf_paths)
+            deferred: Dict[int, Dict[str, Any]] = {}
+            medical_data = await self._parse_medical_records(pdf_paths, deferred)
             
             # Parse assessment notes
             assessment_data = self._parse_assessment_notes(assessment_notes)
             
             # Combine and structure all data
             structured_data = self._structure_data(medical_data, assessment_data)
+            if self.triage:
+                structured_data["metadata"]["deferred_sources"] = [deferred[index] for index in sorted(deferred)]
             
             return structured_data
             
@@ -48,52 +117,195 @@ class PDFParserAgent(BaseAgent):
         finally:
             await self.end_session(context.session_id)
     
-    async def _parse_medical_records(self, pdf_paths: List[Path]) -> List[Dict[str, Any]]:
+    async def process_document_changes(self,
+                                       context: AgentContext,
+                                       combined: CombinedRecords,
+                                       pdf_paths: List[Path],
+                                       assessment_notes: str) -> Dict[str, Any]:
+        """Bring stored combined records up to date with a claim's current
+        document set, parsing only files that are new or changed"""
+        try:
+            await self.start_session(context)
+            
+            changed, removed = combined.pending(pdf_paths)
+            for source in removed:
+                combined.remove(source)
+            
+            # Fingerprint before parsing so an edit made mid-parse is picked up next time
+            fingerprints = {}
+            for index, pdf_path in enumerate(changed):
+                try:
+                    fingerprint = file_fingerprint(pdf_path)
+                except OSError:
+                    continue
+                if fingerprint is not None:
+                    fingerprints[index] = fingerprint
+            
+            deferred: Dict[int, Dict[str, Any]] = {}
+            records = await self._parse_record_map(changed, deferred)
+            for index, pdf_path in enumerate(changed):
+                if index not in fingerprints or (index not in records and index not in deferred):
+                    # Unreadable now, so its earlier version no longer applies
+                    combined.remove(str(pdf_path))
+                elif index in deferred:
+                    # Kept under its fingerprint so it is not re-triaged until it changes
+                    combined.defer(str(pdf_path), deferred[index], fingerprints[index])
+                else:
+                    combined.put(str(pdf_path), records[index], fingerprints[index])
+            
+            logger.info(
+                f"Merged {len(records)} changed, deferred {len(deferred)} and removed "
+                f"{len(removed)} of {len(combined)} medical records"
+            )
+            
+            assessment_data = self._parse_assessment_notes(assessment_notes)
+            structured_data = self._structure_combined(combined, assessment_data)
+            if self.triage:
+                structured_data["metadata"]["deferred_sources"] = combined.deferred()
+            
+            return structured_data
+            
+        except Exception as e:
+            logger.error(f"Error processing document changes: {str(e)}")
+            await self.handle_error(e, context)
+            raise
+            
+        finally:
+            await self.end_session(context.session_id)
+    
+    async def _parse_medical_records(self,
+                                     pdf_paths: List[Path],
+                                     deferred: Optional[Dict[int, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """Extract relevant information from medical record PDFs"""
-        medical_data = []
+        records = await self._parse_record_map(pdf_paths, deferred)
+        return [
+            self._medical_record_entry(pdf_paths[index], records[index])
+            for index in sorted(records)
+        ]
+    
+    async def _parse_record_map(self,
+                                pdf_paths: List[Path],
+                                deferred: Optional[Dict[int, Dict[str, Any]]] = None) -> Dict[int, Dict[str, Any]]:
+        """Parsed records by position in pdf_paths; files that fail are left
+        out, and triage decisions for files set aside go into deferred by
+        position"""
+        records: Dict[int, Dict[str, Any]] = {}
+        digests = await self._file_digests(pdf_paths) if self.parse_cache else {}
         
-        for pdf_path in pdf_paths:
+        # Files parsed before, under any name, skip pypdf and extraction
+        for index, digest in digests.items():
+            cached = self.parse_cache.get(digest)
+            if cached is not None:
+                records[index] = cached
+        
+        uncached = [(index, path) for index, path in enumerate(pdf_paths) if index not in records]
+        if uncached and self.triage:
+            uncached = await self._triage(uncached, deferred)
+        if uncached:
+            extract = self._stream_records if self.streaming else self._extract_records
+            async for index, record in extract(uncached):
+                records[index] = record
+                if index in digests:
+                    self.parse_cache.set(digests[index], record)
+        
+        return records
+    
+    async def _triage(
+        self,
+        items: List[Tuple[int, Path]],
+        deferred: Optional[Dict[int, Dict[str, Any]]]
+    ) -> List[Tuple[int, Path]]:
+        """Keep the files worth a full parse, sampling each in the worker pool"""
+        loop = asyncio.get_running_loop()
+        samples = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    self.ingestion.executor, sample_document, str(path), self.triage_sample_pages
+                )
+                for _, path in items
+            ],
+            return_exceptions=True
+        )
+        
+        kept = []
+        for (index, path), sample in zip(items, samples):
+            if isinstance(sample, BaseException):
+                kept.append((index, path))  # The full parse reports the error
+                continue
+            decision = classify(sample)
+            if decision.parse:
+                kept.append((index, path))
+                continue
+            logger.info(f"Deferring {path.name} ({decision.document_type}): {decision.reason}")
+            if deferred is not None:
+                deferred[index] = {"source": path.name, **decision.to_dict()}
+        return kept
+    
+    async def _file_digests(self, pdf_paths: List[Path]) -> Dict[int, str]:
+        """Hash files off the event loop; unreadable files are left out"""
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *[loop.run_in_executor(None, file_sha256, path) for path in pdf_paths],
+            return_exceptions=True
+        )
+        return {
+            index: digest for index, digest in enumerate(results)
+            if isinstance(digest, str)
+        }
+    
+    async def _extract_records(
+        self,
+        items: List[Tuple[int, Path]]
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Extract whole documents; text extraction runs in worker processes"""
+        positions = iter(items)
+        async for document in self.ingestion.iter_documents([path for _, path in items]):
+            index, _ = next(positions)
+            if document.error is not None:
+                logger.error(f"Error processing {document.path}: {str(document.error)}")
+                continue
+            
             try:
-                with open(pdf_path, 'rb') as file:
-                    pdf = pypdf.PdfReader(file)
-                    text = ""
-                    for page in pdf.pages:
-                        text += page.extract_text()
-                    
-                    # Extract key medical information
-                    diagnoses = self._extract_diagnoses(text)
-                    medications = self._extract_medications(text)
-                    history = self._extract_medical_history(text)
-                    
-                    medical_data.append({
-                        "source": pdf_path.name,
-                        "diagnoses": diagnoses,
-                        "medications": medications,
-                        "medical_history": history,
-                        "processed_at": datetime.utcnow().isoformat()
-                    })
-                    
+                # Extract key medical information
+                yield index, extract_record_pages(document.pages)
+            except Exception as e:
+                logger.error(f"Error processing {document.path}: {str(e)}")
+                continue
+    
+    async def _stream_records(
+        self,
+        items: List[Tuple[int, Path]]
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Extract page by page without holding whole documents"""
+        for index, pdf_path in items:
+            try:
+                extractor = StreamingRecordExtractor(window_pages=self.window_pages)
+                async for page_text in self.ingestion.stream_pages(pdf_path):
+                    extractor.feed(page_text)
+                yield index, extractor.finish()
+                
             except Exception as e:
                 logger.error(f"Error processing {pdf_path}: {str(e)}")
                 continue
-        
-        return medical_data
+    
+    def _medical_record_entry(self, pdf_path: Path, record: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "source": pdf_path.name,
+            "diagnoses": record["diagnoses"],
+            "medications": record["medications"],
+            "medical_history": record["medical_history"],
+            "processed_at": datetime.utcnow().isoformat()
+        }
     
     def _parse_assessment_notes(self, notes: str) -> Dict[str, Any]:
         """Parse and structure therapist's assessment notes"""
-        sections = {
-            "mobility": self._extract_section(notes, "Mobility"),
-            "adl": self._extract_section(notes, "Activities of Daily Living"),
-            "home_safety": self._extract_section(notes, "Home Safety"),
-            "recommendations": self._extract_section(notes, "Recommendations"),
-            "additional_notes": self._extract_section(notes, "Additional Notes")
-        }
+        extracted = ASSESSMENT_NOTES_ENGINE.extract(notes)
         
         return {
-            "sections": sections,
-            "key_observations": self._extract_key_observations(notes),
-            "risk_factors": self._identify_risk_factors(notes),
-            "immediate_concerns": self._identify_immediate_concerns(notes)
+            "sections": extracted.sections,
+            "key_observations": extracted.values("observations"),
+            "risk_factors": self._risk_factor_entries(extracted),
+            "immediate_concerns": extracted.values("immediate_concerns")
         }
     
     def _structure_data(self,
@@ -115,115 +327,64 @@ class PDFParserAgent(BaseAgent):
             }
         }
     
+    def _structure_combined(self,
+                           combined: CombinedRecords,
+                           assessment_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Structure incrementally combined records like _structure_data"""
+        risks = list(assessment_data.get("risk_factors", []))
+        risks.extend(combined.condition_risks())
+        return {
+            "medical_records": {
+                "diagnoses": combined.diagnoses(),
+                "medications": combined.medications(),
+                "history": combined.history()
+            },
+            "assessment": assessment_data,
+            "identified_risks": risks,
+            "recommendations": self._compile_recommendations(assessment_data),
+            "metadata": {
+                "processed_at": datetime.utcnow().isoformat(),
+                "source_count": combined.parsed_count()
+            }
+        }
+    
     def _extract_diagnoses(self, text: str) -> List[str]:
         """Extract diagnoses from medical text"""
-        # Look for diagnosis patterns
-        diagnoses = []
-        diagnosis_patterns = [
-            r"Diagnosis:[\s\n]*(.*?)(?:\n\n|\Z)",
-            r"Assessment:[\s\n]*(.*?)(?:\n\n|\Z)",
-            r"Impression:[\s\n]*(.*?)(?:\n\n|\Z)"
-        ]
-        
-        for pattern in diagnosis_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                diagnoses.extend([d.strip() for d in match.group(1).split('\n') if d.strip()])
-        
-        return list(set(diagnoses))  # Remove duplicates
+        return extract_record(text, fields=["diagnosis"])["diagnoses"]
     
     def _extract_medications(self, text: str) -> List[Dict[str, str]]:
         """Extract medications from medical text"""
-        medications = []
-        # Look for medication patterns
-        med_pattern = r"(?i)([\w\s]+)\s+(\d+[\w\/]+)\s+(\w+)\s+(\w+)"
-        matches = re.finditer(med_pattern, text)
-        
-        for match in matches:
-            medications.append({
-                "name": match.group(1).strip(),
-                "dosage": match.group(2),
-                "frequency": match.group(3),
-                "route": match.group(4)
-            })
-        
-        return medications
+        return extract_record(text, fields=["medication"])["medications"]
     
     def _extract_medical_history(self, text: str) -> Dict[str, List[str]]:
         """Extract medical history information"""
-        return {
-            "surgeries": self._extract_section(text, "Surgical History"),
-            "conditions": self._extract_section(text, "Past Medical History"),
-            "allergies": self._extract_section(text, "Allergies"),
-            "family_history": self._extract_section(text, "Family History")
-        }
+        return extract_record(text, fields=HISTORY_SECTIONS)["medical_history"]
     
     def _extract_section(self, text: str, section_name: str) -> List[str]:
         """Extract content from a specific section"""
-        pattern = f"{section_name}:?[\\s\\n]*(.*?)(?:\\n\\n|\\Z)"
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-        if match:
-            return [item.strip() for item in match.group(1).split('\n') if item.strip()]
-        return []
+        return section_engine(section_name).extract(text).sections[section_name]
     
     def _extract_key_observations(self, notes: str) -> List[str]:
         """Extract key observations from assessment notes"""
-        observations = []
-        
-        # Look for marked observations (*, !, important, note, etc.)
-        observation_patterns = [
-            r"\*(.*?)(?:\n|$)",
-            r"!(.*?)(?:\n|$)",
-            r"(?i)important:?\s*(.*?)(?:\n|$)",
-            r"(?i)note:?\s*(.*?)(?:\n|$)"
-        ]
-        
-        for pattern in observation_patterns:
-            matches = re.finditer(pattern, notes)
-            observations.extend([m.group(1).strip() for m in matches])
-        
-        return observations
+        return ASSESSMENT_NOTES_ENGINE.extract(notes).values("observations")
     
     def _identify_risk_factors(self, notes: str) -> List[Dict[str, Any]]:
         """Identify risk factors from assessment notes"""
-        risk_factors = []
-        
-        # Common risk patterns to look for
-        risk_patterns = {
-            "fall_risk": r"(?i)(?:fall[s]? risk|balance|gait)\s*(.*?)(?:\n|$)",
-            "medication": r"(?i)(?:medication|drug) risk\s*(.*?)(?:\n|$)",
-            "safety": r"(?i)(?:safety[s]? risk|hazard)\s*(.*?)(?:\n|$)",
-            "cognitive": r"(?i)(?:cognitive|memory|confusion)\s*(.*?)(?:\n|$)"
-        }
-        
-        for risk_type, pattern in risk_patterns.items():
-            matches = re.finditer(pattern, notes)
-            for match in matches:
-                risk_factors.append({
-                    "type": risk_type,
-                    "description": match.group(1).strip(),
-                    "source": "assessment_notes"
-                })
-        
-        return risk_factors
+        return self._risk_factor_entries(ASSESSMENT_NOTES_ENGINE.extract(notes))
     
     def _identify_immediate_concerns(self, notes: str) -> List[str]:
         """Identify immediate concerns requiring attention"""
-        concerns = []
-        
-        # Look for urgent or immediate concern patterns
-        concern_patterns = [
-            r"(?i)urgent:?\s*(.*?)(?:\n|$)",
-            r"(?i)immediate:?\s*(.*?)(?:\n|$)",
-            r"(?i)critical:?\s*(.*?)(?:\n|$)",
-            r"(?i)attention:?\s*(.*?)(?:\n|$)"
+        return ASSESSMENT_NOTES_ENGINE.extract(notes).values("immediate_concerns")
+    
+    def _risk_factor_entries(self, extracted: ExtractionResult) -> List[Dict[str, Any]]:
+        return [
+            {
+                "type": risk_type,
+                "description": description,
+                "source": "assessment_notes"
+            }
+            for risk_type, description in extracted.matches["risk_factors"]
         ]
-        
-        for pattern in concern_patterns:
-            matches = re.finditer(pattern, notes)
-            concerns.extend([m.group(1).strip() for m in matches])
-        
-        return concerns
     
     def _combine_diagnoses(self, medical_data: List[Dict[str, Any]]) -> List[str]:
         """Combine and deduplicate diagnoses from all sources"""
@@ -281,17 +442,8 @@ class PDFParserAgent(BaseAgent):
             conditions = history.get("conditions", [])
             
             # Look for high-risk conditions
-            risk_conditions = [
-                "diabetes",
-                "hypertension",
-                "stroke",
-                "falls",
-                "dizziness",
-                "vision impairment"
-            ]
-            
             for condition in conditions:
-                if any(risk in condition.lower() for risk in risk_conditions):
+                if any(risk in condition.lower() for risk in RISK_CONDITIONS):
                     risks.append({
                         "type": "medical_condition",
                         "description": condition,
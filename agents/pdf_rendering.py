@@ -0,0 +1,206 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import asyncio
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING = 32
+DEFAULT_RENDER_TIMEOUT = 120.0
+
+class RenderTimeout(Exception):
+    """A PDF render did not finish within its timeout"""
+
+# Worker state and functions run in the render processes and must stay
+# module-level so they can be pickled by the executor
+
+_worker_stylesheets: List[Any] = []
+_worker_error: Optional[str] = None
+
+def init_worker(stylesheet_path: Optional[str]) -> None:
+    """Import WeasyPrint and parse the stylesheet once per worker process"""
+    global _worker_stylesheets, _worker_error
+    try:
+        from weasyprint import CSS
+    except ImportError:
+        # Raising here would break the whole pool; fail each render instead
+        _worker_error = "WeasyPrint is required for PDF generation"
+        return
+    if stylesheet_path and os.path.exists(stylesheet_path):
+        _worker_stylesheets = [CSS(filename=stylesheet_path)]
+
+def render_html(html_content: str) -> bytes:
+    """Render HTML to PDF bytes with the worker's pre-parsed stylesheets"""
+    if _worker_error:
+        raise RuntimeError(_worker_error)
+    from weasyprint import HTML
+    return HTML(string=html_content).write_pdf(stylesheets=_worker_stylesheets)
+
+def render_html_file(path: str) -> bytes:
+    """Render an HTML document spooled to disk by the parent process"""
+    if _worker_error:
+        raise RuntimeError(_worker_error)
+    from weasyprint import HTML
+    return HTML(filename=path, encoding="utf-8").write_pdf(stylesheets=_worker_stylesheets)
+
+def _spool(chunks: Iterable[str]) -> str:
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", suffix=".html", delete=False) as file:
+        try:
+            for chunk in chunks:
+                file.write(chunk)
+        except BaseException:
+            file.close()
+            os.unlink(file.name)
+            raise
+        return file.name
+
+@dataclass
+class RenderStats:
+    completed: int = 0
+    failed: int = 0
+    timeouts: int = 0
+    restarts: int = 0
+
+class PDFRenderService:
+    """Renders report HTML to PDF in a pool of warm WeasyPrint processes.
+
+    At most max_pending renders are queued or running at once; further
+    callers wait for a slot, which pushes back on whoever is producing
+    reports instead of growing an unbounded backlog. A render that exceeds
+    its timeout raises RenderTimeout and the pool is restarted, since a
+    worker stuck in WeasyPrint cannot be interrupted; other renders that
+    were running on the old pool are retried once on the new one.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        stylesheet_path: Optional[Path] = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        timeout: Optional[float] = DEFAULT_RENDER_TIMEOUT,
+        render_function: Callable[[str], bytes] = render_html,
+        file_render_function: Callable[[str], bytes] = render_html_file
+    ):
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.stylesheet_path = stylesheet_path
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.render_function = render_function
+        self.file_render_function = file_render_function
+        self.stats = RenderStats()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._generation = 0  # Bumped on every pool restart
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self._running = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=init_worker,
+                initargs=(str(self.stylesheet_path) if self.stylesheet_path else None,)
+            )
+        return self._executor
+
+    def start(self) -> None:
+        """Start the worker processes ahead of the first render"""
+        executor = self.executor
+        for _ in range(self.max_workers):
+            executor.submit(os.getpid)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    async def render(self, html_content: str, timeout: Optional[float] = None) -> bytes:
+        """Render HTML to PDF bytes, waiting for a queue slot if the service is busy"""
+        return await self._submit(self.render_function, html_content, timeout)
+
+    async def render_document(self, chunks: Iterable[str], timeout: Optional[float] = None) -> bytes:
+        """Render an HTML document given as a stream of chunks.
+
+        The chunks are spooled to a temporary file that the worker reads,
+        so the document is never held as one string in this process or
+        pickled across to the worker.
+        """
+        path = await asyncio.to_thread(_spool, chunks)
+        try:
+            return await self._submit(self.file_render_function, path, timeout)
+        finally:
+            os.unlink(path)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "pending": self._pending,
+            "running": self._running,
+            "max_pending": self.max_pending,
+            "completed": self.stats.completed,
+            "failed": self.stats.failed,
+            "timeouts": self.stats.timeouts,
+            "restarts": self.stats.restarts
+        }
+
+    async def _submit(self, function: Callable[[str], bytes], argument: str, timeout: Optional[float]) -> bytes:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        timeout = self.timeout if timeout is None else timeout
+
+        self._pending += 1
+        try:
+            async with self._slots:
+                self._running += 1
+                try:
+                    return await self._render(function, argument, timeout)
+                finally:
+                    self._running -= 1
+        finally:
+            self._pending -= 1
+
+    async def _render(self, function: Callable[[str], bytes], argument: str, timeout: Optional[float]) -> bytes:
+        for attempt in range(2):
+            generation = self._generation
+            future = asyncio.wrap_future(self.executor.submit(function, argument))
+            try:
+                result = await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                self.stats.timeouts += 1
+                self._restart(generation)
+                raise RenderTimeout(f"PDF render exceeded {timeout}s")
+            except BrokenProcessPool as e:
+                if attempt == 0 and generation != self._generation:
+                    continue  # Lost to another job's restart; retry on the new pool
+                self.stats.failed += 1
+                self._restart(generation)
+                raise RuntimeError("PDF render worker died") from e
+            except Exception:
+                self.stats.failed += 1
+                raise
+            self.stats.completed += 1
+            return result
+        raise RuntimeError("PDF render worker died")
+
+    def _restart(self, generation: int) -> None:
+        """Replace the pool, killing its workers, unless already replaced"""
+        if generation != self._generation or self._executor is None:
+            return
+        self._generation += 1
+        self.stats.restarts += 1
+        executor, self._executor = self._executor, None
+        processes = list(getattr(executor, "_processes", {}).values())
+        # Jobs still on the old pool fail with BrokenProcessPool once its
+        # workers are gone, and are retried by their callers
+        executor.shutdown(wait=False)
+        for process in processes:
+            process.terminate()
+        logger.warning(f"Restarted PDF render pool ({len(processes)} workers terminated)")
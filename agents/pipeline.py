@@ -0,0 +1,222 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in milliseconds; the last bucket catches everything slower
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles are bucket upper bounds"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        milliseconds = seconds * 1000
+        self.counts[bisect_left(HISTOGRAM_BOUNDS_MS, milliseconds)] += 1
+        self.count += 1
+        self.total += milliseconds
+        self.max = max(self.max, milliseconds)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return float(HISTOGRAM_BOUNDS_MS[index]) if index < len(HISTOGRAM_BOUNDS_MS) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max,
+            "buckets": dict(zip([*map(str, HISTOGRAM_BOUNDS_MS), "inf"], self.counts))
+        }
+
+@dataclass
+class Stage:
+    """One pipeline stage.
+
+    handler receives the previous stage's result (or the submitted item)
+    and returns the input for the next stage. Returning None ends the
+    item's trip through the pipeline early.
+    """
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    workers: int = 1
+    queue_size: int = 100
+
+class _Envelope:
+    __slots__ = ("item", "future", "submitted_at", "enqueued_at")
+
+    def __init__(self, item: Any, future: asyncio.Future):
+        self.item = item
+        self.future = future
+        self.submitted_at = self.enqueued_at = time.monotonic()
+
+class _StageRuntime:
+    def __init__(self, stage: Stage):
+        self.stage = stage
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=stage.queue_size)
+        self.workers: List[asyncio.Task] = []
+        self.busy = 0
+        self.processed = 0
+        self.failed = 0
+        self.wait = LatencyHistogram()  # Time spent queued before the stage
+        self.service = LatencyHistogram()  # Time in the stage's handler
+        self.latency = LatencyHistogram()  # Queued plus handler time
+
+class Pipeline:
+    """Runs items through a fixed sequence of stages, each with its own
+    worker count and a bounded queue in front of it.
+
+    Stages run concurrently, so while one item is in analysis the next can
+    already be in documentation. A full queue makes the stage before it
+    (or submit, for the first stage) wait, which keeps a slow stage from
+    accumulating an unbounded backlog. Each stage records queue-wait,
+    handler and combined latency histograms; the pipeline records
+    end-to-end latency per item.
+    """
+
+    def __init__(self, stages: Sequence[Stage]):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate stage names: {names}")
+        self.stages = list(stages)
+        self.end_to_end = LatencyHistogram()
+        self.completed = 0
+        self.dropped = 0  # Ended early by a handler returning None
+        self._runtimes: Optional[List[_StageRuntime]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._runtimes is not None
+
+    def start(self) -> None:
+        if self._runtimes is not None:
+            return
+        self._runtimes = [_StageRuntime(stage) for stage in self.stages]
+        for index, runtime in enumerate(self._runtimes):
+            runtime.workers = [
+                asyncio.ensure_future(self._work(index)) for _ in range(runtime.stage.workers)
+            ]
+
+    async def shutdown(self) -> None:
+        """Stop all stage workers; items still queued are cancelled"""
+        if self._runtimes is None:
+            return
+        runtimes, self._runtimes = self._runtimes, None
+        workers = [worker for runtime in runtimes for worker in runtime.workers]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for runtime in runtimes:
+            while not runtime.queue.empty():
+                runtime.queue.get_nowait().future.cancel()
+
+    async def join(self) -> None:
+        """Wait until every queued item has left the pipeline"""
+        for runtime in self._runtimes or []:
+            await runtime.queue.join()
+
+    async def submit(self, item: Any) -> asyncio.Future:
+        """Queue an item (waiting while the first stage is full); returns a
+        future for the last stage's result"""
+        if self._runtimes is None:
+            self.start()
+        envelope = _Envelope(item, asyncio.get_running_loop().create_future())
+        await self._runtimes[0].queue.put(envelope)
+        return envelope.future
+
+    async def process(self, item: Any) -> Any:
+        """Run one item through every stage and return the final result"""
+        return await (await self.submit(item))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        runtimes = self._runtimes or []
+        return {
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "end_to_end": self.end_to_end.to_dict(),
+            "stages": {
+                runtime.stage.name: {
+                    "workers": runtime.stage.workers,
+                    "queued": runtime.queue.qsize(),
+                    "queue_size": runtime.stage.queue_size,
+                    "busy": runtime.busy,
+                    "processed": runtime.processed,
+                    "failed": runtime.failed,
+                    "wait": runtime.wait.to_dict(),
+                    "service": runtime.service.to_dict(),
+                    "latency": runtime.latency.to_dict()
+                }
+                for runtime in runtimes
+            }
+        }
+
+    async def _work(self, index: int) -> None:
+        runtime = self._runtimes[index]
+        queue = runtime.queue
+        next_queue = self._runtimes[index + 1].queue if index + 1 < len(self._runtimes) else None
+
+        while True:
+            envelope: _Envelope = await queue.get()
+            try:
+                if envelope.future.done():
+                    continue  # Cancelled by whoever submitted it
+                started = time.monotonic()
+                runtime.wait.record(started - envelope.enqueued_at)
+                runtime.busy += 1
+                try:
+                    result = await runtime.stage.handler(envelope.item)
+                except asyncio.CancelledError:
+                    envelope.future.cancel()
+                    raise
+                except Exception as e:
+                    runtime.failed += 1
+                    logger.warning(f"Pipeline stage {runtime.stage.name} failed: {e}")
+                    envelope.future.set_exception(e)
+                    continue
+                finally:
+                    runtime.busy -= 1
+                    finished = time.monotonic()
+                    runtime.service.record(finished - started)
+                    runtime.latency.record(finished - envelope.enqueued_at)
+
+                runtime.processed += 1
+                if result is None or next_queue is None:
+                    self._finish(envelope, result, dropped=result is None and next_queue is not None)
+                    continue
+                envelope.item = result
+                envelope.enqueued_at = time.monotonic()
+                await next_queue.put(envelope)
+            finally:
+                queue.task_done()
+
+    def _finish(self, envelope: _Envelope, result: Any, dropped: bool) -> None:
+        if dropped:
+            self.dropped += 1
+        else:
+            self.completed += 1
+            self.end_to_end.record(time.monotonic() - envelope.submitted_at)
+        if not envelope.future.done():
+            envelope.future.set_result(result)
@@ -0,0 +1,152 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .extraction_engine import ExtractionEngine, ExtractionResult
+from .medication_extraction import extract_medications
+
+# Bump whenever extraction patterns or output structures change so that
+# cached parse results from older versions are not reused
+PARSER_VERSION = "3"
+
+DIAGNOSIS_HEADINGS = ["Diagnosis", "Assessment", "Impression"]
+
+HISTORY_SECTIONS = {
+    "surgeries": "Surgical History",
+    "conditions": "Past Medical History",
+    "allergies": "Allergies",
+    "family_history": "Family History"
+}
+
+# Every diagnosis heading gets its own section key, and every occurrence
+# of them counts; a history section counts only the first time
+DIAGNOSIS_SECTIONS = {f"diagnosis:{heading.lower()}": heading for heading in DIAGNOSIS_HEADINGS}
+
+# One heading scan splits a window into sections, each dispatched to its
+# field. Medications are not section-based; see medication_extraction.
+RECORD_ENGINE = ExtractionEngine({**DIAGNOSIS_SECTIONS, **HISTORY_SECTIONS}, [], repeated=DIAGNOSIS_SECTIONS)
+
+def section_field(key: str) -> str:
+    return "diagnosis" if key in DIAGNOSIS_SECTIONS else key
+
+class RecordAccumulator:
+    """Folds extractor matches into the diagnoses/medications/history structure"""
+
+    def __init__(self):
+        self.diagnoses: List[str] = []
+        self.medications: List[Dict[str, str]] = []
+        self.medical_history: Dict[str, Tuple[int, List[str]]] = {}
+
+    def add(self, offset: int, field: str, value: Any) -> None:
+        if field == "diagnosis":
+            self.diagnoses.extend(value)
+        elif field == "medication":
+            self.medications.append(value)
+        elif field not in self.medical_history or offset < self.medical_history[field][0]:
+            # Only the first occurrence of a history section counts
+            self.medical_history[field] = (offset, value)
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "diagnoses": list(set(self.diagnoses)),
+            "medications": self.medications,
+            "medical_history": {
+                key: self.medical_history[key][1] if key in self.medical_history else []
+                for key in HISTORY_SECTIONS
+            }
+        }
+
+def extract_record(text: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Extract diagnoses, medications and history from a whole document"""
+    extractor = StreamingRecordExtractor(fields=fields)
+    extractor.feed(text)
+    return extractor.finish()
+
+def extract_record_pages(pages: List[str], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Extract a record from a document's page texts, scanning all pages as
+    one window so results match extract_record on the joined text, except
+    that medication lines never run across a page break"""
+    extractor = StreamingRecordExtractor(window_pages=len(pages) + 2, fields=fields)
+    for page in pages:
+        extractor.feed(page)
+    return extractor.finish()
+
+class StreamingRecordExtractor:
+    """Incrementally extracts a medical record from a stream of page texts.
+
+    Pages are buffered up to window_pages. Each full window is split into
+    sections by one heading scan of RECORD_ENGINE, and sections whose
+    heading starts before the trailing overlap pages are committed; the
+    overlap is carried into the next window so sections that begin near a
+    page boundary are still seen whole. Sections line up exactly as in a
+    whole-document scan as long as no single section spans more than the
+    overlap. Memory is bounded by the window rather than the file.
+    Medications are extracted from each page as it arrives.
+    """
+
+    def __init__(
+        self,
+        window_pages: int = 8,
+        overlap_pages: int = 1,
+        fields: Optional[Iterable[str]] = None
+    ):
+        if overlap_pages < 1 or window_pages <= overlap_pages:
+            raise ValueError("window_pages must exceed overlap_pages, which must be at least 1")
+        self.fields = set(fields) if fields is not None else None
+        self.medications = self.fields is None or "medication" in self.fields
+        self.window_pages = window_pages
+        self.overlap_pages = overlap_pages
+        self.pages_seen = 0
+        self._pages: List[str] = []
+        self._window_offset = 0  # Absolute offset of the first buffered page
+        self._previous = ""  # Last character before the window, for line starts
+        self._scanned = ExtractionResult(sections={}, matches={})
+        self._accumulator = RecordAccumulator()
+
+    @property
+    def passes(self) -> float:
+        """Characters handed to the heading scan, in multiples of the text fed"""
+        return self._scanned.passes
+
+    def feed(self, page_text: Optional[str]) -> None:
+        """Add the next page of text"""
+        page_text = page_text or ""
+        if self.medications:
+            # Medications are line-oriented, so each page is handled on arrival
+            for medication in extract_medications(page_text):
+                self._accumulator.add(self._window_offset, "medication", medication)
+        self._pages.append(page_text)
+        self._scanned.text_length += len(page_text)
+        self.pages_seen += 1
+        if len(self._pages) >= self.window_pages:
+            self._scan(final=False)
+
+    def finish(self) -> Dict[str, Any]:
+        """Scan any remaining pages and return the extracted record"""
+        self._scan(final=True)
+        self._pages = []
+        return self._accumulator.result()
+
+    def _scan(self, final: bool) -> None:
+        # The character before the window decides whether its first line
+        # starts a line in the whole document
+        text = self._previous + "".join(self._pages)
+        base = self._window_offset - len(self._previous)
+        if final:
+            boundary = len(text)
+        else:
+            boundary = len(text) - sum(len(page) for page in self._pages[-self.overlap_pages:])
+
+        for section in RECORD_ENGINE.tokenize(text, self._scanned):
+            if section.start < len(self._previous):
+                continue  # Committed with the previous window
+            if section.start >= boundary:
+                break
+            field = section_field(section.key)
+            if self.fields is None or field in self.fields:
+                self._accumulator.add(base + section.start, field, section.lines)
+
+        if not final:
+            dropped = "".join(self._pages[:-self.overlap_pages])
+            if dropped:
+                self._previous = dropped[-1]
+            self._window_offset += len(dropped)
+            self._pages = self._pages[-self.overlap_pages:]
@@ -0,0 +1,87 @@
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+import json
+import logging
+import threading
+
+from .result_cache import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Bump to stop older checkpoints from marking jobs as already done
+BATCH_KEY_VERSION = "1"
+
+def batch_job_key(assessment_data: Dict[str, Any], analysis_results: Dict[str, Any], template_id: str) -> str:
+    """Identify a bulk job by its full inputs, so an edited assessment is
+    regenerated when an interrupted batch resumes"""
+    return content_hash(
+        {'assessment': assessment_data, 'analysis': analysis_results, 'template_id': template_id},
+        "report_batch",
+        BATCH_KEY_VERSION
+    )
+
+@dataclass
+class BatchProgress:
+    """Running counts for a bulk generation batch"""
+    batch_id: str
+    total: int
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0  # Completed by an earlier, interrupted run
+
+    @property
+    def remaining(self) -> int:
+        return self.total - self.completed - self.failed - self.skipped
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), 'remaining': self.remaining}
+
+@dataclass
+class BatchResult:
+    """Reports generated by one bulk run, and the jobs that failed"""
+    batch_id: str
+    progress: BatchProgress
+    reports: List[Any] = field(default_factory=list)
+    failures: List[Dict[str, Any]] = field(default_factory=list)
+
+class BatchCheckpoint:
+    """Append-only JSON lines log of the jobs a batch has completed.
+
+    Each line is flushed as soon as its report is saved, so a crash loses
+    at most the reports that were still in flight. A torn final line from
+    a crash mid-write is ignored on load.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._torn = False
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Completed entries keyed by job key"""
+        entries = {}
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                for line in file:
+                    self._torn = not line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Ignoring unreadable line in batch checkpoint {self.path}")
+                        continue
+                    entries[entry['key']] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, sort_keys=True) + "\n"
+        with self._lock:
+            if self._torn:
+                # Start after the torn line rather than completing it
+                line, self._torn = "\n" + line, False
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line)
+                file.flush()
@@ -0,0 +1,227 @@
+from functools import partial
+from html import escape
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import sys
+
+SectionRenderer = Callable[[Dict[str, Any], Dict[str, Any], Dict[str, Any]], str]
+SectionInputs = Callable[[Dict[str, Any], Dict[str, Any], Dict[str, Any]], Dict[str, Any]]
+
+class SectionRegistry:
+    """Section renderers by section type.
+
+    A renderer takes (section_config, assessment_data, analysis_results)
+    and returns the section's HTML body. Looking a type up once per
+    template section and binding its config replaces per-report dispatch.
+
+    A renderer may be registered with an inputs function, taking the same
+    arguments and returning the slice of the data the renderer reads, by
+    input name. Memoized sections are keyed on that slice, so an edit only
+    regenerates the sections that read the edited keys.
+    """
+
+    def __init__(self):
+        self._renderers: Dict[str, SectionRenderer] = {}
+        self._inputs: Dict[str, SectionInputs] = {}
+
+    def __contains__(self, section_type: str) -> bool:
+        return section_type in self._renderers
+
+    def register(
+        self,
+        section_type: str,
+        inputs: Optional[SectionInputs] = None
+    ) -> Callable[[SectionRenderer], SectionRenderer]:
+        def decorator(renderer: SectionRenderer) -> SectionRenderer:
+            self._renderers[section_type] = renderer
+            if inputs is not None:
+                self._inputs[section_type] = inputs
+            return renderer
+        return decorator
+
+    def inputs(
+        self,
+        section_config: Dict[str, Any],
+        assessment_data: Dict[str, Any],
+        analysis_results: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """The data one section reads; all of it for types without an inputs function.
+
+        A "fields" entry in the section config, e.g. {"assessment": ["mobility"]},
+        narrows an input to the named top-level keys.
+        """
+        data = {'assessment': assessment_data, 'analysis': analysis_results}
+        declared = self._inputs.get(section_config['type'])
+        inputs = declared(section_config, assessment_data, analysis_results) if declared else dict(data)
+        for name, keys in section_config.get('fields', {}).items():
+            if name in inputs:
+                inputs[name] = {key: data[name].get(key) for key in keys}
+        return inputs
+
+    def renderer(self, section_type: str) -> SectionRenderer:
+        try:
+            return self._renderers[section_type]
+        except KeyError:
+            raise ValueError(f"Unknown section type: {section_type}") from None
+
+    def bind(self, section_config: Dict[str, Any]) -> Callable[[Dict[str, Any], Dict[str, Any]], str]:
+        """Renderer for one template section, taking (assessment_data, analysis_results)"""
+        return partial(self.renderer(section_config['type']), section_config)
+
+SECTION_RENDERERS = SectionRegistry()
+
+def _label(key: str) -> str:
+    return key.replace('_', ' ').capitalize()
+
+def render_value(value: Any) -> str:
+    """HTML for a JSON-like value: mappings as definition lists, sequences as lists"""
+    if isinstance(value, dict):
+        items = "".join(
+            f"<dt>{escape(_label(str(key)))}</dt><dd>{render_value(item)}</dd>"
+            for key, item in value.items()
+        )
+        return f"<dl>{items}</dl>"
+    if isinstance(value, (list, tuple)):
+        return "<ul>" + "".join(f"<li>{render_value(item)}</li>" for item in value) + "</ul>"
+    if value is None:
+        return ""
+    return escape(str(value))
+
+def _fields(data: Dict[str, Any], exclude: tuple) -> Dict[str, Any]:
+    return {key: value for key, value in data.items() if key not in exclude and value not in (None, "", [], {})}
+
+def _pick(data: Dict[str, Any], keys: tuple) -> Dict[str, Any]:
+    return {key: data.get(key) for key in keys}
+
+SUMMARY_ASSESSMENT_KEYS = ('client_name', 'assessment_date')
+SUMMARY_ANALYSIS_KEYS = ('risk_level', 'risk_score', 'priority_level', 'priority_areas')
+
+def summary_inputs(section_config: Dict[str, Any], assessment_data: Dict[str, Any], analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'assessment': _pick(assessment_data, SUMMARY_ASSESSMENT_KEYS),
+        'analysis': _pick(analysis_results, SUMMARY_ANALYSIS_KEYS)
+    }
+
+@SECTION_RENDERERS.register('summary', summary_inputs)
+def render_summary(section_config: Dict[str, Any], assessment_data: Dict[str, Any], analysis_results: Dict[str, Any]) -> str:
+    facts = {
+        'client': assessment_data.get('client_name'),
+        'assessment_date': assessment_data.get('assessment_date'),
+        **_pick(analysis_results, SUMMARY_ANALYSIS_KEYS)
+    }
+    return render_value(_fields(facts, ()))
+
+def assessment_inputs(section_config: Dict[str, Any], assessment_data: Dict[str, Any], analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+    subsections = section_config.get('subsections')
+    if not subsections:
+        return {'assessment': _fields(assessment_data, ('id',))}
+    return {'assessment': _pick(assessment_data, tuple(subsections))}
+
+@SECTION_RENDERERS.register('assessment', assessment_inputs)
+def render_assessment(section_config: Dict[str, Any], assessment_data: Dict[str, Any], analysis_results: Dict[str, Any]) -> str:
+    subsections = section_config.get('subsections')
+    if not subsections:
+        return render_value(_fields(assessment_data, ('id',)))
+    parts = []
+    for name in subsections:
+        if assessment_data.get(name) not in (None, "", [], {}):
+            parts.append(f"<h3>{escape(_label(name))}</h3>{render_value(assessment_data[name])}")
+    return "".join(parts)
+
+def analysis_inputs(section_config: Dict[str, Any], assessment_data: Dict[str, Any], analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+    return {'analysis': _fields(analysis_results, ('id', 'recommendations'))}
+
+@SECTION_RENDERERS.register('analysis', analysis_inputs)
+def render_analysis(section_config: Dict[str, Any], assessment_data: Dict[str, Any], analysis_results: Dict[str, Any]) -> str:
+    return render_value(_fields(analysis_results, ('id', 'recommendations')))
+
+def recommendations_inputs(section_config: Dict[str, Any], assessment_data: Dict[str, Any], analysis_results: Dict[str, Any]) -> Dict[str, Any]:
+    return {'analysis': _pick(analysis_results, ('recommendations',))}
+
+@SECTION_RENDERERS.register('recommendations', recommendations_inputs)
+def render_recommendations(section_config: Dict[str, Any], assessment_data: Dict[str, Any], analysis_results: Dict[str, Any]) -> str:
+    items = []
+    for recommendation in analysis_results.get('recommendations', []):
+        if isinstance(recommendation, dict):
+            text = recommendation.get('description') or recommendation.get('recommendation') or ""
+            priority = recommendation.get('priority')
+            suffix = f" <em>({escape(str(priority))} priority)</em>" if priority else ""
+            items.append(f"<li>{escape(str(text))}{suffix}</li>")
+        else:
+            items.append(f"<li>{escape(str(recommendation))}</li>")
+    return "<ol>" + "".join(items) + "</ol>" if items else ""
+
+def _intern(html: str) -> str:
+    # Identical boilerplate across templates shares one string
+    return sys.intern(html)
+
+def _render_table(table: Dict[str, Any]) -> str:
+    header = "".join(f"<th>{escape(str(column))}</th>" for column in table.get('columns', []))
+    rows = "".join(
+        "<tr>" + "".join(f"<td>{escape(str(cell))}</td>" for cell in row) + "</tr>"
+        for row in table.get('rows', [])
+    )
+    caption = f"<caption>{escape(table['caption'])}</caption>" if table.get('caption') else ""
+    return f"<table>{caption}<thead><tr>{header}</tr></thead><tbody>{rows}</tbody></table>"
+
+class FragmentLibrary:
+    """Static HTML for one template, built once when the template loads.
+
+    Holds the document head and tail, each section's opening (heading and
+    "boilerplate" text) and closing (static "tables" from the template
+    metadata, referenced by name from the section), and the section
+    renderers bound to their configs. Per report, only the section bodies
+    are generated. A report template lays out the document from these
+    fragments (head, iter_sections(sections), tail); iter_html is the plain
+    layout for reports without one.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        sections: List[Dict[str, Any]],
+        metadata: Optional[Dict[str, Any]] = None,
+        registry: SectionRegistry = SECTION_RENDERERS
+    ):
+        metadata = metadata or {}
+        tables = {name: _intern(_render_table(table)) for name, table in metadata.get('tables', {}).items()}
+
+        self.head = _intern(
+            '<!DOCTYPE html><html><head><meta charset="utf-8">'
+            f"<title>{escape(title)}</title></head><body><h1>{escape(title)}</h1>"
+        )
+        footer = f"<footer>{escape(metadata['footer'])}</footer>" if metadata.get('footer') else ""
+        self.tail = _intern(f"{footer}</body></html>")
+        self.openings: Dict[str, str] = {}
+        self.closings: Dict[str, str] = {}
+        self.renderers: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], str]] = {}
+
+        for section in sections:
+            section_id = section['id']
+            title_html = escape(section.get('title') or _label(section_id))
+            boilerplate = f"<p>{escape(section['boilerplate'])}</p>" if section.get('boilerplate') else ""
+            self.openings[section_id] = _intern(
+                f'<section id="{escape(section_id)}" class="{escape(section["type"])}">'
+                f"<h2>{title_html}</h2>{boilerplate}"
+            )
+            static = "".join(tables[name] for name in section.get('tables', []) if name in tables)
+            self.closings[section_id] = _intern(f"{static}</section>")
+            if section['type'] in registry:
+                self.renderers[section_id] = registry.bind(section)
+
+    @classmethod
+    def for_sections(cls, title: str, section_ids: List[str]) -> "FragmentLibrary":
+        """Plain library for reports generated without a loaded template"""
+        return cls(title, [{'id': section_id, 'type': 'content'} for section_id in section_ids])
+
+    def iter_sections(self, sections: Dict[str, str]) -> Iterator[str]:
+        """Yield the sections piece by piece, in template order"""
+        for section_id, opening in self.openings.items():
+            yield opening
+            yield sections.get(section_id) or ""
+            yield self.closings[section_id]
+
+    def iter_html(self, sections: Dict[str, str]) -> Iterator[str]:
+        """Yield the whole report document piece by piece"""
+        yield self.head
+        yield from self.iter_sections(sections)
+        yield self.tail
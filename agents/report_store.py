@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable, Iterable, Union
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+WRITE_CHUNK_BYTES = 1024 * 1024
+
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+Chunks = Union[bytes, Iterable[bytes], AsyncIterable[bytes]]
+
+@dataclass(frozen=True)
+class StoredBlob:
+    """A blob in the report store"""
+    sha256: str
+    size: int
+    path: Path
+    created: bool  # False when identical content was already stored
+
+class ReportStore:
+    """Content-addressed storage for generated report artifacts.
+
+    Blobs are stored on local disk at root/<first two hex digits>/<sha256>,
+    so identical PDFs from different report versions share one file. Writes
+    go to a temporary file in the same directory, hashed as they stream,
+    then atomically renamed into place; a reader never sees a partial blob.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path(self, sha256: str) -> Path:
+        if not _DIGEST.match(sha256):
+            raise ValueError(f"Invalid blob digest: {sha256!r}")
+        return self.root / sha256[:2] / sha256
+
+    def exists(self, sha256: str) -> bool:
+        return self.path(sha256).exists()
+
+    async def put(self, content: Chunks) -> StoredBlob:
+        """Store bytes or a (sync or async) stream of chunks.
+
+        In-memory bytes are written in slices of a memoryview and streams
+        chunk by chunk, so content is never copied into a second buffer.
+        """
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return await asyncio.to_thread(self._write, _slices(content))
+        if hasattr(content, "__aiter__"):
+            return await self._write_async(content)
+        return await asyncio.to_thread(self._write, content)
+
+    def _write(self, chunks: Iterable[bytes]) -> StoredBlob:
+        with _PendingBlob(self.root) as pending:
+            for chunk in chunks:
+                pending.write(chunk)
+            return pending.commit(self)
+
+    async def _write_async(self, chunks: AsyncIterable[bytes]) -> StoredBlob:
+        with _PendingBlob(self.root) as pending:
+            async for chunk in chunks:
+                await asyncio.to_thread(pending.write, chunk)
+            return await asyncio.to_thread(pending.commit, self)
+
+def _slices(content: Union[bytes, bytearray, memoryview]) -> Iterable[memoryview]:
+    view = memoryview(content)
+    for start in range(0, len(view), WRITE_CHUNK_BYTES):
+        yield view[start:start + WRITE_CHUNK_BYTES]
+
+class _PendingBlob:
+    """Temporary file being hashed while it is written"""
+
+    def __init__(self, root: Path):
+        root.mkdir(parents=True, exist_ok=True)
+        self.file = tempfile.NamedTemporaryFile(dir=root, prefix=".upload-", delete=False)
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.committed = False
+
+    def __enter__(self) -> "_PendingBlob":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if not self.file.closed:
+            self.file.close()
+        if not self.committed:
+            os.unlink(self.file.name)
+
+    def write(self, chunk: bytes) -> None:
+        self.digest.update(chunk)
+        self.file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self, store: ReportStore) -> StoredBlob:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+        sha256 = self.digest.hexdigest()
+        path = store.path(sha256)
+        if path.exists():
+            # Already stored by an earlier version; the temporary file is dropped
+            return StoredBlob(sha256, self.size, path, created=False)
+
+        path.parent.mkdir(exist_ok=True)
+        os.replace(self.file.name, path)
+        self.committed = True
+        logger.debug(f"Stored report blob {sha256} ({self.size} bytes)")
+        return StoredBlob(sha256, self.size, path, created=True)
@@ -0,0 +1,206 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Optional
+from uuid import UUID
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+def _canonical_default(value: Any) -> Any:
+    """JSON fallback for types found in assessment payloads"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (UUID, Decimal, Path)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    raise TypeError(f"Cannot canonicalize {type(value).__name__}")
+
+def content_hash(payload: Any, namespace: str, version: str) -> str:
+    """Stable SHA-256 of a canonicalized payload plus the agent and rules version"""
+    canonical = json.dumps(
+        {"namespace": namespace, "version": version, "payload": payload},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=_canonical_default
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters per cache tier"""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+class ResultCache:
+    """Content-addressed result cache with an in-memory LRU tier and an
+    optional on-disk tier.
+
+    When max_disk_bytes is set, the least recently used disk entries (by
+    file mtime, refreshed on every disk hit) are evicted to stay in budget.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        disk_dir: Optional[Path] = None,
+        max_disk_bytes: Optional[int] = None
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._disk_bytes = 0
+
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(path.stat().st_size for path in self._disk_files())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries or (
+            self.disk_dir is not None and self._disk_path(key).exists()
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached value, or None on a miss"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.stats.memory_hits += 1
+            return copy.deepcopy(self._entries[key])
+
+        value = self._read_disk(key)
+        if value is not None:
+            self.stats.disk_hits += 1
+            self._remember(key, value)
+            return copy.deepcopy(value)
+
+        self.stats.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in every configured tier"""
+        value = copy.deepcopy(value)
+        self._remember(key, value)
+        self._write_disk(key, value)
+
+    def invalidate(self, key: str) -> None:
+        """Remove a key from every tier"""
+        self._entries.pop(key, None)
+        if self.disk_dir:
+            self._unlink(self._disk_path(key))
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (the disk tier is left in place)"""
+        self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Cache metrics for the dashboard"""
+        return {
+            "entries": len(self._entries),
+            "memory_hits": self.stats.memory_hits,
+            "disk_hits": self.stats.disk_hits,
+            "misses": self.stats.misses,
+            "evictions": self.stats.evictions,
+            "disk_bytes": self._disk_bytes,
+            "hit_rate": round(self.stats.hit_rate, 3)
+        }
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.pickle"
+
+    def _read_disk(self, key: str) -> Optional[Any]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {str(e)}")
+            self._unlink(path)
+            return None
+
+        if self.max_disk_bytes is not None:
+            os.utime(path)  # Mark as recently used for eviction
+        return value
+
+    def _write_disk(self, key: str, value: Any) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        path.parent.mkdir(exist_ok=True)
+        # Write then rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            replaced = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry {key}: {str(e)}")
+            Path(tmp_path).unlink(missing_ok=True)
+            return
+
+        self._disk_bytes += path.stat().st_size - replaced
+        if self.max_disk_bytes is not None and self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk(keep=path)
+
+    def _disk_files(self):
+        return self.disk_dir.glob("*/*.pickle")
+
+    def _unlink(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        self._disk_bytes -= size
+
+    def _evict_disk(self, keep: Path) -> None:
+        """Remove least recently used disk entries until back under budget"""
+        entries = sorted(
+            (entry.stat().st_mtime, entry) for entry in self._disk_files() if entry != keep
+        )
+        for _, entry in entries:
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            self._unlink(entry)
+            self.stats.evictions += 1
@@ -0,0 +1,129 @@
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+IN_PROGRESS = "in_progress"
+DOCUMENTING = "documenting"
+ANALYZING = "analyzing"
+REPORTING = "reporting"
+REPORT_READY = "report_ready"
+FAILED = "failed"
+
+TERMINAL_STATUSES = frozenset({REPORT_READY, FAILED})
+
+class SessionStatus:
+    """Everything a status poll returns for one session"""
+
+    __slots__ = (
+        "session_id", "status", "client_id", "therapist_id", "assessment_type",
+        "next_step", "analysis", "report", "error", "updated_at", "version"
+    )
+
+    def __init__(self, session_id: UUID, client_id: Optional[UUID] = None,
+                 therapist_id: Optional[UUID] = None, assessment_type: Optional[str] = None):
+        self.session_id = session_id
+        self.status = IN_PROGRESS
+        self.client_id = client_id
+        self.therapist_id = therapist_id
+        self.assessment_type = assessment_type
+        self.next_step: Any = None
+        self.analysis: Any = None
+        self.report: Any = None
+        self.error: Optional[str] = None
+        self.updated_at = time.time()
+        self.version = 0
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "status": self.status,
+            "client_id": self.client_id,
+            "therapist_id": self.therapist_id,
+            "assessment_type": self.assessment_type,
+            "assessment": self.next_step,
+            "analysis": self.analysis,
+            "report": self.report,
+            "error": self.error,
+            "updated_at": self.updated_at,
+            "version": self.version
+        }
+
+class SessionStatusProjection:
+    """Read model of session status, kept current by the coordinator.
+
+    The coordinator's message handlers and pipeline stages write to it as
+    sessions move along; status polls only read it, so a poll is a dict
+    lookup instead of a round of calls to every agent. version increases
+    with every change, letting pollers skip unchanged sessions.
+    """
+
+    # Assessment events and the status they move a session to
+    EVENT_STATUS = {
+        "assessment_started": IN_PROGRESS,
+        "step_completed": IN_PROGRESS,
+        "assessment_completed": DOCUMENTING
+    }
+
+    def __init__(self):
+        self._sessions: Dict[UUID, SessionStatus] = {}
+
+    def __contains__(self, session_id: UUID) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def open(self, session_id: UUID, client_id: Optional[UUID] = None,
+             therapist_id: Optional[UUID] = None, assessment_type: Optional[str] = None,
+             next_step: Any = None) -> SessionStatus:
+        session = SessionStatus(session_id, client_id, therapist_id, assessment_type)
+        session.next_step = next_step
+        self._sessions[session_id] = session
+        return session
+
+    def update(self, session_id: UUID, **changes: Any) -> Optional[SessionStatus]:
+        """Apply field changes to a session; unknown sessions are ignored"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            logger.debug(f"Status update for unknown session {session_id}")
+            return None
+        for name, value in changes.items():
+            setattr(session, name, value)
+        session.updated_at = time.time()
+        session.version += 1
+        return session
+
+    def apply(self, message: Any) -> Optional[SessionStatus]:
+        """Project an assessment event (started, step completed, completed)"""
+        status = self.EVENT_STATUS.get(message["type"])
+        if status is None:
+            return None
+        changes: Dict[str, Any] = {"status": status}
+        if status == DOCUMENTING:
+            changes["next_step"] = None
+        elif message.get("next_step") is not None:
+            changes["next_step"] = message.get("next_step")
+        return self.update(message["session_id"], **changes)
+
+    def record(self, session_id: UUID) -> Optional[SessionStatus]:
+        return self._sessions.get(session_id)
+
+    def get(self, session_id: UUID) -> Dict[str, Any]:
+        session = self.record(session_id)
+        if session is None:
+            raise ValueError("Invalid session ID")
+        return session.to_dict()
+
+    def get_many(self, session_ids: Iterable[UUID]) -> Dict[UUID, Optional[Dict[str, Any]]]:
+        """Status of many sessions in one call; unknown sessions map to None"""
+        return {
+            session_id: session.to_dict() if (session := self.record(session_id)) else None
+            for session_id in session_ids
+        }
@@ -0,0 +1,245 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+import logging
+import sys
+import time
+
+from .session_status import SessionStatus, SessionStatusProjection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_TERMINAL = 10000
+DEFAULT_TERMINAL_TTL = 3600.0
+# Live sessions without progress for this long are treated as abandoned
+DEFAULT_IDLE_TTL = 86400.0
+# Spilled statuses are purged from the database after this long
+DEFAULT_SPILL_RETENTION = 30 * 86400.0
+
+class DatabaseSessionSpill:
+    """Spills evicted session statuses to the session_statuses table through
+    an AsyncDatabaseService"""
+
+    def __init__(self, database):
+        self.database = database
+
+    async def save(self, records: List[Dict[str, Any]]) -> None:
+        await self.database.save_session_statuses(records)
+
+    async def load(self, session_ids: List[UUID]) -> Dict[UUID, Dict[str, Any]]:
+        return await self.database.get_session_statuses(session_ids)
+
+    async def purge(self, updated_before: datetime) -> int:
+        return await self.database.purge_session_statuses(updated_before)
+
+def _jsonable(value: Any) -> Any:
+    """Plain JSON form of a status field (agent results may be pydantic models)"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, UUID):
+        return str(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return str(value)
+
+class SessionStore(SessionStatusProjection):
+    """Session status projection with bounded memory.
+
+    Live sessions stay in memory while they make progress; one with no
+    status change for idle_ttl seconds (the client went away, a step was
+    never finished) is treated as abandoned and evicted. Once a session
+    reaches a terminal status (report ready or failed) it is kept in LRU
+    order and evicted when it has not been touched for terminal_ttl
+    seconds, or when more than max_terminal terminal sessions are held.
+    Eviction happens as part of writes and sweep(), so it costs O(1) per
+    evicted session and needs no timer. Later events for an evicted live
+    session are ignored; its last status stays available from the spill.
+
+    With a spill backend, evicted sessions are queued for it and written by
+    flush(); lookups that miss memory fall back to the queue and then the
+    backend, so clients that are still polling a finished session keep
+    getting its status. Spilled statuses come back in plain JSON form.
+    purge_spilled() deletes spilled statuses older than spill_retention
+    seconds, so the backend stays bounded too.
+    """
+
+    def __init__(
+        self,
+        max_terminal: int = DEFAULT_MAX_TERMINAL,
+        terminal_ttl: float = DEFAULT_TERMINAL_TTL,
+        spill: Optional[DatabaseSessionSpill] = None,
+        clock: Callable[[], float] = time.monotonic,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        spill_retention: float = DEFAULT_SPILL_RETENTION
+    ):
+        super().__init__()
+        self.max_terminal = max_terminal
+        self.terminal_ttl = terminal_ttl
+        self.idle_ttl = idle_ttl
+        self.spill = spill
+        self.spill_retention = spill_retention
+        self.clock = clock
+        self._live: "OrderedDict[UUID, float]" = OrderedDict()  # Last changed, oldest first
+        self._terminal: "OrderedDict[UUID, float]" = OrderedDict()  # Last touched, oldest first
+        self._pending: Dict[UUID, Dict[str, Any]] = {}  # Evicted, not yet spilled
+        self.evicted = 0
+        self.abandoned = 0
+        self.purged = 0
+        self.spilled = 0
+        self.spill_dropped = 0
+        self.spill_hits = 0
+        self.spill_misses = 0
+
+    def open(self, session_id: UUID, **kwargs: Any) -> SessionStatus:
+        self._terminal.pop(session_id, None)
+        self._pending.pop(session_id, None)
+        session = super().open(session_id, **kwargs)
+        self._mark_live(session_id)
+        self.sweep()
+        return session
+
+    def update(self, session_id: UUID, **changes: Any) -> Optional[SessionStatus]:
+        session = super().update(session_id, **changes)
+        if session is not None:
+            if session.terminal:
+                self._live.pop(session_id, None)
+                self._touch(session_id)
+            else:
+                self._terminal.pop(session_id, None)
+                self._mark_live(session_id)
+            self.sweep()
+        return session
+
+    def record(self, session_id: UUID) -> Optional[SessionStatus]:
+        session = self._sessions.get(session_id)
+        if session is not None and session_id in self._terminal:
+            self._touch(session_id)
+        return session
+
+    def sweep(self) -> int:
+        """Evict abandoned live sessions and expired and surplus terminal
+        sessions; returns how many"""
+        evicted = 0
+        now = self.clock()
+        idle_before = now - self.idle_ttl
+        while self._live:
+            session_id, changed = next(iter(self._live.items()))
+            if changed >= idle_before:
+                break
+            del self._live[session_id]
+            self._evict(session_id)
+            self.abandoned += 1
+            evicted += 1
+        expires_before = now - self.terminal_ttl
+        while self._terminal:
+            session_id, touched = next(iter(self._terminal.items()))
+            if len(self._terminal) <= self.max_terminal and touched >= expires_before:
+                break
+            del self._terminal[session_id]
+            self._evict(session_id)
+            evicted += 1
+        self.evicted += evicted
+        return evicted
+
+    async def purge_spilled(self) -> int:
+        """Delete spilled statuses last updated more than spill_retention
+        seconds ago; returns how many"""
+        if self.spill is None:
+            return 0
+        updated_before = datetime.utcfromtimestamp(time.time() - self.spill_retention)
+        try:
+            purged = await self.spill.purge(updated_before)
+        except Exception as e:
+            logger.warning(f"Purging spilled session statuses failed: {e}")
+            return 0
+        self.purged += purged
+        return purged
+
+    async def flush(self) -> int:
+        """Write evicted sessions to the spill backend; returns how many"""
+        if self.spill is None or not self._pending:
+            return 0
+        batch = dict(self._pending)
+        try:
+            await self.spill.save(list(batch.values()))
+        except Exception as e:
+            logger.warning(f"Spilling {len(batch)} session statuses failed: {e}")
+            return 0
+        for session_id, record in batch.items():
+            if self._pending.get(session_id) is record:
+                del self._pending[session_id]
+        self.spilled += len(batch)
+        return len(batch)
+
+    async def lookup(self, session_id: UUID) -> Dict[str, Any]:
+        """Status of a session in memory or spilled"""
+        status = (await self.lookup_many([session_id]))[session_id]
+        if status is None:
+            raise ValueError("Invalid session ID")
+        return status
+
+    async def lookup_many(self, session_ids: Iterable[UUID]) -> Dict[UUID, Optional[Dict[str, Any]]]:
+        """Batch lookup; sessions missing from memory are loaded in one query"""
+        statuses = self.get_many(session_ids)
+        missing = [session_id for session_id, status in statuses.items() if status is None]
+        for session_id in missing:
+            statuses[session_id] = self._pending.get(session_id)
+        missing = [session_id for session_id in missing if statuses[session_id] is None]
+        if missing and self.spill is not None:
+            loaded = await self.spill.load(missing)
+            self.spill_hits += len(loaded)
+            self.spill_misses += len(missing) - len(loaded)
+            statuses.update(loaded)
+        return statuses
+
+    def get_metrics(self) -> Dict[str, Any]:
+        live = len(self._sessions) - len(self._terminal)
+        # Shallow estimate: containers plus one slotted record per session;
+        # agent results referenced by records are not included
+        approx_bytes = (
+            sys.getsizeof(self._sessions) + sys.getsizeof(self._live) + sys.getsizeof(self._terminal)
+            + sys.getsizeof(self._pending)
+            + len(self._sessions) * sys.getsizeof(SessionStatus(None))
+            + sum(sys.getsizeof(record) for record in self._pending.values())
+        )
+        return {
+            "sessions": len(self._sessions),
+            "live": live,
+            "terminal": len(self._terminal),
+            "pending_spill": len(self._pending),
+            "approx_bytes": approx_bytes,
+            "evicted": self.evicted,
+            "abandoned": self.abandoned,
+            "purged": self.purged,
+            "spilled": self.spilled,
+            "spill_dropped": self.spill_dropped,
+            "spill_hits": self.spill_hits,
+            "spill_misses": self.spill_misses
+        }
+
+    def _mark_live(self, session_id: UUID) -> None:
+        self._live[session_id] = self.clock()
+        self._live.move_to_end(session_id)
+
+    def _evict(self, session_id: UUID) -> None:
+        session = self._sessions.pop(session_id)
+        if self.spill is not None:
+            self._queue_spill(session)
+
+    def _touch(self, session_id: UUID) -> None:
+        self._terminal[session_id] = self.clock()
+        self._terminal.move_to_end(session_id)
+
+    def _queue_spill(self, session: SessionStatus) -> None:
+        # Bounded too, in case the backend is down for a long time
+        if len(self._pending) >= self.max_terminal:
+            del self._pending[next(iter(self._pending))]
+            self.spill_dropped += 1
+        self._pending[session.session_id] = {
+            key: _jsonable(value) for key, value in session.to_dict().items()
+        }
@@ -1,13 +1,19 @@
-from typing import List, Optional, Dict
+from collections import deque
+from typing import Deque, List, Optional, Dict
 from uuid import UUID, uuid4
 from datetime import datetime
 
 from api.models.therapist import Therapist, TherapistCreate, TherapistUpdate
 
+# Recent assessment ids kept per therapist; older ones only count toward totals
+RECENT_ASSESSMENTS = 100
+
 class TherapistManager:
-    def __init__(self):
+    def __init__(self, recent_assessments: int = RECENT_ASSESSMENTS):
         self.therapists = {}
-        self.assessment_history = {}  # therapist_id -> List[assessment_ids]
+        self.recent_assessments = recent_assessments
+        self.assessment_history: Dict[UUID, Deque[UUID]] = {}  # therapist_id -> recent assessment ids
+        self.assessment_totals: Dict[UUID, int] = {}
 
     async def create_therapist(self, therapist_data: TherapistCreate) -> Therapist:
         """Create a new therapist"""
@@ -22,7 +28,8 @@ class TherapistManager:
         )
         
         self.therapists[therapist_id] = therapist
-        self.assessment_history[therapist_id] = []
+        self.assessment_history[therapist_id] = deque(maxlen=self.recent_assessments)
+        self.assessment_totals[therapist_id] = 0
         return therapist
 
     async def get_therapist(self, therapist_id: UUID) -> Optional[Therapist]:
@@ -82,10 +89,9 @@ class TherapistManager:
             raise ValueError("Therapist not found")
             
         therapist = self.therapists[therapist_id]
-        assessments = self.assessment_history.get(therapist_id, [])
         
         return {
-            "total_assessments": len(assessments),
+            "total_assessments": self.assessment_totals.get(therapist_id, 0),
             "assessment_count": therapist.assessment_count,
             "rating": therapist.rating,
             "specializations": [s.name for s in therapist.specializations],
@@ -98,5 +104,13 @@ class TherapistManager:
             raise ValueError("Therapist not found")
             
         self.assessment_history[therapist_id].append(assessment_id)
+        self.assessment_totals[therapist_id] += 1
         therapist = self.therapists[therapist_id]
-        therapist.assessment_count += 1
\ No newline at end of file
+        therapist.assessment_count += 1
+
+    def get_memory_metrics(self) -> Dict[str, int]:
+        """Sizes of the in-memory therapist records and assessment history"""
+        return {
+            "therapists": len(self.therapists),
+            "history_entries": sum(len(history) for history in self.assessment_history.values())
+        }
\ No newline at end of file
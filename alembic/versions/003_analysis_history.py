@@ -0,0 +1,50 @@
+"""Add analysis history
+
+Revision ID: 003
+Revises: 002
+Create Date: 2025-01-06
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'analysis_history',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('client_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('therapist_id', postgresql.UUID(as_uuid=True)),
+        sa.Column('assessment_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('recorded_at', sa.DateTime(), nullable=False),
+        sa.Column('risk_score', sa.Float(), nullable=False),
+        sa.Column('independent', sa.Float()),
+        sa.Column('unable', sa.Float()),
+        sa.Column('total_activities', sa.Float()),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id']),
+        sa.ForeignKeyConstraint(['therapist_id'], ['therapists.id']),
+        sa.ForeignKeyConstraint(['assessment_id'], ['assessments.id']),
+        # One point per assessment; re-analyses upsert it
+        sa.UniqueConstraint('assessment_id', name='uq_analysis_history_assessment'),
+    )
+
+    # Create indexes
+    op.create_index(
+        'idx_analysis_history_client_recorded',
+        'analysis_history',
+        ['client_id', 'recorded_at']
+    )
+    op.create_index(
+        'idx_analysis_history_therapist',
+        'analysis_history',
+        ['therapist_id']
+    )
+
+def downgrade():
+    op.drop_table('analysis_history')
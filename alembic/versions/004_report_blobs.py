@@ -0,0 +1,37 @@
+"""Add content-addressed report blobs to assessment documents
+
+Revision ID: 004
+Revises: 003
+Create Date: 2025-01-08
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('assessment_documents', sa.Column('content_sha256', sa.String(64)))
+    op.add_column('assessment_documents', sa.Column('size_bytes', sa.BigInteger()))
+
+    # Create indexes
+    op.create_index(
+        'idx_assessment_documents_assessment_type',
+        'assessment_documents',
+        ['assessment_id', 'document_type']
+    )
+    op.create_index(
+        'idx_assessment_documents_sha256',
+        'assessment_documents',
+        ['content_sha256']
+    )
+
+def downgrade():
+    op.drop_index('idx_assessment_documents_sha256', 'assessment_documents')
+    op.drop_index('idx_assessment_documents_assessment_type', 'assessment_documents')
+    op.drop_column('assessment_documents', 'size_bytes')
+    op.drop_column('assessment_documents', 'content_sha256')
@@ -0,0 +1,35 @@
+"""Add spilled coordinator session statuses
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-01-09
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'session_statuses',
+        sa.Column('session_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+    )
+
+    # Create indexes
+    op.create_index(
+        'idx_session_statuses_updated',
+        'session_statuses',
+        ['updated_at']
+    )
+
+def downgrade():
+    op.drop_table('session_statuses')
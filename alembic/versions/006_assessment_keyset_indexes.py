@@ -0,0 +1,34 @@
+"""Add keyset pagination indexes for assessment listings
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-01-10
+
+"""
+from alembic import op
+
+# revision identifiers
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index('idx_assessments_intake', 'assessments', ['intake_date', 'id'])
+
+    # Each replaces a single-column index it has as a prefix
+    op.create_index('idx_assessments_status_intake', 'assessments', ['status', 'intake_date', 'id'])
+    op.create_index('idx_assessments_client_intake', 'assessments', ['client_id', 'intake_date', 'id'])
+    op.create_index('idx_assessments_therapist_intake', 'assessments', ['therapist_id', 'intake_date', 'id'])
+    op.drop_index('idx_assessments_status', 'assessments')
+    op.drop_index('idx_assessments_client', 'assessments')
+    op.drop_index('idx_assessments_therapist', 'assessments')
+
+def downgrade():
+    op.create_index('idx_assessments_status', 'assessments', ['status'])
+    op.create_index('idx_assessments_client', 'assessments', ['client_id'])
+    op.create_index('idx_assessments_therapist', 'assessments', ['therapist_id'])
+    op.drop_index('idx_assessments_therapist_intake', 'assessments')
+    op.drop_index('idx_assessments_client_intake', 'assessments')
+    op.drop_index('idx_assessments_status_intake', 'assessments')
+    op.drop_index('idx_assessments_intake', 'assessments')
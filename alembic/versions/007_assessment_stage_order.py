@@ -0,0 +1,36 @@
+"""Order assessment stages by creation time
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-01-12
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('assessment_stages', sa.Column('created_at', sa.DateTime()))
+    # Best available order for existing stages
+    op.execute(
+        "UPDATE assessment_stages SET created_at = COALESCE(started_at, completed_at, now())"
+    )
+    op.alter_column('assessment_stages', 'created_at', nullable=False)
+
+    # Serves both the latest stage lookup and ordered stage loads
+    op.create_index(
+        'idx_assessment_stages_assessment_created',
+        'assessment_stages',
+        ['assessment_id', 'created_at', 'id']
+    )
+    op.drop_index('idx_assessment_stages_assessment', 'assessment_stages')
+
+def downgrade():
+    op.create_index('idx_assessment_stages_assessment', 'assessment_stages', ['assessment_id'])
+    op.drop_index('idx_assessment_stages_assessment_created', 'assessment_stages')
+    op.drop_column('assessment_stages', 'created_at')
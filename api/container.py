@@ -0,0 +1,80 @@
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Optional
+import logging
+
+from fastapi import FastAPI, Request
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from coordinator.queue_manager import QueueManager
+from database.async_service import AsyncDatabaseService
+from database.engine import dispose_engine, get_engine
+
+logger = logging.getLogger(__name__)
+
+class AppContainer:
+    """Application-scoped services, created once at startup.
+
+    Route dependencies hand out these instances instead of building a
+    DatabaseService (and with it an engine and connection pool) or a
+    QueueManager per request. dispose() stops them and closes the pool at
+    shutdown.
+    """
+
+    def __init__(self, engine: AsyncEngine, database: AsyncDatabaseService,
+                 queue_manager: QueueManager, coordinator: Any, shared_engine: bool = False):
+        self.engine = engine
+        self.shared_engine = shared_engine  # The process-wide engine from get_engine()
+        self.database = database
+        self.queue_manager = queue_manager
+        self.coordinator = coordinator
+
+    @classmethod
+    async def create(cls, engine: Optional[AsyncEngine] = None,
+                     coordinator_factory: Optional[Callable[[], Any]] = None,
+                     start_queue: bool = True) -> "AppContainer":
+        """Build and start the services; engine defaults to the shared one"""
+        if coordinator_factory is None:
+            from coordinator.coordinator import Coordinator
+            coordinator_factory = Coordinator
+        shared_engine = engine is None
+        engine = get_engine() if shared_engine else engine
+        database = AsyncDatabaseService(engine)
+        queue_manager = QueueManager(database)
+        coordinator = coordinator_factory()
+
+        await coordinator.initialize()
+        if start_queue:
+            await queue_manager.start()
+        logger.info("Application services started")
+        return cls(engine, database, queue_manager, coordinator, shared_engine)
+
+    async def dispose(self) -> None:
+        """Stop the services and close pooled connections"""
+        await self.queue_manager.stop()
+        await self.coordinator.shutdown()
+        if self.shared_engine:
+            await dispose_engine()
+        else:
+            await self.engine.dispose()
+        logger.info("Application services stopped")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """FastAPI lifespan: one AppContainer for the life of the app"""
+    container = await AppContainer.create()
+    app.state.container = container
+    try:
+        yield
+    finally:
+        await container.dispose()
+
+def get_container(request: Request) -> AppContainer:
+    """Dependency returning the application's services"""
+    return request.app.state.container
+
+def create_app() -> FastAPI:
+    """App serving api.router with application-scoped services"""
+    from .router import router
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(router)
+    return app
@@ -2,13 +2,15 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 
+from api.container import AppContainer, get_container
 from coordinator.coordinator import Coordinator
 from coordinator.queue_manager import QueueManager
-from database.service import DatabaseService
+from database.async_service import AsyncDatabaseService
 from database.models import AssessmentStatus
+from database.queries import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, AssessmentFilters
 
 router = APIRouter()
 
@@ -42,34 +44,31 @@ class QueueStatus(BaseModel):
     completed: int
     error: int
 
-# Dependencies
+# Dependencies (services are application-scoped, see api.container)
 
-async def get_db():
+def get_db(container: AppContainer = Depends(get_container)) -> AsyncDatabaseService:
     """Database dependency"""
-    from database.config import DatabaseConfig
-    config = DatabaseConfig()
-    return DatabaseService(config.url)
+    return container.database
 
-async def get_coordinator():
+def get_coordinator(container: AppContainer = Depends(get_container)) -> Coordinator:
     """Coordinator dependency"""
-    # In practice, this would be a singleton managed by your application
-    return Coordinator()
+    return container.coordinator
 
-async def get_queue_manager(db: DatabaseService = Depends(get_db)):
+def get_queue_manager(container: AppContainer = Depends(get_container)) -> QueueManager:
     """Queue manager dependency"""
-    return QueueManager(db)
+    return container.queue_manager
 
 # Routes
 
 @router.post("/assessments", response_model=AssessmentResponse)
 async def create_assessment(
     assessment: AssessmentCreate,
-    db: DatabaseService = Depends(get_db),
+    db: AsyncDatabaseService = Depends(get_db),
     queue: QueueManager = Depends(get_queue_manager)
 ):
     """Create a new assessment"""
     # Create assessment record
-    db_assessment = db.create_assessment(
+    db_assessment = await db.create_assessment(
         client_id=assessment.client_id,
         therapist_id=assessment.therapist_id,
         assessment_type=assessment.assessment_type,
@@ -84,53 +83,68 @@ async def create_assessment(
 @router.get("/assessments/{assessment_id}", response_model=AssessmentResponse)
 async def get_assessment(
     assessment_id: UUID,
-    db: DatabaseService = Depends(get_db)
+    db: AsyncDatabaseService = Depends(get_db)
 ):
     """Get assessment details"""
-    assessment = db.get_assessment(assessment_id)
+    assessment = await db.get_assessment(assessment_id)
     if not assessment:
         raise HTTPException(status_code=404, detail="Assessment not found")
     return assessment
 
 @router.get("/assessments", response_model=List[AssessmentResponse])
 async def list_assessments(
+    response: Response,
     status: Optional[str] = None,
     client_id: Optional[UUID] = None,
     therapist_id: Optional[UUID] = None,
-    db: DatabaseService = Depends(get_db)
+    intake_from: Optional[datetime] = None,
+    intake_to: Optional[datetime] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncDatabaseService = Depends(get_db)
 ):
-    """List assessments with optional filters"""
-    if status:
-        try:
-            status_enum = AssessmentStatus(status)
-            assessments = db.get_assessments_by_status(status_enum)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid status")
-    elif client_id:
-        assessments = db.get_client_assessments(client_id)
-    elif therapist_id:
-        assessments = db.get_therapist_assessments(therapist_id)
-    else:
-        # Get all assessments from the past month by default
-        assessments = []  # TODO: Implement with date filter
+    """List assessments newest first, filtered by any combination of status,
+    client, therapist and intake date range.
     
-    return assessments
+    Returns one page; when there are more, the X-Next-Cursor header holds
+    the cursor for the next page.
+    """
+    try:
+        status_enum = AssessmentStatus(status) if status else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid status")
+    
+    filters = AssessmentFilters(
+        status=status_enum,
+        client_id=client_id,
+        therapist_id=therapist_id,
+        intake_from=intake_from,
+        intake_to=intake_to
+    )
+    try:
+        page = await db.list_assessments(filters, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 @router.get("/queue/status", response_model=QueueStatus)
 async def get_queue_status(
     queue: QueueManager = Depends(get_queue_manager)
 ):
     """Get current queue status"""
-    return queue.get_queue_status()
+    return await queue.get_queue_status()
 
 @router.post("/assessments/{assessment_id}/cancel")
 async def cancel_assessment(
     assessment_id: UUID,
-    db: DatabaseService = Depends(get_db),
+    db: AsyncDatabaseService = Depends(get_db),
     coordinator: Coordinator = Depends(get_coordinator)
 ):
     """Cancel an in-progress assessment"""
-    assessment = db.get_assessment(assessment_id)
+    assessment = await db.get_assessment(assessment_id)
     if not assessment:
         raise HTTPException(status_code=404, detail="Assessment not found")
     
@@ -1,11 +1,17 @@
 import asyncio
+import os
 import uuid
 from coordinator import AgentCoordinator
+from database.async_service import AsyncDatabaseService
+from database.engine import get_engine
 from agents.assessment_agent import AssessmentType
 
 class DelilahCLI:
     def __init__(self):
-        self.coordinator = AgentCoordinator()
+        # With DATABASE_URL set, finished sessions and analysis history are
+        # persisted; otherwise they only live in memory
+        database = AsyncDatabaseService(get_engine()) if os.getenv("DATABASE_URL") else None
+        self.coordinator = AgentCoordinator(database=database)
     
     async def run(self):
         print('Welcome to Delilah Agentic OT Assessment System')
@@ -27,7 +33,9 @@ class DelilahCLI:
         coordinator_task = asyncio.create_task(self.coordinator.run())
         
         try:
-            # Process assessment steps
+            # Process assessment steps; status reads come from the coordinator's
+            # projection and don't call the agents
+            answered = set()
             while True:
                 status = await self.coordinator.get_session_status(session_id)
                 
@@ -36,7 +44,13 @@ class DelilahCLI:
                     self._display_report(status['report'])
                     break
                 
-                if step := status['assessment']:
+                if status['status'] == 'failed':
+                    print(f"\nAssessment failed: {status['error']}")
+                    break
+                
+                # The step stays current until the coordinator sees our response
+                if (step := status['assessment']) and step.id not in answered:
+                    answered.add(step.id)
                     response = await self._get_step_input(step)
                     await self.coordinator.assessment_agent.submit_response(
                         session_id=session_id,
@@ -1,69 +1,147 @@
 import asyncio
-from typing import Dict
+import time
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from agents.assessment_agent import AssessmentAgent
 from agents.documentation_agent import DocumentationAgent
+from agents.agent_pool import AgentPool
 from agents.analysis_agent import AnalysisAgent
+from agents.analysis_history import AnalysisHistoryStore, DatabaseAnalysisHistory
+from agents.assessment_pipeline import DEFAULT_STAGE_QUEUE_SIZE, AssessmentPipeline
 from agents.report_agent import ReportAgent
 from agents.client_manager import ClientManager
 from agents.therapist_manager import TherapistManager
 from agents.user_manager import UserManager
+from agents.message_bus import MessageBus
+from agents.result_cache import ResultCache
+from agents.session_store import (
+    DEFAULT_MAX_TERMINAL, DEFAULT_TERMINAL_TTL, DatabaseSessionSpill, SessionStore
+)
+
+# Most analysis agents run at once; the pool grows with queued analyses
+DEFAULT_ANALYSIS_POOL_SIZE = 4
+
+# How often finished and abandoned sessions are swept from memory and
+# spilled, and how often expired spilled statuses are purged
+SESSION_MAINTENANCE_INTERVAL = 30.0
+SPILL_PURGE_INTERVAL = 3600.0
 
 class AgentCoordinator:
-    def __init__(self):
+    """Runs the agents and the documentation, analysis and report pipeline.
+    
+    Persistence is opt-in: given a database (an AsyncDatabaseService, on
+    the shared engine from database.engine.get_engine()), finished
+    sessions evicted from memory are spilled to it and analysis history is
+    saved to and loaded from it. Without one, evicted sessions are gone and
+    history lasts only for the process.
+    """
+    
+    def __init__(self, stage_workers: Optional[Dict[str, int]] = None,
+                 stage_queue_size: int = DEFAULT_STAGE_QUEUE_SIZE,
+                 database=None,
+                 max_finished_sessions: int = DEFAULT_MAX_TERMINAL,
+                 finished_session_ttl: float = DEFAULT_TERMINAL_TTL,
+                 analysis_pool_size: int = DEFAULT_ANALYSIS_POOL_SIZE):
         self.assessment_agent = AssessmentAgent()
         self.documentation_agent = DocumentationAgent()
-        self.analysis_agent = AnalysisAgent()
+        # Pooled analysis agents share one client history and result cache
+        self.analysis_history = AnalysisHistoryStore()
+        self.analysis_cache = ResultCache()
+        self.analysis_history_db = DatabaseAnalysisHistory(database) if database is not None else None
+        self.analysis_pool = AgentPool(self._create_analysis_agent, max_size=analysis_pool_size)
         self.report_agent = ReportAgent()
         self.client_manager = ClientManager()
         self.therapist_manager = TherapistManager()
         self.user_manager = UserManager()
-        self.active_sessions: Dict[UUID, dict] = {}
+        # Status read model, written by the handlers below; polls only read it.
+        # Finished sessions are evicted (and spilled, given a database)
+        self.sessions = SessionStore(
+            max_terminal=max_finished_sessions,
+            terminal_ttl=finished_session_ttl,
+            spill=DatabaseSessionSpill(database) if database is not None else None
+        )
+        
+        # One bus for all agents; assessment events feed the projection and,
+        # once an assessment completes, the stage pipeline
+        self.message_bus = MessageBus()
+        for agent in (self.assessment_agent, self.documentation_agent, self.report_agent):
+            agent.attach_bus(self.message_bus)
+        self.assessment_messages = self.message_bus.subscribe(
+            ['assessment_started', 'step_completed', 'assessment_completed'], name="coordinator-assessment"
+        )
+        
+        self.pipeline = AssessmentPipeline(
+            self.sessions,
+            self.assessment_agent,
+            self.documentation_agent,
+            self.analysis_pool,
+            self.report_agent,
+            stage_workers=stage_workers,
+            stage_queue_size=stage_queue_size
+        )
     
     async def run(self):
         """Start message handling for all agents"""
-        await asyncio.gather(
-            self._handle_assessment_messages(),
-            self._handle_documentation_messages(),
-            self._handle_analysis_messages(),
-            self._handle_report_messages()
+        self.analysis_pool.start()
+        self.pipeline.start()
+        maintenance = asyncio.ensure_future(self._maintain_sessions())
+        try:
+            await self._handle_assessment_messages()
+        finally:
+            maintenance.cancel()
+            await self.pipeline.shutdown()
+            await self.analysis_pool.shutdown()
+            await self.sessions.flush()
+    
+    def _create_analysis_agent(self) -> AnalysisAgent:
+        agent = AnalysisAgent(
+            history=self.analysis_history,
+            result_cache=self.analysis_cache,
+            history_db=self.analysis_history_db
         )
+        agent.attach_bus(self.message_bus)
+        return agent
     
-    async def _handle_assessment_messages(self):
-        """Process messages from Assessment Agent"""
+    async def _maintain_sessions(self):
+        """Expire finished and abandoned sessions even when no new writes
+        arrive, and purge expired spilled statuses"""
+        purged_at = time.monotonic()
         while True:
-            message = await self.assessment_agent.message_queue.get()
-            if message['type'] in ['assessment_started', 'step_completed', 'assessment_completed']:
-                await self.documentation_agent.process_message(message)
-                
-                if message['type'] == 'assessment_completed':
-                    await self.therapist_manager.record_assessment(
-                        therapist_id=message['therapist_id'],
-                        assessment_id=message['session_id']
-                    )
+            await asyncio.sleep(SESSION_MAINTENANCE_INTERVAL)
+            self.sessions.sweep()
+            await self.sessions.flush()
+            if time.monotonic() - purged_at >= SPILL_PURGE_INTERVAL:
+                purged_at = time.monotonic()
+                await self.sessions.purge_spilled()
     
-    async def _handle_documentation_messages(self):
-        """Process messages from Documentation Agent"""
-        while True:
-            message = await self.documentation_agent.message_queue.get()
-            if message['type'] == 'documentation_complete':
-                await self.analysis_agent.process_documentation(message)
+    async def _handle_assessment_messages(self):
+        """Feed Assessment Agent messages into the pipeline"""
+        async for message in self.assessment_messages:
+            await self.pipeline.handle(message)
+            
+            if message['type'] == 'assessment_completed':
+                await self.therapist_manager.record_assessment(
+                    therapist_id=message['therapist_id'],
+                    assessment_id=message['session_id']
+                )
     
-    async def _handle_analysis_messages(self):
-        """Process messages from Analysis Agent"""
-        while True:
-            message = await self.analysis_agent.message_queue.get()
-            if message['type'] == 'analysis_complete':
-                await self.report_agent.process_analysis(message)
+    def get_pipeline_metrics(self) -> Dict[str, Any]:
+        """Per-stage queue depths, throughput and latency histograms"""
+        return self.pipeline.get_metrics()
     
-    async def _handle_report_messages(self):
-        """Process messages from Report Agent"""
-        while True:
-            message = await self.report_agent.message_queue.get()
-            if message['type'] == 'report_generated':
-                session_id = message['session_id']
-                self.active_sessions[session_id]['status'] = 'report_ready'
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Size, queue depth and scaling of the analysis agent pool"""
+        return self.analysis_pool.get_metrics()
+    
+    def get_memory_metrics(self) -> Dict[str, Any]:
+        """Sizes of the coordinator's in-memory state"""
+        return {
+            'sessions': self.sessions.get_metrics(),
+            'analysis_history': self.analysis_history.get_metrics(),
+            'therapists': self.therapist_manager.get_memory_metrics(),
+            'clients': self.client_manager.get_memory_metrics()
+        }
     
     async def start_assessment(self, client_id: UUID, therapist_id: UUID, assessment_type: str) -> UUID:
         """Initialize a new assessment session"""
@@ -85,26 +163,20 @@ class AgentCoordinator:
             assessment_type=assessment_type
         )
         
-        self.active_sessions[session_id] = {
-            'status': 'in_progress',
-            'client_id': client_id,
-            'therapist_id': therapist_id,
-            'assessment_type': assessment_type
-        }
+        self.sessions.open(
+            session_id,
+            client_id=client_id,
+            therapist_id=therapist_id,
+            assessment_type=assessment_type,
+            next_step=await self.assessment_agent.get_next_step(session_id)
+        )
         
         return session_id
     
     async def get_session_status(self, session_id: UUID) -> Dict:
         """Get current status of assessment session"""
-        if session_id not in self.active_sessions:
-            raise ValueError('Invalid session ID')
-            
-        status = self.active_sessions[session_id]['status']
-        result = {
-            'status': status,
-            'assessment': await self.assessment_agent.get_next_step(session_id),
-            'analysis': await self.analysis_agent.get_analysis(session_id),
-            'report': await self.report_agent.get_report(session_id)
-        }
-        
-        return result
\ No newline at end of file
+        return await self.sessions.lookup(session_id)
+    
+    async def get_session_statuses(self, session_ids: List[UUID]) -> Dict[UUID, Optional[Dict]]:
+        """Get the status of many sessions at once; unknown sessions map to None"""
+        return await self.sessions.lookup_many(session_ids)
@@ -6,6 +6,7 @@ import logging
 import traceback
 
 from database.models import Assessment, AssessmentStatus
+from database.queries import WITH_LATEST_STAGE
 from database.service import DatabaseService
 
 logger = logging.getLogger(__name__)
@@ -107,21 +108,21 @@ class ErrorHandler:
                                      assessment_id: UUID,
                                      error: Exception) -> bool:
         """Recover from data validation errors"""
-        assessment = self.db.get_assessment(assessment_id)
+        assessment = self.db.get_assessment(assessment_id, WITH_LATEST_STAGE)
         if not assessment:
             return False
         
         # Check if error is due to missing required fields
         if "required field" in str(error).lower():
             # Attempt to fill with default values or mark for manual review
-            current_stage = assessment.current_stage
-            if current_stage:
-                stage_data = assessment.stages[-1].output_data or {}
+            latest_stage = assessment.latest_stage
+            if assessment.current_stage and latest_stage:
+                stage_data = latest_stage.output_data or {}
                 fixed_data = self._apply_data_fixes(stage_data, str(error))
                 if fixed_data:
                     # Update stage data with fixes
                     self.db.update_stage_status(
-                        assessment.stages[-1].id,
+                        latest_stage.id,
                         "in_progress",
                         output_data=fixed_data
                     )
@@ -133,16 +134,16 @@ class ErrorHandler:
                                 assessment_id: UUID,
                                 error: Exception) -> bool:
         """Recover from processing errors"""
-        assessment = self.db.get_assessment(assessment_id)
+        assessment = self.db.get_assessment(assessment_id, WITH_LATEST_STAGE)
         if not assessment:
             return False
         
         if "timeout" in str(error).lower():
             # For timeout errors, retry with increased timeout
-            current_stage = assessment.current_stage
-            if current_stage:
+            latest_stage = assessment.latest_stage
+            if assessment.current_stage and latest_stage:
                 self.db.update_stage_status(
-                    assessment.stages[-1].id,
+                    latest_stage.id,
                     "pending"  # Reset to pending for retry
                 )
                 return True
@@ -153,16 +154,16 @@ class ErrorHandler:
                                    assessment_id: UUID,
                                    error: Exception) -> bool:
         """Recover from agent failures"""
-        assessment = self.db.get_assessment(assessment_id)
+        assessment = self.db.get_assessment(assessment_id, WITH_LATEST_STAGE)
         if not assessment:
             return False
         
         # For agent failures, attempt to restart the agent or use backup
-        current_stage = assessment.current_stage
-        if current_stage:
+        latest_stage = assessment.latest_stage
+        if assessment.current_stage and latest_stage:
             # Reset stage for retry
             self.db.update_stage_status(
-                assessment.stages[-1].id,
+                latest_stage.id,
                 "pending"
             )
             return True
@@ -5,14 +5,15 @@ import asyncio
 import logging
 
 from database.models import AssessmentStatus
-from database.service import DatabaseService
+from database.async_service import AsyncDatabaseService
+from database.queries import WITH_LATEST_STAGE
 
 logger = logging.getLogger(__name__)
 
 class QueueManager:
     """Manages assessment queue and processing priorities"""
     
-    def __init__(self, db_service: DatabaseService, check_interval: int = 300):
+    def __init__(self, db_service: AsyncDatabaseService, check_interval: int = 300):
         self.db = db_service
         self.check_interval = check_interval  # Default 5 minutes
         self.running = False
@@ -48,46 +49,38 @@ class QueueManager:
     async def _process_queue(self):
         """Process assessment queue"""
         # Get assessments by status
-        intake = self.db.get_assessments_by_status(AssessmentStatus.INTAKE)
-        processing = self.db.get_assessments_by_status(AssessmentStatus.PROCESSING)
-        analysis = self.db.get_assessments_by_status(AssessmentStatus.ANALYSIS)
-        documentation = self.db.get_assessments_by_status(AssessmentStatus.DOCUMENTATION)
+        intake = await self.db.get_assessments_by_status(AssessmentStatus.INTAKE)
+        processing = await self.db.get_assessments_by_status(AssessmentStatus.PROCESSING, WITH_LATEST_STAGE)
+        analysis = await self.db.get_assessments_by_status(AssessmentStatus.ANALYSIS, WITH_LATEST_STAGE)
+        documentation = await self.db.get_assessments_by_status(AssessmentStatus.DOCUMENTATION, WITH_LATEST_STAGE)
         
         # Check for stalled assessments
         await self._check_stalled_assessments(processing + analysis + documentation)
         
         # Get therapist workload
-        therapist_workload = self._get_therapist_workload()
+        therapist_workload = self._get_therapist_workload(processing + analysis + documentation)
         
         # Prioritize and schedule assessments
         prioritized = self._prioritize_assessments(intake, therapist_workload)
         
         # Update assessment statuses based on priority
         for assessment in prioritized:
-            self.db.update_assessment_status(
+            await self.db.update_assessment_status(
                 assessment.id,
                 AssessmentStatus.PROCESSING,
                 "queued_for_processing"
             )
     
-    def _get_therapist_workload(self) -> Dict[UUID, int]:
-        """Calculate current workload per therapist"""
+    def _get_therapist_workload(self, active: List) -> Dict[UUID, int]:
+        """Calculate current workload per therapist from the active assessments"""
         workload = {}
-        active_statuses = [
-            AssessmentStatus.PROCESSING,
-            AssessmentStatus.ANALYSIS,
-            AssessmentStatus.DOCUMENTATION
-        ]
-        
-        for status in active_statuses:
-            assessments = self.db.get_assessments_by_status(status)
-            for assessment in assessments:
-                workload[assessment.therapist_id] = workload.get(assessment.therapist_id, 0) + 1
+        for assessment in active:
+            workload[assessment.therapist_id] = workload.get(assessment.therapist_id, 0) + 1
         
         return workload
     
     async def _check_stalled_assessments(self, assessments: List):
-        """Check for assessments that might be stalled"""
+        """Check for assessments that might be stalled (loaded with their latest stage)"""
         stall_thresholds = {
             AssessmentStatus.PROCESSING: timedelta(hours=48),
             AssessmentStatus.ANALYSIS: timedelta(hours=24),
@@ -96,7 +89,7 @@ class QueueManager:
         
         now = datetime.utcnow()
         for assessment in assessments:
-            last_update = assessment.stages[-1].started_at if assessment.stages else None
+            last_update = assessment.latest_stage.started_at if assessment.latest_stage else None
             if last_update:
                 threshold = stall_thresholds.get(assessment.status)
                 if threshold and (now - last_update) > threshold:
@@ -134,7 +127,7 @@ class QueueManager:
     
     async def add_assessment(self, assessment_id: UUID) -> None:
         """Add a new assessment to the queue"""
-        assessment = self.db.get_assessment(assessment_id)
+        assessment = await self.db.get_assessment(assessment_id)
         if not assessment:
             raise ValueError(f"Assessment not found: {assessment_id}")
         
@@ -144,21 +137,20 @@ class QueueManager:
         logger.info(f"Added assessment {assessment_id} to queue")
         
         # Immediate queue processing if few items in system
-        active_count = sum(
-            len(self.db.get_assessments_by_status(status))
-            for status in [
-                AssessmentStatus.PROCESSING,
-                AssessmentStatus.ANALYSIS,
-                AssessmentStatus.DOCUMENTATION
-            ]
-        )
+        active_count = 0
+        for status in [
+            AssessmentStatus.PROCESSING,
+            AssessmentStatus.ANALYSIS,
+            AssessmentStatus.DOCUMENTATION
+        ]:
+            active_count += len(await self.db.get_assessments_by_status(status))
         
         if active_count < 3:  # If system is relatively idle
             await self._process_queue()
     
-    def get_queue_status(self) -> Dict[str, int]:
+    async def get_queue_status(self) -> Dict[str, int]:
         """Get current queue status"""
         return {
-            status.value: len(self.db.get_assessments_by_status(status))
+            status.value: len(await self.db.get_assessments_by_status(status))
             for status in AssessmentStatus
         }
\ No newline at end of file
@@ -0,0 +1,367 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import case
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.sql import delete, func, select
+
+from .engine import get_engine
+from .queries import (
+    SUMMARY, AssessmentFilters, AssessmentPage, PageCursor,
+    analysis_history_upsert, analysis_history_values, assessment_load_options, caseload_slopes_query,
+    assessment_page, assessment_page_query, page_size, session_statuses_upsert
+)
+from .models import (
+    Base, Assessment, AssessmentStage, AssessmentDocument,
+    Client, Therapist, AssessmentStatus, AnalysisHistory, SessionStatusRecord
+)
+
+IN_PROGRESS_STATUSES = (
+    AssessmentStatus.INTAKE,
+    AssessmentStatus.PROCESSING,
+    AssessmentStatus.ANALYSIS,
+    AssessmentStatus.DOCUMENTATION
+)
+
+class AsyncDatabaseService:
+    """Async service layer for database operations.
+
+    Same operations as DatabaseService, awaited on the shared pooled engine
+    so API routes and the queue manager never block the event loop.
+    Returned rows are detached and not expired. Lazy loads are not possible
+    outside the session, so assessment getters take a loading profile
+    (database.queries.LOAD_PROFILES) naming the relationships to load.
+    """
+
+    def __init__(self, engine: Optional[AsyncEngine] = None):
+        self.engine = engine if engine is not None else get_engine()
+        self.SessionLocal = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def create_tables(self):
+        """Create all database tables"""
+        async with self.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    def get_session(self) -> AsyncSession:
+        """Get a new database session"""
+        return self.SessionLocal()
+
+    # Assessment Operations
+
+    async def create_assessment(self,
+                                client_id: UUID,
+                                therapist_id: UUID,
+                                assessment_type: str,
+                                metadata: Optional[Dict] = None) -> Assessment:
+        """Create a new assessment record with its intake stage"""
+        async with self.get_session() as session, session.begin():
+            assessment = Assessment(
+                id=uuid4(),
+                client_id=client_id,
+                therapist_id=therapist_id,
+                status=AssessmentStatus.INTAKE,
+                assessment_type=assessment_type,
+                intake_date=datetime.utcnow(),
+                metadata=metadata or {}
+            )
+            session.add(assessment)
+            session.add(AssessmentStage(
+                id=uuid4(),
+                assessment_id=assessment.id,
+                stage_type="intake",
+                status="pending"
+            ))
+            return assessment
+
+    async def get_assessment(self, assessment_id: UUID, profile: str = SUMMARY) -> Optional[Assessment]:
+        """Get assessment by ID, loaded per the given profile"""
+        options = assessment_load_options(profile)
+        async with self.get_session() as session:
+            return await session.get(Assessment, assessment_id, options=options)
+
+    async def update_assessment_status(self,
+                                       assessment_id: UUID,
+                                       status: AssessmentStatus,
+                                       stage: Optional[str] = None) -> None:
+        """Update assessment status"""
+        async with self.get_session() as session, session.begin():
+            assessment = await session.get(Assessment, assessment_id)
+            if assessment:
+                assessment.status = status
+                if stage:
+                    assessment.current_stage = stage
+                if status == AssessmentStatus.COMPLETED:
+                    assessment.completion_date = datetime.utcnow()
+
+    async def create_assessment_stage(self,
+                                      assessment_id: UUID,
+                                      stage_type: str) -> AssessmentStage:
+        """Create a new stage for an assessment"""
+        async with self.get_session() as session, session.begin():
+            stage = AssessmentStage(
+                id=uuid4(),
+                assessment_id=assessment_id,
+                stage_type=stage_type,
+                status="pending"
+            )
+            session.add(stage)
+            return stage
+
+    async def update_stage_status(self,
+                                  stage_id: UUID,
+                                  status: str,
+                                  output_data: Optional[Dict] = None,
+                                  error_message: Optional[str] = None) -> None:
+        """Update assessment stage status"""
+        async with self.get_session() as session, session.begin():
+            stage = await session.get(AssessmentStage, stage_id)
+            if stage:
+                stage.status = status
+                if status == "completed":
+                    stage.completed_at = datetime.utcnow()
+                    if output_data:
+                        stage.output_data = output_data
+                elif status == "error" and error_message:
+                    stage.error_message = error_message
+
+    async def add_assessment_document(self,
+                                      assessment_id: UUID,
+                                      document_type: str,
+                                      file_path: str,
+                                      metadata: Optional[Dict] = None) -> AssessmentDocument:
+        """Add a document to an assessment"""
+        async with self.get_session() as session, session.begin():
+            document = AssessmentDocument(
+                id=uuid4(),
+                assessment_id=assessment_id,
+                document_type=document_type,
+                version="1.0",
+                created_at=datetime.utcnow(),
+                file_path=file_path,
+                metadata=metadata or {}
+            )
+            session.add(document)
+            return document
+
+    async def add_report_document(self,
+                                  assessment_id: UUID,
+                                  content_sha256: str,
+                                  size_bytes: int,
+                                  file_path: str,
+                                  metadata: Optional[Dict] = None,
+                                  document_type: str = "report") -> AssessmentDocument:
+        """Record a new version of a stored report blob (see DatabaseService)"""
+        async with self.get_session() as session, session.begin():
+            # Lock the assessment row to serialize version numbering
+            await session.execute(
+                select(Assessment.id).where(Assessment.id == assessment_id).with_for_update()
+            )
+            previous = await session.scalar(
+                select(func.count(AssessmentDocument.id))
+                .where(AssessmentDocument.assessment_id == assessment_id)
+                .where(AssessmentDocument.document_type == document_type)
+            )
+            document = AssessmentDocument(
+                id=uuid4(),
+                assessment_id=assessment_id,
+                document_type=document_type,
+                version=f"{previous + 1}.0",
+                created_at=datetime.utcnow(),
+                file_path=file_path,
+                content_sha256=content_sha256,
+                size_bytes=size_bytes,
+                metadata=metadata or {}
+            )
+            session.add(document)
+            return document
+
+    async def get_documents_by_sha256(self, content_sha256: str) -> List[AssessmentDocument]:
+        """Documents referencing a blob, e.g. before removing it from the store"""
+        async with self.get_session() as session:
+            result = await session.scalars(
+                select(AssessmentDocument).where(AssessmentDocument.content_sha256 == content_sha256)
+            )
+            return list(result)
+
+    # Query Operations
+
+    async def _assessments(self, profile: str, *criteria) -> List[Assessment]:
+        query = select(Assessment).where(*criteria).options(*assessment_load_options(profile))
+        async with self.get_session() as session:
+            return list((await session.scalars(query)).unique())
+
+    async def get_assessments_by_status(self, status: AssessmentStatus,
+                                        profile: str = SUMMARY) -> List[Assessment]:
+        """Get all assessments with a specific status"""
+        return await self._assessments(profile, Assessment.status == status)
+
+    async def get_client_assessments(self, client_id: UUID, profile: str = SUMMARY) -> List[Assessment]:
+        """Get all assessments for a client"""
+        return await self._assessments(profile, Assessment.client_id == client_id)
+
+    async def get_therapist_assessments(self, therapist_id: UUID, profile: str = SUMMARY) -> List[Assessment]:
+        """Get all assessments for a therapist"""
+        return await self._assessments(profile, Assessment.therapist_id == therapist_id)
+
+    async def list_assessments(self,
+                               filters: Optional[AssessmentFilters] = None,
+                               limit: Optional[int] = None,
+                               cursor: Optional[str] = None) -> AssessmentPage:
+        """List assessments newest first, one keyset page at a time (see
+        DatabaseService.list_assessments)"""
+        limit = page_size(limit)
+        after = PageCursor.decode(cursor) if cursor else None
+        query = assessment_page_query(filters or AssessmentFilters(), limit, after)
+        async with self.get_session() as session:
+            return assessment_page((await session.execute(query)).all(), limit)
+
+    async def get_weekly_assessment_stats(self) -> Dict[str, int]:
+        """Get assessment statistics for the current week, in one query"""
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        week_start = today - timedelta(days=today.weekday())  # Monday
+
+        def count_where(condition):
+            return func.count(case((condition, 1)))
+
+        query = select(
+            func.count(Assessment.id),
+            count_where(Assessment.status == AssessmentStatus.COMPLETED),
+            count_where(Assessment.status.in_(IN_PROGRESS_STATUSES)),
+            count_where(Assessment.status == AssessmentStatus.ERROR)
+        ).where(Assessment.intake_date >= week_start)
+
+        async with self.get_session() as session:
+            total, completed, in_progress, error = (await session.execute(query)).one()
+        return {
+            "total": total,
+            "completed": completed,
+            "in_progress": in_progress,
+            "error": error
+        }
+
+    # Analysis History Operations
+
+    async def add_analysis_history(self,
+                                   client_id: UUID,
+                                   assessment_id: UUID,
+                                   recorded_at: datetime,
+                                   risk_score: float,
+                                   functional_status: Dict[str, Any],
+                                   therapist_id: Optional[UUID] = None) -> None:
+        """Record an analysis result in the client's trajectory history,
+        replacing the assessment's earlier point if it has one"""
+        values = analysis_history_values(
+            client_id, assessment_id, recorded_at, risk_score, functional_status, therapist_id
+        )
+        async with self.get_session() as session, session.begin():
+            await session.execute(analysis_history_upsert(values, session.bind.dialect.name))
+
+    async def get_analysis_history(self,
+                                   client_id: Optional[UUID] = None,
+                                   therapist_id: Optional[UUID] = None) -> List[tuple]:
+        """Get history rows for a client or a whole caseload in one query"""
+        query = select(
+            AnalysisHistory.client_id,
+            AnalysisHistory.therapist_id,
+            AnalysisHistory.assessment_id,
+            AnalysisHistory.recorded_at,
+            AnalysisHistory.risk_score,
+            AnalysisHistory.independent,
+            AnalysisHistory.unable,
+            AnalysisHistory.total_activities
+        )
+        if client_id:
+            query = query.where(AnalysisHistory.client_id == client_id)
+        if therapist_id:
+            query = query.where(AnalysisHistory.therapist_id == therapist_id)
+        query = query.order_by(AnalysisHistory.client_id, AnalysisHistory.recorded_at)
+
+        async with self.get_session() as session:
+            return [tuple(row) for row in await session.execute(query)]
+
+    async def get_caseload_slopes(self, therapist_id: UUID) -> List[tuple]:
+        """Per-client history trends for a therapist's caseload in one query"""
+        async with self.get_session() as session:
+            return [tuple(row) for row in await session.execute(caseload_slopes_query(therapist_id))]
+
+    # Session Status Operations
+
+    async def save_session_statuses(self, records: List[Dict[str, Any]]) -> None:
+        """Upsert session statuses spilled from the coordinator's session store,
+        in one statement (see database.queries.session_statuses_upsert)"""
+        if not records:
+            return
+        async with self.get_session() as session, session.begin():
+            await session.execute(session_statuses_upsert(records, session.bind.dialect.name))
+
+    async def get_session_statuses(self, session_ids: List[UUID]) -> Dict[UUID, Dict[str, Any]]:
+        """Spilled statuses for the given sessions, in one query"""
+        query = select(SessionStatusRecord.session_id, SessionStatusRecord.payload).where(
+            SessionStatusRecord.session_id.in_(session_ids)
+        )
+        async with self.get_session() as session:
+            return {session_id: payload for session_id, payload in await session.execute(query)}
+
+    async def purge_session_statuses(self, updated_before: datetime) -> int:
+        """Delete spilled statuses last updated before a cutoff; uses the
+        idx_session_statuses_updated index"""
+        statement = delete(SessionStatusRecord).where(SessionStatusRecord.updated_at < updated_before)
+        async with self.get_session() as session, session.begin():
+            return (await session.execute(statement)).rowcount
+
+    # Client Operations
+
+    async def create_client(self,
+                            external_id: str,
+                            first_name: str,
+                            last_name: str,
+                            date_of_birth: datetime,
+                            contact_info: Dict[str, Any],
+                            medical_record: Optional[Dict[str, Any]] = None) -> Client:
+        """Create a new client record"""
+        async with self.get_session() as session, session.begin():
+            client = Client(
+                id=uuid4(),
+                external_id=external_id,
+                first_name=first_name,
+                last_name=last_name,
+                date_of_birth=date_of_birth,
+                contact_info=contact_info,
+                medical_record=medical_record or {}
+            )
+            session.add(client)
+            return client
+
+    async def get_client(self, client_id: UUID) -> Optional[Client]:
+        """Get client by ID"""
+        async with self.get_session() as session:
+            return await session.get(Client, client_id)
+
+    # Therapist Operations
+
+    async def create_therapist(self,
+                               external_id: str,
+                               first_name: str,
+                               last_name: str,
+                               credentials: Dict[str, Any],
+                               specialties: List[str],
+                               contact_info: Dict[str, Any]) -> Therapist:
+        """Create a new therapist record"""
+        async with self.get_session() as session, session.begin():
+            therapist = Therapist(
+                id=uuid4(),
+                external_id=external_id,
+                first_name=first_name,
+                last_name=last_name,
+                credentials=credentials,
+                specialties=specialties,
+                contact_info=contact_info
+            )
+            session.add(therapist)
+            return therapist
+
+    async def get_therapist(self, therapist_id: UUID) -> Optional[Therapist]:
+        """Get therapist by ID"""
+        async with self.get_session() as session:
+            return await session.get(Therapist, therapist_id)
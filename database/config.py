@@ -1,4 +1,6 @@
-from pydantic import BaseSettings
+from typing import Optional
+
+from pydantic_settings import BaseSettings
 
 class DatabaseConfig(BaseSettings):
     """Database configuration settings"""
@@ -7,11 +9,29 @@ class DatabaseConfig(BaseSettings):
     USER: str = "postgres"
     PASSWORD: str = "postgres"
     DATABASE: str = "delilah_agentic"
-    
+    URL: Optional[str] = None  # Full URL; overrides the parts above
+
+    # Connection pool (see database.engine.create_database_engine)
+    POOL_SIZE: int = 10
+    MAX_OVERFLOW: int = 20
+    POOL_TIMEOUT: float = 30.0
+    POOL_RECYCLE: int = 1800
+    POOL_PRE_PING: bool = True
+    STATEMENT_CACHE_SIZE: int = 512
+    ECHO: bool = False
+
     @property
     def url(self) -> str:
         """Get database URL"""
+        if self.URL:
+            return self.URL
         return f"postgresql://{self.USER}:{self.PASSWORD}@{self.HOST}:{self.PORT}/{self.DATABASE}"
-    
+
+    @property
+    def async_url(self) -> str:
+        """Get database URL for the asyncpg driver"""
+        from .engine import async_url
+        return async_url(self.url).render_as_string(hide_password=False)
+
     class Config:
-        env_prefix = "DB_"  # Prefix for environment variables
\ No newline at end of file
+        env_prefix = "DB_"  # Prefix for environment variables
@@ -1,27 +1,16 @@
 # database/database.py
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
-from dotenv import load_dotenv
-import os
 
-# Load environment variables
-load_dotenv()
+from .engine import get_engine
 
 # SQLAlchemy model base class
 class Base(DeclarativeBase):
     pass
 
-# Construct database URL from environment variables
-DATABASE_URL = f"postgresql+asyncpg://{os.getenv('POSTGRES_USER')}:{os.getenv('POSTGRES_PASSWORD')}@{os.getenv('POSTGRES_SERVER')}:{os.getenv('POSTGRES_PORT')}/{os.getenv('POSTGRES_DB')}"
-
-# Create async engine
-engine = create_async_engine(
-    DATABASE_URL,
-    poolclass=NullPool,
-    echo=True  # Set to False in production
-)
+# Shared, pooled async engine (configured from the environment)
+engine = get_engine()
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
@@ -0,0 +1,107 @@
+"""Shared async engine for all database access.
+
+One tuned asyncpg connection pool per process: db.py, database.py and
+AsyncDatabaseService all use the engine returned by get_engine() instead of
+creating their own.
+"""
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+# Pool defaults; override with DB_POOL_SIZE etc. (see DatabaseConfig)
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 20
+DEFAULT_POOL_TIMEOUT = 30.0
+DEFAULT_POOL_RECYCLE = 1800
+DEFAULT_STATEMENT_CACHE_SIZE = 512
+
+_engine: Optional[AsyncEngine] = None
+
+def async_url(url: str) -> URL:
+    """Use the asyncpg driver for plain postgresql:// URLs"""
+    parsed = make_url(url)
+    if parsed.drivername in ("postgresql", "postgres", "postgresql+psycopg2"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed
+
+def create_database_engine(
+    url: str,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_overflow: int = DEFAULT_MAX_OVERFLOW,
+    pool_timeout: float = DEFAULT_POOL_TIMEOUT,
+    pool_recycle: int = DEFAULT_POOL_RECYCLE,
+    pool_pre_ping: bool = True,
+    statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE,
+    echo: bool = False
+) -> AsyncEngine:
+    """Create an async engine with a sized, health-checked connection pool.
+
+    pool_size connections are kept open; up to max_overflow more are opened
+    under load and closed when returned. Connections are checked before
+    use (pool_pre_ping) and replaced after pool_recycle seconds, so server
+    restarts and idle timeouts don't surface as request errors. With
+    asyncpg, each connection caches up to statement_cache_size prepared
+    statements, so repeated queries skip parsing and planning.
+    """
+    parsed = async_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        # Local tests and benchmarks; SQLite has no server-side pool to tune
+        return create_async_engine(parsed, echo=echo)
+
+    connect_args = {}
+    if parsed.get_driver_name() == "asyncpg":
+        connect_args["statement_cache_size"] = statement_cache_size
+        parsed = parsed.update_query_dict({"prepared_statement_cache_size": str(statement_cache_size)})
+    return create_async_engine(
+        parsed,
+        echo=echo,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        connect_args=connect_args
+    )
+
+def engine_from_config(config) -> AsyncEngine:
+    """Create the engine from a DatabaseConfig"""
+    return create_database_engine(
+        config.async_url,
+        pool_size=config.POOL_SIZE,
+        max_overflow=config.MAX_OVERFLOW,
+        pool_timeout=config.POOL_TIMEOUT,
+        pool_recycle=config.POOL_RECYCLE,
+        pool_pre_ping=config.POOL_PRE_PING,
+        statement_cache_size=config.STATEMENT_CACHE_SIZE,
+        echo=config.ECHO
+    )
+
+def get_engine() -> AsyncEngine:
+    """The process-wide engine, created from the environment on first use"""
+    global _engine
+    if _engine is None:
+        from .config import DatabaseConfig
+        load_dotenv()
+        config = DatabaseConfig()
+        # DATABASE_URL and the POSTGRES_* variables predate DatabaseConfig
+        if os.getenv("DATABASE_URL"):
+            config.URL = os.environ["DATABASE_URL"]
+        elif os.getenv("POSTGRES_SERVER"):
+            config.URL = (
+                f"postgresql+asyncpg://{os.getenv('POSTGRES_USER')}:{os.getenv('POSTGRES_PASSWORD')}"
+                f"@{os.getenv('POSTGRES_SERVER')}:{os.getenv('POSTGRES_PORT', '5432')}/{os.getenv('POSTGRES_DB')}"
+            )
+        _engine = engine_from_config(config)
+    return _engine
+
+async def dispose_engine() -> None:
+    """Close the process-wide engine's pooled connections.
+
+    The engine stays usable (modules hold references to it) and opens new
+    connections if used again.
+    """
+    if _engine is not None:
+        await _engine.dispose()
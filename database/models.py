@@ -4,8 +4,8 @@ from typing import Dict, Optional, List
 from uuid import UUID
 
 from sqlalchemy import (
-    Column, DateTime, Enum as SQLEnum, 
-    ForeignKey, Integer, JSON, String, Table
+    BigInteger, Column, DateTime, Enum as SQLEnum, 
+    Float, ForeignKey, Index, Integer, JSON, String, Table, and_, select
 )
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import relationship, declarative_base
@@ -37,8 +37,19 @@ class Assessment(Base):
     # Relationships
     client = relationship("Client", back_populates="assessments")
     therapist = relationship("Therapist", back_populates="assessments")
-    stages = relationship("AssessmentStage", back_populates="assessment")
+    stages = relationship(
+        "AssessmentStage", back_populates="assessment",
+        order_by="(AssessmentStage.created_at, AssessmentStage.id)"
+    )
     documents = relationship("AssessmentDocument", back_populates="assessment")
+    
+    # Keyset pagination newest first, overall and within each filter
+    __table_args__ = (
+        Index('idx_assessments_intake', 'intake_date', 'id'),
+        Index('idx_assessments_status_intake', 'status', 'intake_date', 'id'),
+        Index('idx_assessments_client_intake', 'client_id', 'intake_date', 'id'),
+        Index('idx_assessments_therapist_intake', 'therapist_id', 'intake_date', 'id'),
+    )
 
 class AssessmentStage(Base):
     """Individual stage in the assessment process"""
@@ -48,6 +59,7 @@ class AssessmentStage(Base):
     assessment_id = Column(PGUUID, ForeignKey('assessments.id'), nullable=False)
     stage_type = Column(String, nullable=False)  # e.g., "intake", "analysis"
     status = Column(String, nullable=False)  # "pending", "in_progress", "completed", "error"
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Orders an assessment's stages
     started_at = Column(DateTime)
     completed_at = Column(DateTime)
     agent_id = Column(PGUUID)  # ID of agent that processed this stage
@@ -55,6 +67,30 @@ class AssessmentStage(Base):
     error_message = Column(String)
     
     assessment = relationship("Assessment", back_populates="stages")
+    
+    __table_args__ = (
+        Index('idx_assessment_stages_assessment_created', 'assessment_id', 'created_at', 'id'),
+    )
+
+# The newest stage of each assessment, for callers that only need the
+# current one. Loaded by the "with_latest_stage" profile (database.queries)
+# in the same statement as the assessment; never lazy loaded.
+_newer_stage = AssessmentStage.__table__.alias("newer_stage")
+Assessment.latest_stage = relationship(
+    AssessmentStage,
+    primaryjoin=and_(
+        AssessmentStage.assessment_id == Assessment.id,
+        AssessmentStage.id == select(_newer_stage.c.id)
+        .where(_newer_stage.c.assessment_id == Assessment.id)
+        .order_by(_newer_stage.c.created_at.desc(), _newer_stage.c.id.desc())
+        .limit(1)
+        .correlate_except(_newer_stage)
+        .scalar_subquery()
+    ),
+    uselist=False,
+    viewonly=True,
+    lazy="raise"
+)
 
 class AssessmentDocument(Base):
     """Documents associated with an assessment"""
@@ -66,9 +102,16 @@ class AssessmentDocument(Base):
     version = Column(String, nullable=False)
     created_at = Column(DateTime, nullable=False)
     file_path = Column(String, nullable=False)
+    content_sha256 = Column(String(64))  # Blob in the report store, if content-addressed
+    size_bytes = Column(BigInteger)
     metadata = Column(JSON)
     
     assessment = relationship("Assessment", back_populates="documents")
+    
+    __table_args__ = (
+        Index('idx_assessment_documents_assessment_type', 'assessment_id', 'document_type'),
+        Index('idx_assessment_documents_sha256', 'content_sha256'),
+    )
 
 class Client(Base):
     """Client information"""
@@ -98,4 +141,37 @@ class Therapist(Base):
     contact_info = Column(JSON)  # Professional contact information
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    assessments = relationship("Assessment", back_populates="therapist")
\ No newline at end of file
+    assessments = relationship("Assessment", back_populates="therapist")
+
+class AnalysisHistory(Base):
+    """Compact per-client history of analysis results for trajectory queries"""
+    __tablename__ = "analysis_history"
+
+    id = Column(PGUUID, primary_key=True)
+    client_id = Column(PGUUID, ForeignKey('clients.id'), nullable=False)
+    therapist_id = Column(PGUUID, ForeignKey('therapists.id'))
+    assessment_id = Column(PGUUID, ForeignKey('assessments.id'), nullable=False, unique=True)  # One point per assessment
+    recorded_at = Column(DateTime, nullable=False)
+    risk_score = Column(Float, nullable=False)
+    independent = Column(Float)
+    unable = Column(Float)
+    total_activities = Column(Float)
+
+    __table_args__ = (
+        Index('idx_analysis_history_client_recorded', 'client_id', 'recorded_at'),
+        Index('idx_analysis_history_therapist', 'therapist_id'),
+    )
+
+
+class SessionStatusRecord(Base):
+    """Coordinator session status evicted from memory, for late lookups"""
+    __tablename__ = "session_statuses"
+
+    session_id = Column(PGUUID, primary_key=True)
+    status = Column(String, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    payload = Column(JSON, nullable=False)  # SessionStatus.to_dict() in JSON form
+
+    __table_args__ = (
+        Index('idx_session_statuses_updated', 'updated_at'),
+    )
@@ -0,0 +1,236 @@
+"""Query builders shared by DatabaseService and AsyncDatabaseService"""
+import base64
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import Insert, Select, case, func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from .models import AnalysisHistory, Assessment, AssessmentStatus, SessionStatusRecord
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Loading profiles for Assessment rows. Services return detached objects,
+# so every relationship a caller touches must be loaded up front; anything
+# a profile leaves out raises on access instead of issuing a query.
+SUMMARY = "summary"  # Columns only
+WITH_LATEST_STAGE = "with_latest_stage"  # Plus latest_stage, joined in the same statement
+FULL = "full"  # Plus client and therapist joined, stages and documents in one query each
+
+LOAD_PROFILES = {
+    SUMMARY: (
+        raiseload("*"),
+    ),
+    WITH_LATEST_STAGE: (
+        joinedload(Assessment.latest_stage),
+        raiseload("*"),
+    ),
+    FULL: (
+        joinedload(Assessment.client),
+        joinedload(Assessment.therapist),
+        selectinload(Assessment.stages),
+        selectinload(Assessment.documents),
+        raiseload("*"),
+    ),
+}
+
+def assessment_load_options(profile: str) -> Tuple[Any, ...]:
+    """Loader options for a profile name; raises ValueError if it is unknown"""
+    try:
+        return LOAD_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown assessment load profile: {profile!r}") from None
+
+# Exactly the fields of api.router.AssessmentResponse
+ASSESSMENT_LIST_COLUMNS = (
+    Assessment.id,
+    Assessment.client_id,
+    Assessment.therapist_id,
+    Assessment.status,
+    Assessment.assessment_type,
+    Assessment.intake_date,
+    Assessment.completion_date,
+    Assessment.current_stage,
+    Assessment.metadata
+)
+
+@dataclass
+class AssessmentFilters:
+    """Assessment listing filters; all given filters must match"""
+    status: Optional[AssessmentStatus] = None
+    client_id: Optional[UUID] = None
+    therapist_id: Optional[UUID] = None
+    intake_from: Optional[datetime] = None  # Inclusive
+    intake_to: Optional[datetime] = None  # Exclusive
+
+    def criteria(self) -> List[Any]:
+        criteria = []
+        if self.status is not None:
+            criteria.append(Assessment.status == self.status)
+        if self.client_id is not None:
+            criteria.append(Assessment.client_id == self.client_id)
+        if self.therapist_id is not None:
+            criteria.append(Assessment.therapist_id == self.therapist_id)
+        if self.intake_from is not None:
+            criteria.append(Assessment.intake_date >= self.intake_from)
+        if self.intake_to is not None:
+            criteria.append(Assessment.intake_date < self.intake_to)
+        return criteria
+
+@dataclass(frozen=True)
+class PageCursor:
+    """Position after the last row of a page, newest first by (intake_date, id)"""
+    intake_date: datetime
+    id: UUID
+
+    def encode(self) -> str:
+        raw = f"{self.intake_date.isoformat()}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        """Parse a cursor from encode(); raises ValueError if it is malformed"""
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            intake_date, id_ = raw.split("|")
+            return cls(datetime.fromisoformat(intake_date), UUID(id_))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid page cursor: {token!r}") from e
+
+@dataclass
+class AssessmentPage:
+    """One page of assessment rows (dicts of ASSESSMENT_LIST_COLUMNS)"""
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+def assessment_page_query(filters: AssessmentFilters, limit: int,
+                          after: Optional[PageCursor] = None) -> Select:
+    """Keyset-paginated listing query.
+
+    Rows come newest first by (intake_date, id). Each page continues from
+    the cursor with a row comparison instead of an OFFSET, so with the
+    (filter column, intake_date, id) indexes every page costs the same
+    however deep into the listing it is. One row beyond the limit is
+    fetched to tell whether there is a next page.
+    """
+    query = select(*ASSESSMENT_LIST_COLUMNS).where(*filters.criteria())
+    if after is not None:
+        query = query.where(tuple_(Assessment.intake_date, Assessment.id) < tuple_(after.intake_date, after.id))
+    return query.order_by(Assessment.intake_date.desc(), Assessment.id.desc()).limit(limit + 1)
+
+def page_size(limit: Optional[int]) -> int:
+    return max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+def assessment_page(rows: Sequence[Any], limit: int) -> AssessmentPage:
+    """Build a page from assessment_page_query rows"""
+    items = [dict(row._mapping) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = PageCursor(last["intake_date"], last["id"]).encode()
+    return AssessmentPage(items, next_cursor)
+
+def caseload_slopes_query(therapist_id: UUID) -> Select:
+    """Least-squares trends for every client of a caseload, in one grouped query.
+
+    A client is in the caseload if the therapist recorded any of its
+    points, and its trend covers all of its points, whoever recorded them
+    (as in agents.analysis_history.AnalysisHistoryStore). Rows are
+    (client_id, points, risk slope per day, independence slope per day) for
+    clients with at least two points; see DatabaseAnalysisHistory. Uses
+    PostgreSQL's regr_slope aggregate.
+    """
+    days = func.extract("epoch", AnalysisHistory.recorded_at) / 86400.0
+    # Metrics carry either activity counts with a total, or ratios directly
+    independence = case(
+        (AnalysisHistory.total_activities > 0, AnalysisHistory.independent / AnalysisHistory.total_activities),
+        else_=func.coalesce(AnalysisHistory.independent, 0.0)
+    )
+    return (
+        select(
+            AnalysisHistory.client_id,
+            func.count(),
+            func.coalesce(func.regr_slope(AnalysisHistory.risk_score, days), 0.0),
+            func.coalesce(func.regr_slope(independence, days), 0.0)
+        )
+        .where(AnalysisHistory.client_id.in_(
+            select(AnalysisHistory.client_id).where(AnalysisHistory.therapist_id == therapist_id)
+        ))
+        .group_by(AnalysisHistory.client_id)
+        .having(func.count() >= 2)
+    )
+
+# Dialects whose INSERT supports ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def analysis_history_values(
+    client_id: UUID,
+    assessment_id: UUID,
+    recorded_at: datetime,
+    risk_score: float,
+    functional_status: Dict[str, Any],
+    therapist_id: Optional[UUID] = None
+) -> Dict[str, Any]:
+    """Column values of a new analysis_history row"""
+    return {
+        "id": uuid4(),
+        "client_id": client_id,
+        "therapist_id": therapist_id,
+        "assessment_id": assessment_id,
+        "recorded_at": recorded_at,
+        "risk_score": risk_score,
+        "independent": functional_status.get("independent"),
+        "unable": functional_status.get("unable"),
+        "total_activities": functional_status.get("total_activities")
+    }
+
+def analysis_history_upsert(values: Dict[str, Any], dialect: str) -> Insert:
+    """INSERT ... ON CONFLICT DO UPDATE of an assessment's history point.
+
+    A re-analysis replaces the point's values and keeps its first
+    recorded_at, so retries neither add points nor move them in time.
+    """
+    insert = UPSERT_INSERTS.get(dialect)
+    if insert is None:
+        raise ValueError(f"Analysis history upsert is not supported on {dialect}")
+    statement = insert(AnalysisHistory).values(**values)
+    return statement.on_conflict_do_update(
+        index_elements=[AnalysisHistory.assessment_id],
+        set_={
+            column: statement.excluded[column]
+            for column in ("therapist_id", "risk_score", "independent", "unable", "total_activities")
+        }
+    )
+
+def session_statuses_upsert(records: Sequence[Dict[str, Any]], dialect: str) -> Insert:
+    """One INSERT ... ON CONFLICT DO UPDATE for a batch of spilled session statuses.
+
+    records are SessionStatus.to_dict() payloads; a session that appears
+    more than once keeps its last record, since a single upsert may not
+    touch a row twice.
+    """
+    insert = UPSERT_INSERTS.get(dialect)
+    if insert is None:
+        raise ValueError(f"Session status upsert is not supported on {dialect}")
+    rows = {}
+    for record in records:
+        session_id = UUID(str(record["session_id"]))
+        rows[session_id] = {
+            "session_id": session_id,
+            "status": record["status"],
+            "updated_at": datetime.utcfromtimestamp(record["updated_at"]),
+            "payload": record
+        }
+    statement = insert(SessionStatusRecord).values(list(rows.values()))
+    return statement.on_conflict_do_update(
+        index_elements=[SessionStatusRecord.session_id],
+        set_={
+            "status": statement.excluded.status,
+            "updated_at": statement.excluded.updated_at,
+            "payload": statement.excluded.payload
+        }
+    )
@@ -1,14 +1,19 @@
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.sql import select
+from sqlalchemy.sql import delete, func, select
 
+from .queries import (
+    SUMMARY, AssessmentFilters, AssessmentPage, PageCursor,
+    analysis_history_upsert, analysis_history_values, assessment_load_options, caseload_slopes_query,
+    assessment_page, assessment_page_query, page_size, session_statuses_upsert
+)
 from .models import (
     Base, Assessment, AssessmentStage, AssessmentDocument,
-    Client, Therapist, AssessmentStatus
+    Client, Therapist, AssessmentStatus, AnalysisHistory, SessionStatusRecord
 )
 
 class DatabaseService:
@@ -59,10 +64,13 @@ class DatabaseService:
             
             return assessment
     
-    def get_assessment(self, assessment_id: UUID) -> Optional[Assessment]:
-        """Get assessment by ID"""
+    def get_assessment(self, assessment_id: UUID, profile: str = SUMMARY) -> Optional[Assessment]:
+        """Get assessment by ID, loaded per the given profile (see
+        database.queries.LOAD_PROFILES); relationships outside the profile
+        raise on access"""
+        options = assessment_load_options(profile)
         with self.get_session() as session:
-            return session.get(Assessment, assessment_id)
+            return session.get(Assessment, assessment_id, options=options)
     
     def update_assessment_status(self,
                                assessment_id: UUID,
@@ -132,22 +140,95 @@ class DatabaseService:
             session.commit()
             return document
     
+    def add_report_document(self,
+                            assessment_id: UUID,
+                            content_sha256: str,
+                            size_bytes: int,
+                            file_path: str,
+                            metadata: Optional[Dict] = None,
+                            document_type: str = "report") -> AssessmentDocument:
+        """Record a new version of a stored report blob.
+        
+        The version number and the row with its metadata are written in one
+        transaction, so concurrent saves for an assessment cannot both claim
+        the same version.
+        """
+        # Not expired on commit, so the returned row stays readable
+        with self.SessionLocal(expire_on_commit=False) as session, session.begin():
+            # Lock the assessment row to serialize version numbering
+            session.execute(
+                select(Assessment.id).where(Assessment.id == assessment_id).with_for_update()
+            )
+            previous = session.scalar(
+                select(func.count(AssessmentDocument.id))
+                .where(AssessmentDocument.assessment_id == assessment_id)
+                .where(AssessmentDocument.document_type == document_type)
+            )
+            document = AssessmentDocument(
+                id=uuid4(),
+                assessment_id=assessment_id,
+                document_type=document_type,
+                version=f"{previous + 1}.0",
+                created_at=datetime.utcnow(),
+                file_path=file_path,
+                content_sha256=content_sha256,
+                size_bytes=size_bytes,
+                metadata=metadata or {}
+            )
+            session.add(document)
+            return document
+    
+    def get_documents_by_sha256(self, content_sha256: str) -> List[AssessmentDocument]:
+        """Documents referencing a blob, e.g. before removing it from the store"""
+        with self.get_session() as session:
+            return session.query(AssessmentDocument).filter_by(content_sha256=content_sha256).all()
+    
     # Query Operations
     
-    def get_assessments_by_status(self, status: AssessmentStatus) -> List[Assessment]:
+    def get_assessments_by_status(self, status: AssessmentStatus, profile: str = SUMMARY) -> List[Assessment]:
         """Get all assessments with a specific status"""
         with self.get_session() as session:
-            return session.query(Assessment).filter_by(status=status).all()
+            return (
+                session.query(Assessment)
+                .filter_by(status=status)
+                .options(*assessment_load_options(profile))
+                .all()
+            )
     
-    def get_client_assessments(self, client_id: UUID) -> List[Assessment]:
+    def get_client_assessments(self, client_id: UUID, profile: str = SUMMARY) -> List[Assessment]:
         """Get all assessments for a client"""
         with self.get_session() as session:
-            return session.query(Assessment).filter_by(client_id=client_id).all()
+            return (
+                session.query(Assessment)
+                .filter_by(client_id=client_id)
+                .options(*assessment_load_options(profile))
+                .all()
+            )
     
-    def get_therapist_assessments(self, therapist_id: UUID) -> List[Assessment]:
+    def get_therapist_assessments(self, therapist_id: UUID, profile: str = SUMMARY) -> List[Assessment]:
         """Get all assessments for a therapist"""
         with self.get_session() as session:
-            return session.query(Assessment).filter_by(therapist_id=therapist_id).all()
+            return (
+                session.query(Assessment)
+                .filter_by(therapist_id=therapist_id)
+                .options(*assessment_load_options(profile))
+                .all()
+            )
+    
+    def list_assessments(self,
+                         filters: Optional[AssessmentFilters] = None,
+                         limit: Optional[int] = None,
+                         cursor: Optional[str] = None) -> AssessmentPage:
+        """List assessments newest first, one keyset page at a time.
+        
+        Only the listing columns are selected; pass the page's next_cursor
+        back to get the following page. Raises ValueError for a bad cursor.
+        """
+        limit = page_size(limit)
+        after = PageCursor.decode(cursor) if cursor else None
+        query = assessment_page_query(filters or AssessmentFilters(), limit, after)
+        with self.get_session() as session:
+            return assessment_page(session.execute(query).all(), limit)
     
     def get_weekly_assessment_stats(self) -> Dict[str, int]:
         """Get assessment statistics for the current week"""
@@ -189,6 +270,85 @@ class DatabaseService:
                 "error": error
             }
     
+    # Analysis History Operations
+    
+    def add_analysis_history(self,
+                             client_id: UUID,
+                             assessment_id: UUID,
+                             recorded_at: datetime,
+                             risk_score: float,
+                             functional_status: Dict[str, Any],
+                             therapist_id: Optional[UUID] = None) -> None:
+        """Record an analysis result in the client's trajectory history,
+        replacing the assessment's earlier point if it has one"""
+        values = analysis_history_values(
+            client_id, assessment_id, recorded_at, risk_score, functional_status, therapist_id
+        )
+        with self.get_session() as session:
+            session.execute(analysis_history_upsert(values, session.get_bind().dialect.name))
+            session.commit()
+    
+    def get_analysis_history(self,
+                             client_id: Optional[UUID] = None,
+                             therapist_id: Optional[UUID] = None) -> List[tuple]:
+        """Get history rows for a client or a whole caseload in one query.
+        
+        Rows are plain column tuples ordered by client and time, suitable for
+        AnalysisHistoryStore.load.
+        """
+        query = select(
+            AnalysisHistory.client_id,
+            AnalysisHistory.therapist_id,
+            AnalysisHistory.assessment_id,
+            AnalysisHistory.recorded_at,
+            AnalysisHistory.risk_score,
+            AnalysisHistory.independent,
+            AnalysisHistory.unable,
+            AnalysisHistory.total_activities
+        )
+        if client_id:
+            query = query.where(AnalysisHistory.client_id == client_id)
+        if therapist_id:
+            query = query.where(AnalysisHistory.therapist_id == therapist_id)
+        query = query.order_by(AnalysisHistory.client_id, AnalysisHistory.recorded_at)
+        
+        with self.get_session() as session:
+            return [tuple(row) for row in session.execute(query)]
+    
+    def get_caseload_slopes(self, therapist_id: UUID) -> List[tuple]:
+        """Per-client history trends for a therapist's caseload in one query
+        (see database.queries.caseload_slopes_query)"""
+        with self.get_session() as session:
+            return [tuple(row) for row in session.execute(caseload_slopes_query(therapist_id))]
+    
+    # Session Status Operations
+    
+    def save_session_statuses(self, records: List[Dict[str, Any]]) -> None:
+        """Upsert session statuses spilled from the coordinator's session store,
+        in one statement (see database.queries.session_statuses_upsert)"""
+        if not records:
+            return
+        with self.get_session() as session:
+            session.execute(session_statuses_upsert(records, session.get_bind().dialect.name))
+            session.commit()
+    
+    def get_session_statuses(self, session_ids: List[UUID]) -> Dict[UUID, Dict[str, Any]]:
+        """Spilled statuses for the given sessions, in one query"""
+        query = select(SessionStatusRecord.session_id, SessionStatusRecord.payload).where(
+            SessionStatusRecord.session_id.in_(session_ids)
+        )
+        with self.get_session() as session:
+            return {session_id: payload for session_id, payload in session.execute(query)}
+    
+    def purge_session_statuses(self, updated_before: datetime) -> int:
+        """Delete spilled statuses last updated before a cutoff; uses the
+        idx_session_statuses_updated index"""
+        statement = delete(SessionStatusRecord).where(SessionStatusRecord.updated_at < updated_before)
+        with self.get_session() as session:
+            purged = session.execute(statement).rowcount
+            session.commit()
+            return purged
+    
     # Client Operations
     
     def create_client(self,
@@ -5,6 +5,8 @@ from api.core.error_handling.base import DelilahError, ErrorHandler
 from api.core.error_handling.errors import InternalServerError
 from api.routes import assessment, documentation, analysis, report
 from coordinator import AgentCoordinator
+from database.async_service import AsyncDatabaseService
+from database.engine import get_engine
 from datetime import datetime
 import logging
 import asyncio
@@ -12,8 +14,9 @@ import asyncio
 # Setup logging
 logger = logging.getLogger(__name__)
 
-# Initialize coordinator
-coordinator = AgentCoordinator()
+# Initialize coordinator; finished sessions and analysis history are
+# persisted to the application database over the shared engine
+coordinator = AgentCoordinator(database=AsyncDatabaseService(get_engine()))
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""Benchmarks for medical record PDF parsing.
+
+Run from the repository root:
+    python scripts/benchmark_pdf_parsing.py streaming [--pages 1000]
+    python scripts/benchmark_pdf_parsing.py notes [--megabytes 4]
+    python scripts/benchmark_pdf_parsing.py records [--pages 1000]
+    python scripts/benchmark_pdf_parsing.py triage [--records 8 --others 24]
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pypdf
+
+from agents.extraction_engine import (
+    ASSESSMENT_NOTES_ENGINE, ASSESSMENT_SECTIONS, CONCERN_RULES, OBSERVATION_RULES, RISK_RULES
+)
+from agents.pdf_ingestion import iter_page_texts
+from agents.pdf_parser_agent import PDFParserAgent, PDFParserAgentConfig
+from agents.record_extraction import (
+    DIAGNOSIS_HEADINGS, HISTORY_SECTIONS, StreamingRecordExtractor, extract_record
+)
+
+SAMPLE_PAGE = (
+    "Progress note, visit {index}\n"
+    "Patient reports ongoing lower back pain with prolonged sitting.\n"
+    "Impression: lumbar strain, improving\n\n"
+    "Plan: continue home exercise program and review in four weeks.\n"
+) * 4
+
+def write_synthetic_pdf(path: Path, page_count: int) -> Path:
+    """Write a text PDF of page_count pages of clinical-looking notes"""
+    return write_pdf(path, [SAMPLE_PAGE.format(index=index) for index in range(page_count)])
+
+def write_pdf(path: Path, page_texts) -> Path:
+    """Write a text PDF with one page per text"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_refs = []
+    for text in page_texts:
+        lines = " ".join(f"({line}) Tj T*" for line in text.split("\n"))
+        stream = f"BT /F1 10 Tf 12 TL 40 750 Td {lines} ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_refs)} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref_offset
+    )
+    path.write_bytes(bytes(output))
+    return path
+
+def measure(label, func):
+    """Run func, printing wall time and peak traced memory"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:8.2f}s   peak {peak / 1024 / 1024:8.1f} MiB")
+    return result
+
+def whole_document(path: Path):
+    """Baseline: concatenate every page, then run the extractors"""
+    with open(path, 'rb') as file:
+        text = ""
+        for page in pypdf.PdfReader(file).pages:
+            text += page.extract_text()
+    return extract_record(text)
+
+def streamed(path: Path, window_pages: int):
+    extractor = StreamingRecordExtractor(window_pages=window_pages)
+    for page_text in iter_page_texts(str(path)):
+        extractor.feed(page_text)
+    return extractor.finish()
+
+def synthetic_pages(page_count: int):
+    for index in range(page_count):
+        yield SAMPLE_PAGE.format(index=index)
+
+def assembled_text_stage(page_count: int):
+    text = ""
+    for page_text in synthetic_pages(page_count):
+        text += page_text
+    return extract_record(text)
+
+def streamed_text_stage(page_count: int, window_pages: int):
+    extractor = StreamingRecordExtractor(window_pages=window_pages)
+    for page_text in synthetic_pages(page_count):
+        extractor.feed(page_text)
+    return extractor.finish()
+
+def benchmark_streaming(args):
+    # Text assembly and extraction alone, isolated from pypdf's own caches
+    print(f"Extraction stage, {args.pages} generated pages\n")
+    baseline = measure("whole document (text +=)", lambda: assembled_text_stage(args.pages))
+    result = measure(
+        f"streaming (window {args.window})",
+        lambda: streamed_text_stage(args.pages, args.window)
+    )
+    assert sorted(result["diagnoses"]) == sorted(baseline["diagnoses"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_pdf(Path(tmp) / "synthetic.pdf", args.pages)
+        print(f"\nEnd to end, {args.pages}-page PDF, {path.stat().st_size / 1024 / 1024:.1f} MiB on disk\n")
+        baseline = measure("whole document (text +=)", lambda: whole_document(path))
+        result = measure(
+            f"streaming (window {args.window})", lambda: streamed(path, args.window)
+        )
+        assert sorted(result["diagnoses"]) == sorted(baseline["diagnoses"])
+
+SAMPLE_NOTES = (
+    "Mobility: ambulates with a four-wheeled walker\n"
+    "Gait is slow and shuffling on uneven ground\n\n"
+    "Activities of Daily Living: independent with grooming and dressing\n\n"
+    "Home Safety: hazard from loose rugs in the hallway\n"
+    "Client lives alone in a two storey house with twelve stairs to the bedroom\n"
+    "Spouse visits daily and assists with meal preparation and laundry\n\n"
+    "Recommendations: install grab bars in the main bathroom\n\n"
+)
+
+def legacy_notes_scan(notes: str) -> int:
+    """The per-call pattern scans PDFParserAgent used before the extraction
+    engine; returns the number of full-text regex passes made"""
+    passes = 0
+    for name in ASSESSMENT_SECTIONS.values():
+        re.search(f"{name}:?[\\s\\n]*(.*?)(?:\\n\\n|\\Z)", notes, re.IGNORECASE | re.MULTILINE)
+        passes += 1
+    for rule in OBSERVATION_RULES + RISK_RULES + CONCERN_RULES:
+        [match.group(1).strip() for match in re.finditer(rule.pattern.pattern, notes)]
+        passes += 1
+    return passes
+
+def benchmark_notes(args):
+    notes = SAMPLE_NOTES * max(1, int(args.megabytes * 1024 * 1024 / len(SAMPLE_NOTES)))
+    megabytes = len(notes) / 1024 / 1024
+    print(f"Assessment notes, {megabytes:.1f} MiB\n")
+
+    start = time.perf_counter()
+    passes = legacy_notes_scan(notes)
+    elapsed = time.perf_counter() - start
+    print(f"{'per-pattern scans':<28} {passes:6.1f} passes   {elapsed / megabytes * 1000:8.1f} ms/MiB")
+
+    start = time.perf_counter()
+    result = ASSESSMENT_NOTES_ENGINE.extract(notes)
+    elapsed = time.perf_counter() - start
+    print(f"{'extraction engine':<28} {result.passes:6.1f} passes   {elapsed / megabytes * 1000:8.1f} ms/MiB")
+
+def legacy_record_scan(text: str) -> int:
+    """The per-pattern scans record extraction used before it went through
+    the heading scanner; returns the number of full-text regex passes made"""
+    passes = 0
+    for heading in DIAGNOSIS_HEADINGS:
+        [match.group(1) for match in re.finditer(
+            f"{heading}:[\\s\\n]*(.*?)(?:\\n\\n|\\Z)", text, re.IGNORECASE | re.MULTILINE
+        )]
+        passes += 1
+    for name in HISTORY_SECTIONS.values():
+        re.search(f"{name}:?[\\s\\n]*(.*?)(?:\\n\\n|\\Z)", text, re.IGNORECASE | re.MULTILINE)
+        passes += 1
+    return passes
+
+def benchmark_records(args):
+    pages = list(synthetic_pages(args.pages))
+    text = "".join(pages)
+    megabytes = len(text) / 1024 / 1024
+    print(f"Record extraction, {args.pages} generated pages, {megabytes:.1f} MiB\n")
+
+    start = time.perf_counter()
+    passes = legacy_record_scan(text)
+    elapsed = time.perf_counter() - start
+    print(f"{'per-pattern scans':<28} {passes:6.1f} passes   {elapsed / megabytes * 1000:8.1f} ms/MiB")
+
+    extractor = StreamingRecordExtractor(window_pages=args.window, fields=["diagnosis", *HISTORY_SECTIONS])
+    start = time.perf_counter()
+    for page in pages:
+        extractor.feed(page)
+    extractor.finish()
+    elapsed = time.perf_counter() - start
+    print(f"{f'heading scan (window {args.window})':<28} {extractor.passes:6.1f} passes   "
+          f"{elapsed / megabytes * 1000:8.1f} ms/MiB")
+
+INVOICE_PAGE = (
+    "Invoice 2024-{index}\n"
+    "Occupational therapy services rendered, itemized below\n"
+    + "Session {index}   1.0 hr   rate 120.00   total 120.00\n" * 30
+    + "Amount due: 3600.00   Payment terms: 30 days\n"
+)
+LETTER_PAGE = (
+    "Dear adjuster,\n"
+    "Further to our telephone conversation, please find our update below.\n" * 12
+    + "Sincerely,\nClinic administration\n"
+)
+
+def write_claim_folder(folder: Path, records: int, others: int, pages: int):
+    """A mixed claim package: medical records, long invoices and short letters"""
+    paths = []
+    for index in range(records):
+        paths.append(write_synthetic_pdf(folder / f"record-{index}.pdf", pages))
+    for index in range(others):
+        if index % 2:
+            paths.append(write_pdf(folder / f"letter-{index}.pdf", [LETTER_PAGE]))
+        else:
+            invoice = [INVOICE_PAGE.format(index=page) for page in range(pages)]
+            paths.append(write_pdf(folder / f"invoice-{index}.pdf", invoice))
+    return paths
+
+def run_parser(paths, triage: bool, workers: int):
+    agent = PDFParserAgent(PDFParserAgentConfig(ingestion_workers=workers, triage=triage))
+    try:
+        deferred = {}
+        start = time.perf_counter()
+        parsed = asyncio.run(agent._parse_medical_records(paths, deferred))
+        return time.perf_counter() - start, parsed, deferred
+    finally:
+        agent.shutdown()
+
+def benchmark_triage(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_claim_folder(Path(tmp), args.records, args.others, args.pages)
+        megabytes = sum(path.stat().st_size for path in paths) / 1024 / 1024
+        print(f"Claim folder: {args.records} records, {args.others} invoices/letters, "
+              f"{megabytes:.1f} MiB, {args.workers} workers\n")
+
+        full_time, full, _ = run_parser(paths, triage=False, workers=args.workers)
+        print(f"{'full parse':<28} {full_time:8.2f}s   {len(paths) / full_time:6.1f} files/s")
+        triage_time, kept, deferred = run_parser(paths, triage=True, workers=args.workers)
+        print(f"{'triage':<28} {triage_time:8.2f}s   {len(paths) / triage_time:6.1f} files/s"
+              f"   ({len(deferred)} deferred, {full_time / triage_time:.1f}x)")
+
+        # Triage may only drop documents that contribute nothing
+        contributing = {
+            entry["source"] for entry in full
+            if entry["diagnoses"] or entry["medications"] or any(entry["medical_history"].values())
+        }
+        assert contributing <= {entry["source"] for entry in kept}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    streaming = commands.add_parser("streaming", help="whole-document vs streaming page extraction")
+    streaming.add_argument("--pages", type=int, default=1000)
+    streaming.add_argument("--window", type=int, default=8)
+    streaming.set_defaults(func=benchmark_streaming)
+
+    notes = commands.add_parser("notes", help="per-pattern scans vs the single-scan extraction engine")
+    notes.add_argument("--megabytes", type=float, default=4)
+    notes.set_defaults(func=benchmark_notes)
+
+    records = commands.add_parser("records", help="per-pattern scans vs the record heading scan")
+    records.add_argument("--pages", type=int, default=1000)
+    records.add_argument("--window", type=int, default=8)
+    records.set_defaults(func=benchmark_records)
+
+    triage = commands.add_parser("triage", help="full parse vs triage on a mixed claim folder")
+    triage.add_argument("--records", type=int, default=8)
+    triage.add_argument("--others", type=int, default=24)
+    triage.add_argument("--pages", type=int, default=30)
+    triage.add_argument("--workers", type=int, default=2)
+    triage.set_defaults(func=benchmark_triage)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Benchmark for the coordinator's stage pipeline.
+
+Runs simulated sessions through documentation -> analysis -> report stages
+whose handlers wait a fixed time (like agents waiting on the database or a
+render worker), once per worker count:
+    python scripts/benchmark_pipeline.py [--sessions 1000] [--workers 1 2 4 8]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.pipeline import Pipeline, Stage
+
+STAGES = ("documentation", "analysis", "report")
+
+def simulated_stage(delay, busy, peak):
+    async def handler(item):
+        busy.add(handler)
+        peak[0] = max(peak[0], len(busy))
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            busy.discard(handler)
+        return item
+    return handler
+
+async def run(sessions, workers, delay, queue_size):
+    # Stages currently running at least one item; peak > 1 means overlap
+    busy, peak = set(), [0]
+    handlers = {name: simulated_stage(delay, busy, peak) for name in STAGES}
+    pipeline = Pipeline([Stage(name, handlers[name], workers, queue_size) for name in STAGES])
+    pipeline.start()
+    try:
+        start = time.perf_counter()
+        futures = [await pipeline.submit(index) for index in range(sessions)]
+        await asyncio.gather(*futures)
+        return time.perf_counter() - start, peak[0], pipeline.get_metrics()
+    finally:
+        await pipeline.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--delay", type=float, default=0.005, help="seconds per stage per session")
+    parser.add_argument("--queue-size", type=int, default=100)
+    args = parser.parse_args()
+
+    serial = args.sessions * args.delay * len(STAGES)
+    print(f"{args.sessions} sessions, {len(STAGES)} stages x {args.delay * 1000:.0f}ms "
+          f"(fully serial: {serial:.1f}s)\n")
+    print(f"{'workers/stage':<14} {'seconds':>8} {'sessions/s':>11} {'speedup':>8} "
+          f"{'busy stages':>12} {'e2e p95 ms':>11}")
+
+    baseline = None
+    for workers in args.workers:
+        elapsed, peak, metrics = asyncio.run(run(args.sessions, workers, args.delay, args.queue_size))
+        assert metrics["completed"] == args.sessions
+        baseline = baseline or elapsed
+        print(f"{workers:<14} {elapsed:8.2f} {args.sessions / elapsed:11.0f} "
+              f"{baseline / elapsed:8.2f} {peak:>12} {metrics['end_to_end']['p95_ms']:11.0f}")
+
+if __name__ == "__main__":
+    main()
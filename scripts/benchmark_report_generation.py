@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmarks for report generation.
+
+Run from the repository root:
+    python scripts/benchmark_report_generation.py sections [--sections 20]
+    python scripts/benchmark_report_generation.py bulk [--reports 200] [--workers 1 2 4 8]
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.base import AgentContext
+from agents.documentation_agent import ContentGenerator, DocumentationAgent, DocumentationAgentConfig
+from agents.pdf_rendering import PDFRenderService
+
+class SimulatedGenerator(ContentGenerator):
+    """Sections that block for a fixed time, like template work that waits
+    on I/O or C extensions that release the GIL"""
+
+    def __init__(self, delays, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = delays
+
+    def _section_builder(self, section_config, assessment_data, analysis_results):
+        def build():
+            time.sleep(self.delays[section_config['id']])
+            return section_config['id']
+        return build
+
+def benchmark_sections(args):
+    rng = random.Random(args.seed)
+    sections = [{"id": f"section_{index}", "type": "analysis"} for index in range(args.sections)]
+    delays = {section["id"]: rng.uniform(0.01, args.max_delay) for section in sections}
+    print(f"{args.sections} sections, total {sum(delays.values()):.2f}s, "
+          f"slowest {max(delays.values()):.2f}s\n")
+
+    for label, concurrency in [("sequential", 1), (f"concurrent ({args.concurrency})", args.concurrency)]:
+        generator = SimulatedGenerator(delays, concurrency=concurrency)
+        try:
+            start = time.perf_counter()
+            asyncio.run(generator.generate_sections(sections, {}, {}))
+            print(f"{label:<28} {time.perf_counter() - start:8.2f}s")
+        finally:
+            generator.shutdown()
+
+def simulated_render(path, cpu_seconds=0.05):
+    """Stand-in for WeasyPrint: reads the spooled HTML, burns CPU in the
+    worker and returns unique bytes"""
+    digest = hashlib.sha256(Path(path).read_bytes())
+    deadline = time.process_time() + cpu_seconds
+    while time.process_time() < deadline:
+        for _ in range(1000):
+            digest.update(digest.digest())
+    return b"%PDF-1.7\n" + digest.digest() * 4096
+
+def benchmark_bulk(args):
+    jobs = [
+        ({"id": str(uuid.uuid4()), "client": index}, {"id": str(uuid.uuid4())}, "progress")
+        for index in range(args.reports)
+    ]
+    print(f"{args.reports} reports, {os.cpu_count()} CPUs\n")
+    print(f"{'render workers':<16} {'seconds':>8} {'reports/min':>12}")
+
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as root:
+            template_dir = Path(root) / "templates"
+            template_dir.mkdir()
+            (template_dir / "progress.jinja2").write_text("Progress report {{ assessment.client }}")
+            agent = DocumentationAgent(DocumentationAgentConfig(
+                template_dir=template_dir,
+                output_dir=Path(root) / "reports",
+                bulk_concurrency=workers * 2
+            ))
+            agent.pdf_generator.render_service.shutdown()
+            agent.pdf_generator.render_service = PDFRenderService(
+                max_workers=workers, file_render_function=simulated_render
+            )
+            try:
+                start = time.perf_counter()
+                result = asyncio.run(agent.generate_bulk(AgentContext(session_id=uuid.uuid4()), jobs))
+                elapsed = time.perf_counter() - start
+            finally:
+                agent.shutdown()
+            assert result.progress.completed == args.reports, result.failures[:1]
+            print(f"{workers:<16} {elapsed:8.2f} {args.reports / elapsed * 60:12.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sections = commands.add_parser("sections", help="sequential vs concurrent section generation")
+    sections.add_argument("--sections", type=int, default=20)
+    sections.add_argument("--concurrency", type=int, default=20)
+    sections.add_argument("--max-delay", type=float, default=0.2)
+    sections.add_argument("--seed", type=int, default=1)
+    sections.set_defaults(func=benchmark_sections)
+
+    bulk = commands.add_parser("bulk", help="bulk generation throughput by render worker count")
+    bulk.add_argument("--reports", type=int, default=200)
+    bulk.add_argument("--workers", type=int, nargs="+",
+                      default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    bulk.set_defaults(func=benchmark_bulk)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from uuid import uuid4
+import pytest
+from agents.agent_pool import AgentPool
+from agents.base import AgentConfig, AgentContext, AgentType, BaseAgent
+
+def _factory(slots=1):
+    return lambda: BaseAgent(AgentType.ANALYSIS, "pooled_agent", AgentConfig(max_concurrent_tasks=slots))
+
+def _session(delay=0.05):
+    async def operation(agent):
+        context = AgentContext(session_id=uuid4())
+        await agent.start_session(context)
+        # The pool never runs more sessions on an agent than it has slots
+        assert len(agent.active_contexts) <= agent.config.max_concurrent_tasks
+        try:
+            await asyncio.sleep(delay)
+            return agent.id
+        finally:
+            await agent.end_session(context.session_id)
+    return operation
+
+@pytest.mark.asyncio
+async def test_load_spike_queues_instead_of_failing():
+    pool = AgentPool(_factory(slots=2), min_size=2, max_size=2)
+
+    try:
+        results = await asyncio.gather(*[pool.submit(_session()) for _ in range(20)])
+        agent_ids = {agent.id for agent in pool.agents}
+    finally:
+        await pool.shutdown()
+
+    assert len(results) == 20
+    assert set(results) == agent_ids
+
+@pytest.mark.asyncio
+async def test_throughput_scales_with_pool_size():
+    async def run(size):
+        pool = AgentPool(_factory(), min_size=size, max_size=size)
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(*[pool.submit(_session(0.05)) for _ in range(16)])
+            return time.perf_counter() - start
+        finally:
+            await pool.shutdown()
+
+    single, quad = await run(1), await run(4)
+
+    assert single > 0.75
+    assert quad < single / 2.5
+
+@pytest.mark.asyncio
+async def test_idle_instances_steal_pinned_work():
+    pool = AgentPool(_factory(), min_size=4, max_size=4)
+    pool.start()
+
+    try:
+        # Every job prefers the same instance
+        results = await asyncio.gather(*[pool.submit(_session(0.02), affinity="session") for _ in range(12)])
+    finally:
+        await pool.shutdown()
+
+    assert len(set(results)) == 4
+    assert pool.stats.stolen >= 8
+
+@pytest.mark.asyncio
+async def test_acquire_serves_waiters_in_order():
+    pool = AgentPool(_factory(), min_size=1, max_size=1)
+    order = []
+
+    async def lease(index):
+        async with pool.acquire() as agent:
+            order.append(index)
+            await asyncio.sleep(0.01)
+            return agent
+
+    try:
+        agents = await asyncio.gather(*[lease(index) for index in range(6)])
+    finally:
+        await pool.shutdown()
+
+    assert order == list(range(6))
+    assert len({agent.id for agent in agents}) == 1
+
+@pytest.mark.asyncio
+async def test_cancelled_acquire_gives_up_its_place():
+    pool = AgentPool(_factory(), min_size=1, max_size=1)
+    entered = []
+
+    async def wait_for_lease():
+        async with pool.acquire():
+            entered.append(True)
+
+    try:
+        async with pool.acquire():
+            waiter = asyncio.ensure_future(wait_for_lease())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+        await asyncio.wait_for(pool.submit(_session(0)), 1)
+    finally:
+        await pool.shutdown()
+
+    assert entered == []
+    assert pool.stats.completed == 2
+
+@pytest.mark.asyncio
+async def test_pool_scales_with_queue_depth():
+    pool = AgentPool(_factory(), min_size=1, max_size=3, scale_up_depth=2, idle_timeout=0.05)
+
+    try:
+        await asyncio.gather(*[pool.submit(_session(0.02)) for _ in range(12)])
+        assert pool.size == 3
+        assert pool.stats.scaled_up == 2
+
+        await asyncio.sleep(0.2)
+        assert pool.size == 1
+        assert pool.get_metrics()["scaled_down"] == 2
+    finally:
+        await pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_operation_errors_reach_the_caller():
+    pool = AgentPool(_factory())
+
+    async def failing(agent):
+        raise ValueError("bad assessment")
+
+    try:
+        with pytest.raises(ValueError, match="bad assessment"):
+            await pool.submit(failing)
+        assert await pool.submit(_session(0)) == pool.agents[0].id
+    finally:
+        await pool.shutdown()
+
+    assert pool.stats.failed == 1
+
+@pytest.mark.asyncio
+async def test_start_session_waits_in_line_for_a_slot():
+    agent = _factory(slots=2)()
+    order = []
+
+    async def session(index):
+        context = AgentContext(session_id=uuid4())
+        await agent.start_session(context)
+        order.append(index)
+        assert len(agent.active_contexts) <= 2
+        await asyncio.sleep(0.01)
+        await agent.end_session(context.session_id)
+
+    await asyncio.gather(*[session(index) for index in range(6)])
+
+    assert order == list(range(6))
+    assert not agent.active_contexts
+
+@pytest.mark.asyncio
+async def test_start_session_gives_up_after_timeout():
+    agent = _factory()()
+    agent.config.timeout_seconds = 0.05  # Below the validated minimum, for speed
+    await agent.start_session(AgentContext(session_id=uuid4()))
+
+    with pytest.raises(ValueError, match="Maximum concurrent tasks limit reached"):
+        await agent.start_session(AgentContext(session_id=uuid4()))
+
+    # A cancelled waiter gives up its place in line
+    waiting = asyncio.ensure_future(agent.start_session(AgentContext(session_id=uuid4())))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    later = asyncio.ensure_future(agent.start_session(AgentContext(session_id=uuid4())))
+    await asyncio.sleep(0)
+    await agent.end_session(next(iter(agent.active_contexts)))
+
+    await later
+    assert len(agent.active_contexts) == 1
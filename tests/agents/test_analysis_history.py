@@ -0,0 +1,197 @@
+import pytest
+from datetime import datetime, timedelta
+from uuid import uuid4
+from agents.analysis_agent import AnalysisAgent
+from agents.analysis_history import AnalysisHistoryStore, DatabaseAnalysisHistory, HistoryPoint
+from agents.base import AgentContext
+
+class MemoryHistoryDatabase:
+    """The analysis history methods of AsyncDatabaseService, over a list"""
+    def __init__(self):
+        self.rows = []
+
+    async def add_analysis_history(self, client_id, assessment_id, recorded_at, risk_score,
+                                   functional_status, therapist_id=None):
+        row = (
+            client_id, therapist_id, assessment_id, recorded_at, risk_score,
+            functional_status["independent"], functional_status["unable"],
+            functional_status["total_activities"]
+        )
+        for index, existing in enumerate(self.rows):
+            if existing[2] == assessment_id:  # Upsert, keeping recorded_at
+                self.rows[index] = row[:3] + existing[3:4] + row[4:]
+                return
+        self.rows.append(row)
+
+    async def get_analysis_history(self, client_id=None, therapist_id=None):
+        return [row for row in self.rows if row[0] == client_id]
+
+@pytest.fixture
+def history():
+    return AnalysisHistoryStore()
+
+def _point(days_ago, risk_score, independent, total=10):
+    return HistoryPoint(
+        recorded_at=datetime(2025, 1, 1) - timedelta(days=days_ago),
+        risk_score=risk_score,
+        independent=independent,
+        unable=total - independent,
+        total_activities=total
+    )
+
+def test_single_point_has_no_trajectory(history):
+    client_id = uuid4()
+    history.record(client_id, _point(0, 5.0, 5))
+
+    assert history.client_trajectory(client_id) is None
+
+def test_client_trajectory_over_history(history):
+    client_id = uuid4()
+    # Recorded out of order, columns stay time-sorted
+    history.record(client_id, _point(0, 2.0, 8))
+    history.record(client_id, _point(60, 6.0, 3))
+    history.record(client_id, _point(30, 4.0, 5))
+
+    trajectory = history.client_trajectory(client_id)
+
+    assert trajectory["assessments"] == 3
+    assert trajectory["risk_slope"] == pytest.approx(-2.0)
+    assert trajectory["functional_trajectory"] == "improving"
+    assert trajectory["risk_trajectory"] == "de-escalating"
+
+def test_trajectory_includes_current_point(history):
+    client_id = uuid4()
+    history.record(client_id, _point(30, 2.0, 8))
+
+    trajectory = history.client_trajectory(client_id, current=_point(0, 7.0, 2))
+
+    assert trajectory["functional_trajectory"] == "declining"
+    assert trajectory["risk_trajectory"] == "escalating"
+    assert len(history) == 1
+
+def test_one_point_per_assessment(history):
+    client_id, assessment_id = uuid4(), uuid4()
+    history.record(client_id, _point(30, 2.0, 8), assessment_id=uuid4())
+    history.record(client_id, _point(0, 2.0, 8), assessment_id=assessment_id)
+    history.record(client_id, _point(0, 6.0, 3), assessment_id=assessment_id)
+
+    assert len(history) == 2
+    assert history.recorded(client_id, assessment_id).risk_score == 6.0
+    # A new observation for a held assessment stands in for its point
+    trajectory = history.client_trajectory(client_id, current=_point(0, 2.0, 8), assessment_id=assessment_id)
+    assert trajectory["assessments"] == 2
+    assert trajectory["risk_trajectory"] == "stable"
+
+def test_caseload_trajectories(history):
+    therapist_id = uuid4()
+    rising, flat, single = uuid4(), uuid4(), uuid4()
+    rows = [
+        (rising, therapist_id, uuid4(), datetime(2025, 1, 1), 2.0, 5.0, 5.0, 10.0),
+        (rising, therapist_id, uuid4(), datetime(2025, 2, 1), 6.0, 5.0, 5.0, 10.0),
+        (flat, therapist_id, uuid4(), datetime(2025, 1, 1), 3.0, 5.0, 5.0, 10.0),
+        (flat, therapist_id, uuid4(), datetime(2025, 2, 1), 3.0, 5.0, 5.0, 10.0),
+        (single, therapist_id, uuid4(), datetime(2025, 1, 1), 3.0, 5.0, 5.0, 10.0),
+        (uuid4(), uuid4(), uuid4(), datetime(2025, 1, 1), 3.0, 5.0, 5.0, 10.0),
+    ]
+    assert history.load(rows) == len(rows)
+
+    trajectories = history.caseload_trajectories(therapist_id)
+
+    assert set(trajectories) == {rising, flat}
+    assert trajectories[rising]["risk_trajectory"] == "escalating"
+    assert trajectories[flat]["risk_trajectory"] == "stable"
+
+@pytest.mark.asyncio
+async def test_agent_uses_prior_assessments(history):
+    agent = AnalysisAgent(history=history)
+    client_id = uuid4()
+    therapist_id = uuid4()
+    history.record(
+        client_id,
+        HistoryPoint(datetime.utcnow() - timedelta(days=30), 0.0, 10, 0, 10),
+        therapist_id=therapist_id
+    )
+
+    context = AgentContext(session_id=uuid4(), user_id=uuid4(), therapist_id=therapist_id)
+    result = await agent.analyze_assessment({
+        "id": uuid4(),
+        "client_id": client_id,
+        "functional_changes": {"adl_changes": []},
+        "risk_factors": [{"type": "physical", "severity": "high"}] * 4,
+        "metrics": {"functional_status": {"total_activities": 10, "independent": 2, "unable": 8}}
+    }, context)
+
+    trends = result.insights["functional_impact"]["trends"]
+    assert trends["functional_trajectory"] == "declining"
+    assert trends["risk_trajectory"] == "escalating"
+    assert client_id in agent.get_caseload_trends(therapist_id)
+
+def test_client_memory_is_bounded():
+    history = AnalysisHistoryStore(max_clients=2)
+    therapist_id = uuid4()
+    oldest, recent, newest = uuid4(), uuid4(), uuid4()
+    history.record(oldest, _point(30, 2.0, 8), therapist_id=therapist_id)
+    history.record(recent, _point(30, 2.0, 8), therapist_id=therapist_id)
+    history.record(oldest, _point(0, 3.0, 7), therapist_id=therapist_id)  # Touch
+    history.record(newest, _point(0, 3.0, 7), therapist_id=therapist_id)
+
+    assert recent not in history
+    assert oldest in history and newest in history
+    assert set(history.client_ids(therapist_id)) == {oldest, newest}
+    assert history.get_metrics() == {"clients": 2, "points": 3, "caseloads": 1, "evicted": 1}
+
+@pytest.mark.asyncio
+async def test_history_survives_restart_through_database():
+    database = MemoryHistoryDatabase()
+    client_id = uuid4()
+    context = AgentContext(session_id=uuid4(), user_id=uuid4(), therapist_id=uuid4())
+
+    def assessment(independent):
+        return {
+            "id": uuid4(),
+            "client_id": client_id,
+            "functional_changes": {"adl_changes": []},
+            "risk_factors": [],
+            "metrics": {"functional_status": {"total_activities": 10, "independent": independent}}
+        }
+
+    first = AnalysisAgent(history_db=DatabaseAnalysisHistory(database))
+    await first.analyze_assessment(assessment(9), context)
+    database.rows[0] = (*database.rows[0][:3], datetime.utcnow() - timedelta(days=30), *database.rows[0][4:])
+
+    # A new agent starts with empty memory and loads the client's history
+    restarted = AnalysisAgent(history_db=DatabaseAnalysisHistory(database))
+    result = await restarted.analyze_assessment(assessment(2), context)
+
+    assert result.insights["functional_impact"]["trends"]["functional_trajectory"] == "declining"
+    assert len(restarted.history) == 2
+    assert len(database.rows) == 2
+
+@pytest.mark.asyncio
+async def test_retry_does_not_duplicate_history():
+    database = MemoryHistoryDatabase()
+    agent = AnalysisAgent(history_db=DatabaseAnalysisHistory(database))
+    context = AgentContext(session_id=uuid4(), user_id=uuid4(), therapist_id=uuid4())
+    assessment = {
+        "id": uuid4(),
+        "client_id": uuid4(),
+        "functional_changes": {"adl_changes": []},
+        "risk_factors": [],
+        "metrics": {"functional_status": {"total_activities": 10, "independent": 9}}
+    }
+
+    await agent.analyze_assessment(assessment, context)
+    saved = list(database.rows)
+    await agent.analyze_assessment(dict(assessment), context)
+
+    assert len(agent.history) == 1
+    assert database.rows == saved
+
+    # An edited assessment replaces its point and keeps its time
+    edited = dict(assessment, risk_factors=[{"type": "physical", "severity": "high"}])
+    await agent.analyze_assessment(edited, context)
+
+    assert len(agent.history) == 1
+    assert len(database.rows) == 1
+    assert database.rows[0][3] == saved[0][3]
+    assert database.rows[0][4] != saved[0][4]
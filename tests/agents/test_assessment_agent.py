@@ -8,7 +8,7 @@ from backend.models.assessment import (
     ClientType
 )
 from agents.assessment_agent import AssessmentAgent
-from agents.base import AgentContext
+from agents.base import AgentContext, AgentStatus
 
 @pytest.fixture
 def sample_assessment():
@@ -221,4 +221,15 @@ async def test_metrics_update(assessment_agent, sample_assessment):
         msg["type"] == "metric_update" and 
         msg["metric"] == "assessment_completed"
         for msg in messages
-    )
\ No newline at end of file
+    )
+@pytest.mark.asyncio
+async def test_cached_result_still_needs_an_enabled_agent(assessment_agent, sample_assessment):
+    def context():
+        return AgentContext(session_id=uuid4(), user_id=uuid4(), therapist_id=uuid4(), client_id=uuid4())
+
+    await assessment_agent.process_assessment(sample_assessment, context())
+    assessment_agent.update_status(AgentStatus.DISABLED)
+
+    with pytest.raises(ValueError, match="Agent is disabled"):
+        await assessment_agent.process_assessment(sample_assessment, context())
+    assert assessment_agent.result_cache.stats.memory_hits == 0
@@ -0,0 +1,121 @@
+import asyncio
+from uuid import uuid4
+import pytest
+from agents.agent_pool import AgentPool
+from agents.assessment_pipeline import AssessmentPipeline
+from agents.base import AgentConfig, AgentType, BaseAgent
+from agents.session_status import FAILED, IN_PROGRESS, REPORT_READY
+from agents.session_store import SessionStore
+
+class StubAssessmentAgent:
+    def __init__(self):
+        self.lookups = 0
+
+    async def get_next_step(self, session_id):
+        self.lookups += 1
+        return {"step": self.lookups}
+
+class RecordingDocumentationAgent:
+    def __init__(self, fail_for=()):
+        self.messages = []
+        self.fail_for = set(fail_for)
+
+    async def process_message(self, message):
+        self.messages.append(message)
+        # Yield so several documentation workers interleave
+        await asyncio.sleep(0)
+        if message["session_id"] in self.fail_for:
+            raise RuntimeError("template missing")
+        return {"session_id": message["session_id"]}
+
+class PooledAnalysisAgent(BaseAgent):
+    def __init__(self):
+        super().__init__(AgentType.ANALYSIS, "pooled_analysis", AgentConfig(max_concurrent_tasks=2))
+
+    async def process_documentation(self, documentation):
+        return {"session_id": documentation["session_id"], "risk": 0.5}
+
+class StubReportAgent:
+    async def process_analysis(self, analysis):
+        return {"summary": f"report for {analysis['session_id']}"}
+
+def _events(session_id, steps=2):
+    yield {"type": "assessment_started", "session_id": session_id}
+    for step in range(steps):
+        yield {"type": "step_completed", "session_id": session_id, "next_step": {"step": step + 1}}
+    yield {"type": "assessment_completed", "session_id": session_id}
+
+def _pipeline(documentation_agent):
+    sessions = SessionStore()
+    pool = AgentPool(PooledAnalysisAgent, max_size=2)
+    pipeline = AssessmentPipeline(
+        sessions, StubAssessmentAgent(), documentation_agent, pool, StubReportAgent(),
+        stage_workers={"documentation": 4, "analysis": 2, "report": 2}
+    )
+    return sessions, pool, pipeline
+
+async def _feed(pipeline, messages):
+    pool = pipeline.analysis_pool
+    pool.start()
+    pipeline.start()
+    try:
+        results = [await pipeline.handle(message) for message in messages]
+        await asyncio.gather(*[result for result in results if result is not None], return_exceptions=True)
+        return results
+    finally:
+        await pipeline.shutdown()
+        await pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_only_completed_assessments_enter_the_pipeline():
+    documentation_agent = RecordingDocumentationAgent()
+    sessions, pool, pipeline = _pipeline(documentation_agent)
+    session_ids = [uuid4() for _ in range(6)]
+    for session_id in session_ids:
+        sessions.open(session_id)
+    # Interleave the sessions' events, as the bus delivers them
+    streams = [list(_events(session_id)) for session_id in session_ids]
+    messages = [stream[index] for index in range(4) for stream in streams]
+
+    results = await _feed(pipeline, messages)
+
+    assert sum(result is not None for result in results) == len(session_ids)
+    assert [message["type"] for message in documentation_agent.messages] == ["assessment_completed"] * 6
+    assert sorted(message["session_id"] for message in documentation_agent.messages) == sorted(session_ids)
+    assert pipeline.get_metrics()["completed"] == 6
+    for session_id in session_ids:
+        status = await sessions.lookup(session_id)
+        assert status["status"] == REPORT_READY
+        assert status["report"] == {"summary": f"report for {session_id}"}
+
+@pytest.mark.asyncio
+async def test_progress_events_only_update_the_projection():
+    documentation_agent = RecordingDocumentationAgent()
+    sessions, pool, pipeline = _pipeline(documentation_agent)
+    session_id = uuid4()
+    sessions.open(session_id)
+
+    started, step, _ = list(_events(session_id, steps=1))
+    assert await _feed(pipeline, [started, step]) == [None, None]
+
+    status = await sessions.lookup(session_id)
+    assert status["status"] == IN_PROGRESS
+    assert status["assessment"] == {"step": 1}
+    assert documentation_agent.messages == []
+    assert pipeline.assessment_agent.lookups == 1  # Only the event without a next step
+
+@pytest.mark.asyncio
+async def test_failed_stage_marks_session_failed():
+    failing, passing = uuid4(), uuid4()
+    sessions, pool, pipeline = _pipeline(RecordingDocumentationAgent(fail_for=[failing]))
+    for session_id in (failing, passing):
+        sessions.open(session_id)
+
+    await _feed(pipeline, [
+        {"type": "assessment_completed", "session_id": failing},
+        {"type": "assessment_completed", "session_id": passing}
+    ])
+
+    failed = await sessions.lookup(failing)
+    assert (failed["status"], failed["error"]) == (FAILED, "template missing")
+    assert (await sessions.lookup(passing))["status"] == REPORT_READY
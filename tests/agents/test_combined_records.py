@@ -0,0 +1,86 @@
+import os
+import pytest
+from uuid import uuid4
+from agents.base import AgentContext
+from agents.combined_records import CombinedRecords
+from agents.pdf_parser_agent import PDFParserAgent, PDFParserAgentConfig
+
+def _record(diagnoses=(), medications=(), conditions=()):
+    return {
+        "diagnoses": list(diagnoses),
+        "medications": [
+            {"name": name, "dosage": dosage, "frequency": "daily", "route": "oral"}
+            for name, dosage in medications
+        ],
+        "medical_history": {
+            "surgeries": [], "conditions": list(conditions), "allergies": [], "family_history": []
+        }
+    }
+
+def test_shared_items_survive_removal_of_one_source():
+    combined = CombinedRecords()
+    combined.put("a.pdf", _record(["strain"], [("Ibuprofen", "400mg")], ["diabetes"]), (1, 1))
+    combined.put("b.pdf", _record(["strain", "sprain"], [("Ibuprofen", "400mg")]), (1, 1))
+
+    assert combined.diagnoses() == ["strain", "sprain"]
+    assert len(combined.medications()) == 1
+
+    combined.remove("a.pdf")
+
+    assert combined.diagnoses() == ["strain", "sprain"]
+    assert len(combined.medications()) == 1
+    assert combined.history()["conditions"] == []
+    assert combined.condition_risks() == []
+
+def test_replacing_a_source_drops_its_old_items():
+    combined = CombinedRecords()
+    combined.put("a.pdf", _record(["strain"]), (1, 1))
+    combined.put("a.pdf", _record(["fracture"]), (2, 2))
+
+    assert combined.diagnoses() == ["fracture"]
+    assert combined.sources["a.pdf"].fingerprint == (2, 2)
+
+def test_round_trip():
+    combined = CombinedRecords()
+    combined.put("a.pdf", _record(["strain"], [("Ibuprofen", "400mg")], ["hypertension"]), (3, 4))
+
+    restored = CombinedRecords.from_dict(combined.to_dict())
+
+    assert restored.diagnoses() == combined.diagnoses()
+    assert restored.medications() == combined.medications()
+    assert restored.condition_risks()[0]["description"] == "hypertension"
+
+@pytest.mark.asyncio
+async def test_only_new_and_changed_files_are_parsed(make_pdf, monkeypatch):
+    first = make_pdf("first.pdf", ["Impression: lumbar strain\n\n", "Ibuprofen 400mg twice oral\n"])
+    second = make_pdf("second.pdf", ["Naproxen 250mg nightly oral\n"])
+    agent = PDFParserAgent(PDFParserAgentConfig(ingestion_workers=1))
+    combined = CombinedRecords()
+    parsed = []
+    parse = agent._parse_record_map
+
+    async def tracking_parse(pdf_paths, deferred=None):
+        parsed.append([path.name for path in pdf_paths])
+        return await parse(pdf_paths, deferred)
+    monkeypatch.setattr(agent, "_parse_record_map", tracking_parse)
+
+    def context():
+        return AgentContext(session_id=uuid4(), therapist_id=uuid4(), client_id=uuid4())
+
+    try:
+        await agent.process_document_changes(context(), combined, [first], "")
+        result = await agent.process_document_changes(context(), combined, [first, second], "")
+
+        make_pdf("second.pdf", ["Naproxen 500mg nightly oral\n"])
+        stat = os.stat(second)
+        os.utime(second, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        updated = await agent.process_document_changes(context(), combined, [first, second], "")
+        removed = await agent.process_document_changes(context(), combined, [second], "")
+    finally:
+        agent.shutdown()
+
+    assert parsed == [["first.pdf"], ["second.pdf"], ["second.pdf"], []]
+    assert result["metadata"]["source_count"] == 2
+    assert [m["dosage"] for m in result["medical_records"]["medications"]] == ["400mg", "250mg"]
+    assert [m["dosage"] for m in updated["medical_records"]["medications"]] == ["400mg", "500mg"]
+    assert [m["dosage"] for m in removed["medical_records"]["medications"]] == ["500mg"]
@@ -0,0 +1,96 @@
+import pytest
+from uuid import uuid4
+from agents.base import AgentContext
+from agents.combined_records import CombinedRecords
+from agents.document_triage import TriageSample, classify, sample_document
+from agents.pdf_parser_agent import PDFParserAgent, PDFParserAgentConfig
+
+INVOICE = "Invoice 2024-118\nOccupational therapy services\nAmount due: $450.00\n"
+LETTER = "Dear adjuster,\nPlease find the attached report.\nSincerely,\nClinic"
+
+@pytest.mark.parametrize("sample, document_type, parse", [
+    (TriageSample(text="Progress note\nDiagnosis:\nLumbar strain", page_count=1, sampled_pages=1),
+     "medical_record", True),
+    (TriageSample(text="Ibuprofen 400mg twice oral", page_count=1, sampled_pages=1),
+     "medical_record", True),
+    (TriageSample(text=INVOICE, page_count=3, sampled_pages=2), "invoice", False),
+    (TriageSample(text=LETTER, page_count=1, sampled_pages=1), "correspondence", False),
+    (TriageSample(text="", page_count=4, sampled_pages=2), "unknown", True),
+])
+def test_classify(sample, document_type, parse):
+    decision = classify(sample)
+
+    assert (decision.document_type, decision.parse) == (document_type, parse)
+
+def test_cover_letter_with_more_pages_is_parsed():
+    # The letter may precede the records it covers
+    assert classify(TriageSample(text=LETTER, page_count=12, sampled_pages=2)).parse
+
+def test_outline_headers_count():
+    sample = TriageSample(text=INVOICE, outline=["Past Medical History"], page_count=9, sampled_pages=2)
+
+    assert classify(sample).parse
+
+def test_sample_reads_only_leading_pages(make_pdf):
+    path = make_pdf("long.pdf", [f"Page {index}" for index in range(6)])
+
+    sample = sample_document(str(path), sample_pages=2)
+
+    assert sample.page_count == 6
+    assert sample.sampled_pages == 2
+    assert "Page 1" in sample.text and "Page 2" not in sample.text
+
+@pytest.mark.asyncio
+async def test_agent_defers_low_value_documents(make_pdf):
+    record = make_pdf("record.pdf", ["Impression: lumbar strain\n", "Ibuprofen 400mg twice oral\n"])
+    invoice = make_pdf("invoice.pdf", [INVOICE, "Payment terms: 30 days\n"])
+    agent = PDFParserAgent(PDFParserAgentConfig(ingestion_workers=1, triage=True))
+    context = AgentContext(session_id=uuid4(), therapist_id=uuid4(), client_id=uuid4())
+
+    try:
+        result = await agent.process_documents(context, [record, invoice], "")
+    finally:
+        agent.shutdown()
+
+    assert result["metadata"]["source_count"] == 1
+    assert result["metadata"]["deferred_sources"] == [
+        {"source": "invoice.pdf", "document_type": "invoice", "reason": "marker 'Invoice'"}
+    ]
+
+@pytest.mark.asyncio
+async def test_deferred_documents_are_not_retriaged(make_pdf, monkeypatch):
+    record = make_pdf("record.pdf", ["Impression: lumbar strain\n", "Ibuprofen 400mg twice oral\n"])
+    invoice = make_pdf("invoice.pdf", [INVOICE, "Payment terms: 30 days\n"])
+    agent = PDFParserAgent(PDFParserAgentConfig(ingestion_workers=1, triage=True))
+    combined = CombinedRecords()
+    parsed, triaged = [], []
+    parse, triage = agent._parse_record_map, agent._triage
+
+    async def tracking_parse(pdf_paths, deferred=None):
+        parsed.append([path.name for path in pdf_paths])
+        return await parse(pdf_paths, deferred)
+
+    async def tracking_triage(items, deferred):
+        triaged.append([path.name for _, path in items])
+        return await triage(items, deferred)
+    monkeypatch.setattr(agent, "_parse_record_map", tracking_parse)
+    monkeypatch.setattr(agent, "_triage", tracking_triage)
+
+    def context():
+        return AgentContext(session_id=uuid4(), therapist_id=uuid4(), client_id=uuid4())
+
+    try:
+        first = await agent.process_document_changes(context(), combined, [record, invoice], "")
+        second = await agent.process_document_changes(context(), combined, [record, invoice], "")
+    finally:
+        agent.shutdown()
+
+    assert parsed == [["record.pdf", "invoice.pdf"], []]
+    assert triaged == [["record.pdf", "invoice.pdf"]]
+    for result in (first, second):
+        assert result["metadata"]["source_count"] == 1
+        assert [entry["source"] for entry in result["metadata"]["deferred_sources"]] == ["invoice.pdf"]
+
+    restored = CombinedRecords.from_dict(combined.to_dict())
+    assert restored.pending([record, invoice]) == ([], [])
+    assert restored.deferred() == combined.deferred()
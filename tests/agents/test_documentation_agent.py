@@ -1,3 +1,4 @@
+import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
@@ -170,22 +171,20 @@ class TestDocumentationAgent:
             template_id="default"
         )
         
-        # Third assessment should fail (max_concurrent_tasks=2)
-        with pytest.raises(ValueError, match="Maximum concurrent tasks limit reached"):
-            await agent.process_assessment(
-                context=context3,
-                assessment_data=sample_assessment_data,
-                analysis_results=sample_analysis_results,
-                template_id="default"
-            )
+        # Third assessment waits for a slot (max_concurrent_tasks=2)
+        task3 = agent.process_assessment(
+            context=context3,
+            assessment_data=sample_assessment_data,
+            analysis_results=sample_analysis_results,
+            template_id="default"
+        )
         
-        # Complete first two tasks
-        report1 = await task1
-        report2 = await task2
+        report1, report2, report3 = await asyncio.gather(task1, task2, task3)
         
         assert isinstance(report1, Report)
         assert isinstance(report2, Report)
-        assert report1.id != report2.id
+        assert isinstance(report3, Report)
+        assert len({report1.id, report2.id, report3.id}) == 3
     
     async def test_pdf_generation(
         self,
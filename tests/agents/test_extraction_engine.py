@@ -0,0 +1,101 @@
+import re
+import pytest
+from agents.extraction_engine import ASSESSMENT_NOTES_ENGINE, ExtractionEngine, trie_pattern
+from agents.pdf_parser_agent import PDFParserAgent, PDFParserAgentConfig
+
+NOTES = """Mobility: ambulates with a four-wheeled walker
+Gait is slow and shuffling
+* Needs standby assist on stairs
+
+Activities of Daily Living:
+
+Independent with grooming
+Important: requires help with bathing
+
+Home Safety
+Hazard: loose rugs in hallway
+Urgent: no grab bars in bathroom
+Mobility: duplicate heading is ignored
+
+Recommendations: install grab bars
+Note: review in two weeks
+"""
+
+def _legacy_section(text, name):
+    match = re.search(f"{name}:?[\\s\\n]*(.*?)(?:\\n\\n|\\Z)", text, re.IGNORECASE | re.MULTILINE)
+    return [item.strip() for item in match.group(1).split('\n') if item.strip()] if match else []
+
+def _legacy_matches(text, patterns):
+    return [m.group(1).strip() for pattern in patterns for m in re.finditer(pattern, text)]
+
+@pytest.fixture
+def agent():
+    agent = PDFParserAgent(PDFParserAgentConfig())
+    yield agent
+    agent.shutdown()
+
+def test_matches_per_pattern_scans(agent):
+    parsed = agent._parse_assessment_notes(NOTES)
+
+    # Multi-line bodies are kept whole and blank lines after a heading are skipped
+    assert parsed["sections"] == {
+        "mobility": [
+            "ambulates with a four-wheeled walker",
+            "Gait is slow and shuffling",
+            "* Needs standby assist on stairs"
+        ],
+        "adl": ["Independent with grooming", "Important: requires help with bathing"],
+        "home_safety": ["Hazard: loose rugs in hallway", "Urgent: no grab bars in bathroom"],
+        "recommendations": ["install grab bars", "Note: review in two weeks"],
+        "additional_notes": []
+    }
+    assert _legacy_section("Recommendations: install grab bars\n\n", "Recommendations") == \
+        parsed["sections"]["recommendations"][:1]
+    assert parsed["key_observations"] == _legacy_matches(
+        NOTES, [rule.pattern for rule in ASSESSMENT_NOTES_ENGINE.rules if rule.group == "observations"]
+    )
+    assert parsed["immediate_concerns"] == ["no grab bars in bathroom"]
+    assert [(r["type"], r["description"]) for r in parsed["risk_factors"]] == [
+        ("fall_risk", "is slow and shuffling"),
+        ("safety", ": loose rugs in hallway")
+    ]
+
+def test_sections_require_heading_at_line_start(agent):
+    notes = "Client reports reduced mobility.\n\nMobility:\nuses a cane\nAdditional Notes: none"
+
+    sections = agent._parse_assessment_notes(notes)["sections"]
+
+    # The heading-less mention and the following heading both bound the body
+    assert sections["mobility"] == ["uses a cane"]
+    assert sections["additional_notes"] == ["none"]
+    assert agent._extract_section(notes, "Additional Notes") == ["none"]
+
+def test_single_scan():
+    text = "Plain narrative line without markers\n" * 500 + "URGENT: call family\n"
+
+    result = ASSESSMENT_NOTES_ENGINE.extract(text)
+
+    assert result.values("immediate_concerns") == ["call family"]
+    assert result.passes < 1.1
+
+def test_tokenize_first_occurrence_only():
+    engine = ExtractionEngine({"plan": "Plan"}, [])
+
+    sections = engine.tokenize("plan: first\n\nPLAN: second\n")
+
+    assert [(section.key, section.lines) for section in sections] == [("plan", ["first"])]
+
+def test_tokenize_keeps_repeated_sections():
+    engine = ExtractionEngine({"plan": "Plan", "note": "Note"}, [], repeated=["note"])
+
+    sections = engine.tokenize("note: a\n\nplan: first\nnote: b\n\nplan: second\n")
+
+    assert [(section.key, section.lines) for section in sections] == [
+        ("note", ["a"]), ("plan", ["first"]), ("note", ["b"])
+    ]
+    assert engine.extract("note: a\n\nnote: b\n").sections["note"] == ["a", "b"]
+
+def test_trie_pattern_prefers_longest_word():
+    pattern = re.compile(trie_pattern(["fall risk", "falls risk", "fall", "gait"]))
+
+    assert [m.group() for m in pattern.finditer("falls risk, fall, gait")] == ["falls risk", "fall", "gait"]
@@ -0,0 +1,111 @@
+import random
+import re
+import pytest
+from agents import medication_extraction
+from agents.medication_extraction import extract_medications, extract_page_medications
+
+LEGACY_PATTERN = r"(?i)([\w\s]+)\s+(\d+[\w\/]+)\s+(\w+)\s+(\w+)"
+
+def _legacy(text):
+    return [
+        {"name": m.group(1).strip(), "dosage": m.group(2), "frequency": m.group(3), "route": m.group(4)}
+        for m in re.finditer(LEGACY_PATTERN, text)
+    ]
+
+@pytest.mark.parametrize("line", [
+    "Acetaminophen 500mg daily oral",
+    "Hydrocodone acetaminophen 10/325 q6h oral",
+    "  Ibuprofen   400mg  twice   oral  ",
+])
+def test_single_entry_matches_legacy_pattern(line):
+    assert extract_medications(line) == _legacy(line)
+
+def test_entries_stay_on_their_line():
+    text = "Current medications\nIbuprofen 400mg twice oral\nNaproxen 250mg nightly oral extra"
+
+    assert extract_medications(text) == [
+        {"name": "Ibuprofen", "dosage": "400mg", "frequency": "twice", "route": "oral"},
+        {"name": "Naproxen", "dosage": "250mg", "frequency": "nightly", "route": "oral"}
+    ]
+
+def test_several_entries_per_line_and_punctuation():
+    line = "Meds: Ibuprofen 400mg twice oral Naproxen 250mg nightly oral; Tylenol 500mg"
+
+    assert [(m["name"], m["dosage"]) for m in extract_medications(line)] == [
+        ("Ibuprofen", "400mg"), ("Naproxen", "250mg")
+    ]
+
+def test_page_extraction_concatenates_in_order():
+    pages = ["Ibuprofen 400mg twice oral", None, "Naproxen 250mg nightly oral"]
+
+    assert extract_page_medications(pages) == extract_medications(pages[0]) + extract_medications(pages[2])
+
+def _ocr_noise(rng, size):
+    """Whitespace-heavy OCR-like text: word fragments, digit runs, stray
+    punctuation and long runs of spaces, tabs and line breaks"""
+    pieces = []
+    length = 0
+    while length < size:
+        piece = rng.choice([
+            " " * rng.randint(1, 200),
+            "\t" * rng.randint(1, 20),
+            "\n" * rng.randint(1, 3),
+            "a" * rng.randint(1, 30),
+            str(rng.randint(0, 10 ** 6)) + rng.choice(["mg", "", "/", "ml"]),
+            rng.choice([".", ",", ":", "|", "-"]),
+            "Ibuprofen 400mg twice oral",
+        ])
+        pieces.append(piece)
+        length += len(piece)
+    return "".join(pieces)
+
+class CountingPattern:
+    """Wraps a token pattern, counting calls and characters matched against"""
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.calls = 0
+        self.chars = 0
+
+    def fullmatch(self, string):
+        self.calls += 1
+        self.chars += len(string)
+        return self.pattern.fullmatch(string)
+
+@pytest.fixture
+def counted(monkeypatch):
+    """Regex work done by the extractor: (calls, characters)"""
+    patterns = [CountingPattern(medication_extraction.DOSAGE_TOKEN), CountingPattern(medication_extraction.WORD_TOKEN)]
+    monkeypatch.setattr(medication_extraction, "DOSAGE_TOKEN", patterns[0])
+    monkeypatch.setattr(medication_extraction, "WORD_TOKEN", patterns[1])
+
+    def work():
+        return sum(p.calls for p in patterns), sum(p.chars for p in patterns)
+    return work
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fuzz_worst_case_work(seed, counted):
+    rng = random.Random(seed)
+    text = _ocr_noise(rng, 1024 * 1024)
+
+    medications = extract_medications(text)
+
+    # Each token is matched against at most a few anchored patterns, so the
+    # regex work is bounded by a small multiple of the text, whatever it holds
+    calls, chars = counted()
+    assert calls <= 4 * len(text.split())
+    assert chars <= 4 * len(text)
+    assert all(m["name"] and m["dosage"][0].isdigit() for m in medications)
+
+@pytest.mark.parametrize("unit", ["a ", "1 ", " " * 64 + "a"])
+def test_pathological_input_scales_linearly(unit, counted):
+    work = []
+    for repeat in (20000, 80000):
+        before = counted()
+        extract_medications(unit * repeat)
+        after = counted()
+        work.append((after[0] - before[0], after[1] - before[1]))
+
+    # Four times the input costs four times the work, give or take the ends
+    assert work[1][0] <= work[0][0] * 4 + 16
+    assert work[1][1] <= work[0][1] * 4 + 16
@@ -0,0 +1,125 @@
+import asyncio
+from uuid import uuid4
+import pytest
+from agents.base import OUTBOX_SIZE, AgentContext, AgentType, BaseAgent
+from agents.message_bus import (
+    ALL_TOPICS, AgentEvent, MessageBus, MetricUpdate, OverflowPolicy, SessionEnded, SessionStarted
+)
+
+def _metric(index):
+    return MetricUpdate(uuid4(), "assessment_completed", {"index": index})
+
+@pytest.mark.asyncio
+async def test_subscribers_only_receive_their_topics():
+    bus = MessageBus()
+    sessions = bus.subscribe(["session_started", "session_ended"], name="sessions")
+    agent_id, session_id = uuid4(), uuid4()
+
+    await bus.publish(SessionStarted(agent_id, session_id, "analysis"))
+    await bus.publish(_metric(0))
+    await bus.publish(SessionEnded(agent_id, session_id))
+
+    received = [sessions.get_nowait(), sessions.get_nowait()]
+    assert [message["type"] for message in received] == ["session_started", "session_ended"]
+    assert sessions.empty()
+    assert bus.get_metrics()["topics"]["metric_update"]["unrouted"] == 1
+
+@pytest.mark.asyncio
+async def test_topic_and_all_topics_subscription_receives_once():
+    bus = MessageBus(default_size=1, default_policy=OverflowPolicy.BLOCK)
+    subscription = bus.subscribe(["metric_update", ALL_TOPICS])
+
+    # With a second delivery the full channel would block this publish
+    assert await asyncio.wait_for(bus.publish(_metric(0)), timeout=1) == 1
+    assert subscription.qsize() == 1
+
+@pytest.mark.asyncio
+async def test_block_policy_applies_backpressure():
+    bus = MessageBus(default_size=2)
+    subscription = bus.subscribe(["metric_update"])
+    for index in range(2):
+        await bus.publish(_metric(index))
+
+    blocked = asyncio.ensure_future(bus.publish(_metric(2)))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    assert (await subscription.get()).data == {"index": 0}
+    await asyncio.wait_for(blocked, 1)
+    assert [subscription.get_nowait().data["index"] for _ in range(2)] == [1, 2]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy, kept", [
+    (OverflowPolicy.DROP_OLDEST, [2, 3, 4]),
+    (OverflowPolicy.DROP_NEWEST, [0, 1, 2])
+])
+async def test_drop_policies_bound_the_channel(policy, kept):
+    bus = MessageBus()
+    bus.configure("metric_update", maxsize=3, policy=policy)
+    subscription = bus.subscribe(["metric_update"], name="dashboard")
+
+    for index in range(5):
+        await bus.publish(_metric(index))
+
+    assert [subscription.get_nowait().data["index"] for _ in range(3)] == kept
+    gauges = bus.get_metrics()["subscribers"]["dashboard"]["metric_update"]
+    assert (gauges["dropped"], gauges["high_water"], gauges["capacity"]) == (2, 3, 3)
+
+@pytest.mark.asyncio
+async def test_messages_arrive_in_publish_order_across_topics():
+    bus = MessageBus()
+    subscription = bus.subscribe(["a", "b"])
+    for index, topic in enumerate("abba"):
+        await bus.publish(AgentEvent(topic, data={"index": index}))
+
+    received = [subscription.get_nowait() for _ in range(4)]
+
+    assert [message["index"] for message in received] == [0, 1, 2, 3]
+    assert bus.get_metrics()["topics"]["b"]["received"] == 2
+
+@pytest.mark.asyncio
+async def test_closing_ends_iteration():
+    bus = MessageBus()
+    subscription = bus.subscribe(["a"])
+    await bus.publish(AgentEvent("a"))
+
+    async def consume():
+        return [message async for message in subscription]
+
+    consumer = asyncio.ensure_future(consume())
+    await asyncio.sleep(0.01)
+    subscription.close()
+
+    assert len(await asyncio.wait_for(consumer, 1)) == 1
+    assert await bus.publish(AgentEvent("a")) == 0
+
+def test_messages_are_slotted():
+    message = SessionStarted(uuid4(), uuid4(), "analysis")
+
+    with pytest.raises(AttributeError):
+        message.extra = True
+    assert message.to_dict()["agent_type"] == "analysis"
+
+@pytest.mark.asyncio
+async def test_undrained_agent_outbox_stays_bounded():
+    agent = BaseAgent(AgentType.ANALYSIS, "bus_agent")
+
+    for _ in range(OUTBOX_SIZE * 3):
+        context = AgentContext(session_id=uuid4())
+        await agent.start_session(context)
+        await agent.end_session(context.session_id)
+
+    assert agent.message_queue.qsize() <= OUTBOX_SIZE * 2
+
+@pytest.mark.asyncio
+async def test_agents_publish_to_a_shared_bus():
+    bus = MessageBus()
+    errors = bus.subscribe(["agent_error"])
+    agent = BaseAgent(AgentType.ANALYSIS, "bus_agent")
+    agent.attach_bus(bus)
+
+    await agent.handle_error(ValueError("boom"), AgentContext(session_id=uuid4()))
+
+    message = errors.get_nowait()
+    assert (message.error, message.error_count, message.agent_id) == ("boom", 1, agent.id)
+    assert agent.message_queue is None
@@ -0,0 +1,67 @@
+import hashlib
+import pytest
+from agents import parse_cache as parse_cache_module
+from agents.parse_cache import ParseCache, file_sha256
+from agents.pdf_parser_agent import PDFParserAgent, PDFParserAgentConfig
+from agents.result_cache import ResultCache
+
+RECORD = {
+    "diagnoses": ["lumbar strain"],
+    "medications": [{"name": "Ibuprofen", "dosage": "400mg", "frequency": "twice", "route": "oral"}],
+    "medical_history": {"surgeries": [], "conditions": [], "allergies": [], "family_history": []}
+}
+
+def test_file_sha256_matches_hashlib(tmp_path):
+    data = tmp_path / "record.pdf"
+    data.write_bytes(b"%PDF-1.4\n" * 1000)
+    empty = tmp_path / "empty.pdf"
+    empty.write_bytes(b"")
+
+    assert file_sha256(data) == hashlib.sha256(data.read_bytes()).hexdigest()
+    assert file_sha256(empty) == hashlib.sha256(b"").hexdigest()
+
+def test_parser_version_is_part_of_key(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+    cache.set("abc", RECORD)
+    assert cache.get("abc") == RECORD
+
+    monkeypatch.setattr(parse_cache_module, "PARSER_VERSION", "next")
+
+    assert ParseCache(tmp_path).get("abc") is None
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(max_entries=1, disk_dir=tmp_path, max_disk_bytes=1)
+    cache.set("aa-first", "x" * 100)
+    cache.set("bb-second", "y" * 100)
+
+    # Only the newest entry survives a budget smaller than two entries
+    assert "aa-first" not in cache
+    assert "bb-second" in cache
+    assert cache.stats.evictions >= 1
+    assert cache.get_metrics()["disk_bytes"] == (tmp_path / "bb" / "bb-second.pickle").stat().st_size
+
+@pytest.mark.asyncio
+async def test_reupload_served_from_cache(make_pdf, tmp_path, monkeypatch):
+    pages = ["Impression: lumbar strain\n\n", "Ibuprofen 400mg twice oral\n"]
+    original = make_pdf("claim-1.pdf", pages)
+    renamed = tmp_path / "renamed.pdf"
+    renamed.write_bytes(original.read_bytes())
+
+    config = PDFParserAgentConfig(ingestion_workers=1, parse_cache_dir=tmp_path / "cache")
+    agent = PDFParserAgent(config)
+    try:
+        [first] = await agent._parse_medical_records([original])
+
+        async def fail_ingestion(paths):
+            raise AssertionError("cached file was re-extracted")
+            yield  # pragma: no cover
+        monkeypatch.setattr(agent.ingestion, "iter_documents", fail_ingestion)
+
+        [second] = await agent._parse_medical_records([renamed])
+    finally:
+        agent.shutdown()
+
+    assert second["source"] == "renamed.pdf"
+    assert second["medications"] == first["medications"]
+    assert second["diagnoses"] == first["diagnoses"]
+    assert agent.parse_cache.get_metrics()["memory_hits"] == 1
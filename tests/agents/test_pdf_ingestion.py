@@ -0,0 +1,70 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+from agents.base import AgentContext
+from agents.pdf_ingestion import PDFIngestionEngine, extract_page_range, count_pages
+from agents.pdf_parser_agent import PDFParserAgent, PDFParserAgentConfig
+
+@pytest.fixture
+def engine():
+    engine = PDFIngestionEngine(max_workers=2, pages_per_chunk=2)
+    yield engine
+    engine.shutdown()
+
+def test_page_range_extraction(make_pdf):
+    path = make_pdf("record.pdf", ["Page one", "Page two", "Page three"])
+
+    assert count_pages(str(path)) == 3
+    pages = extract_page_range(str(path), 1, 3)
+    assert [p.strip() for p in pages] == ["Page two", "Page three"]
+
+def test_chunk_ranges(engine):
+    assert engine._chunk_ranges(5) == [(0, 2), (2, 4), (4, 5)]
+    assert engine._chunk_ranges(0) == []
+
+@pytest.mark.asyncio
+async def test_documents_stream_in_order(make_pdf, engine):
+    paths = [make_pdf(f"doc{i}.pdf", [f"Document {i}"]) for i in range(5)]
+
+    documents = [doc async for doc in engine.iter_documents(paths)]
+
+    assert [doc.path for doc in documents] == paths
+    assert [doc.text.strip() for doc in documents] == [f"Document {i}" for i in range(5)]
+
+@pytest.mark.asyncio
+async def test_large_files_are_chunked_in_page_order(make_pdf):
+    path = make_pdf("large.pdf", [f"Page {i}" for i in range(7)])
+    engine = PDFIngestionEngine(
+        pages_per_chunk=3,
+        large_file_bytes=0,
+        executor=ThreadPoolExecutor(max_workers=3)
+    )
+
+    document = await engine.extract(path)
+
+    assert [p.strip() for p in document.pages] == [f"Page {i}" for i in range(7)]
+
+@pytest.mark.asyncio
+async def test_unreadable_file_reports_error(tmp_path, engine):
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"not a pdf")
+
+    document = await engine.extract(path)
+
+    assert document.error is not None
+    assert document.pages == []
+
+@pytest.mark.asyncio
+async def test_agent_parses_records_through_pool(make_pdf, tmp_path):
+    good = make_pdf("good.pdf", ["Current medications", "Naproxen 500mg twice oral"])
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    agent = PDFParserAgent(PDFParserAgentConfig(ingestion_workers=2))
+
+    try:
+        medical_data = await agent._parse_medical_records([broken, good])
+    finally:
+        agent.shutdown()
+
+    assert [record["source"] for record in medical_data] == ["good.pdf"]
+    assert medical_data[0]["medications"][0]["dosage"] == "500mg"
@@ -0,0 +1,88 @@
+import asyncio
+import time
+import pytest
+from agents.pdf_rendering import PDFRenderService, RenderTimeout, init_worker, render_html
+
+# Render functions run in worker processes, so they must be module-level
+
+def fake_render(html_content):
+    if html_content.startswith("sleep:"):
+        time.sleep(float(html_content[6:]))
+    if html_content == "fail":
+        raise ValueError("bad markup")
+    return f"%PDF {html_content}".encode()
+
+def fake_render_file(path):
+    with open(path, encoding="utf-8") as file:
+        return fake_render(file.read())
+
+@pytest.fixture
+def service():
+    service = PDFRenderService(
+        max_workers=2, max_pending=4, timeout=5,
+        render_function=fake_render, file_render_function=fake_render_file
+    )
+    yield service
+    service.shutdown()
+
+@pytest.mark.asyncio
+async def test_renders_in_order(service):
+    results = await asyncio.gather(*[service.render(f"page {index}") for index in range(8)])
+
+    assert results == [f"%PDF page {index}".encode() for index in range(8)]
+    assert service.get_metrics()["completed"] == 8
+
+@pytest.mark.asyncio
+async def test_streamed_document_is_spooled_for_the_worker(service, tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+
+    result = await service.render_document(iter(["<html>", "<p>é</p>", "</html>"]))
+
+    assert result == "%PDF <html><p>é</p></html>".encode()
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.asyncio
+async def test_pending_renders_are_bounded(service):
+    tasks = [asyncio.ensure_future(service.render("sleep:0.2")) for _ in range(12)]
+    await asyncio.sleep(0.1)
+
+    # Only max_pending renders are submitted; the other callers wait their turn
+    metrics = service.get_metrics()
+    assert metrics["pending"] == 12
+    assert metrics["running"] == service.max_pending
+
+    await asyncio.gather(*tasks)
+    assert service.get_metrics()["pending"] == 0
+
+@pytest.mark.asyncio
+async def test_timeout_restarts_pool_and_retries_other_jobs(service):
+    slow = asyncio.ensure_future(service.render("sleep:30", timeout=0.5))
+    other = asyncio.ensure_future(service.render("sleep:1"))
+
+    with pytest.raises(RenderTimeout):
+        await slow
+    assert await other == b"%PDF sleep:1"
+
+    metrics = service.get_metrics()
+    assert metrics["timeouts"] == 1
+    assert metrics["restarts"] == 1
+    assert await service.render("after restart") == b"%PDF after restart"
+
+@pytest.mark.asyncio
+async def test_render_errors_propagate(service):
+    with pytest.raises(ValueError, match="bad markup"):
+        await service.render("fail")
+
+    assert service.get_metrics()["failed"] == 1
+
+def test_missing_weasyprint_fails_each_render():
+    try:
+        import weasyprint  # noqa: F401
+        pytest.skip("WeasyPrint is installed")
+    except ImportError:
+        pass
+
+    init_worker(None)
+
+    with pytest.raises(RuntimeError, match="WeasyPrint is required"):
+        render_html("<p>report</p>")
@@ -0,0 +1,122 @@
+import asyncio
+import time
+import pytest
+from agents.pipeline import LatencyHistogram, Pipeline, Stage
+
+def _stage(name, delay=0.0, log=None, workers=1, queue_size=100):
+    async def handler(item):
+        if log is not None:
+            log.append((name, "start", time.monotonic()))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append((name, "end", time.monotonic()))
+        return item
+    return Stage(name, handler, workers, queue_size)
+
+async def _run_all(pipeline, items):
+    try:
+        futures = [await pipeline.submit(item) for item in items]
+        return await asyncio.gather(*futures)
+    finally:
+        await pipeline.shutdown()
+
+@pytest.mark.asyncio
+async def test_stages_overlap_across_sessions():
+    log = []
+    pipeline = Pipeline([_stage(name, 0.02, log) for name in ("documentation", "analysis", "report")])
+
+    start = time.perf_counter()
+    assert await _run_all(pipeline, range(6)) == list(range(6))
+    elapsed = time.perf_counter() - start
+
+    # Serial would take 6 x 3 x 20ms; pipelined is about (6 + 2) x 20ms
+    assert elapsed < 0.3
+    first_report = min(at for name, event, at in log if name == "report" and event == "start")
+    last_documentation = max(at for name, event, at in log if name == "documentation" and event == "end")
+    assert first_report < last_documentation
+
+@pytest.mark.asyncio
+async def test_throughput_scales_with_stage_workers():
+    async def run(workers):
+        pipeline = Pipeline([_stage(name, 0.01, workers=workers) for name in ("a", "b")])
+        start = time.perf_counter()
+        await _run_all(pipeline, range(40))
+        return time.perf_counter() - start
+
+    single, quad = await run(1), await run(4)
+
+    assert single > 0.4
+    assert quad < single / 2.5
+
+@pytest.mark.asyncio
+async def test_bounded_queue_blocks_submitters():
+    release = asyncio.Event()
+
+    async def slow(item):
+        await release.wait()
+        return item
+
+    pipeline = Pipeline([Stage("slow", slow, workers=1, queue_size=2)])
+    try:
+        futures = [await pipeline.submit(index) for index in range(3)]  # One running, two queued
+        blocked = asyncio.ensure_future(pipeline.submit(3))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        assert pipeline.get_metrics()["stages"]["slow"]["queued"] == 2
+
+        release.set()
+        futures.append(await asyncio.wait_for(blocked, 1))
+        assert await asyncio.gather(*futures) == [0, 1, 2, 3]
+    finally:
+        await pipeline.shutdown()
+
+@pytest.mark.asyncio
+async def test_failures_and_early_exits():
+    async def document(item):
+        if item == "bad":
+            raise ValueError("bad session")
+        return None if item == "started" else item
+
+    pipeline = Pipeline([Stage("documentation", document), _stage("report")])
+    try:
+        with pytest.raises(ValueError, match="bad session"):
+            await pipeline.process("bad")
+        assert await pipeline.process("started") is None
+        assert await pipeline.process("completed") == "completed"
+        metrics = pipeline.get_metrics()
+    finally:
+        await pipeline.shutdown()
+
+    assert (metrics["completed"], metrics["dropped"]) == (1, 1)
+    assert metrics["stages"]["documentation"]["failed"] == 1
+    assert metrics["stages"]["report"]["processed"] == 1
+
+@pytest.mark.asyncio
+async def test_latency_histograms_per_stage():
+    pipeline = Pipeline([_stage("fast", 0.0), _stage("slow", 0.03)])
+    pipeline.start()
+    try:
+        await asyncio.gather(*[pipeline.process(index) for index in range(3)])
+        metrics = pipeline.get_metrics()
+    finally:
+        await pipeline.shutdown()
+
+    slow = metrics["stages"]["slow"]
+    assert slow["service"]["count"] == 3
+    assert slow["service"]["p50_ms"] == 50  # 30ms falls in the 20-50ms bucket
+    assert metrics["stages"]["fast"]["service"]["p99_ms"] <= 5
+    assert metrics["end_to_end"]["max_ms"] >= 85  # The last session waited for two ahead of it
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for milliseconds in [1] * 90 + [300] * 9 + [120000]:
+        histogram.record(milliseconds / 1000)
+
+    assert histogram.percentile(0.5) == 1
+    assert histogram.percentile(0.95) == 500
+    assert histogram.percentile(1.0) == pytest.approx(120000)
+    assert histogram.to_dict()["buckets"]["inf"] == 1
+
+def test_stage_names_must_be_unique():
+    with pytest.raises(ValueError):
+        Pipeline([_stage("a"), _stage("a")])
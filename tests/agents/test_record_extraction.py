@@ -0,0 +1,98 @@
+import pytest
+from agents.pdf_ingestion import iter_page_texts
+from agents.pdf_parser_agent import PDFParserAgent, PDFParserAgentConfig
+from agents.record_extraction import StreamingRecordExtractor, extract_record, extract_record_pages
+
+def _normalized(record):
+    record = dict(record)
+    record["diagnoses"] = sorted(record["diagnoses"])
+    return record
+
+@pytest.fixture
+def sample_pages():
+    return [
+        "Patient seen in clinic\nAcetaminophen 500mg daily oral\n",
+        "Surgical History:\nAppendectomy 2019\n\nDiagnosis:",
+        "\nLumbar strain\n\nIbuprofen 400mg twice oral\n",
+        "Allergies:\nPenicillin\n\nImpression: chronic pain\n\n",
+        "Naproxen 250mg nightly oral\nFamily History: diabetes",
+    ]
+
+@pytest.mark.parametrize("window_pages", [2, 3, 8])
+def test_streaming_matches_whole_document(sample_pages, window_pages):
+    extractor = StreamingRecordExtractor(window_pages=window_pages)
+    for page in sample_pages:
+        extractor.feed(page)
+
+    streamed = extractor.finish()
+
+    assert _normalized(streamed) == _normalized(extract_record("".join(sample_pages)))
+
+def test_entry_split_across_page_boundary(sample_pages):
+    extractor = StreamingRecordExtractor(window_pages=2)
+    for page in sample_pages:
+        extractor.feed(page)
+
+    record = extractor.finish()
+
+    # "Diagnosis:" ends page 2 and its body starts page 3
+    assert "Lumbar strain" in record["diagnoses"]
+    assert record["medical_history"]["surgeries"] == ["Appendectomy 2019"]
+    assert record["medical_history"]["family_history"] == ["diabetes"]
+
+def test_memory_bounded_by_window():
+    extractor = StreamingRecordExtractor(window_pages=4)
+    for index in range(1000):
+        extractor.feed(f"Page {index}\nImpression: finding {index}\n\n")
+        assert len(extractor._pages) < 4
+
+    record = extractor.finish()
+
+    assert extractor.pages_seen == 1000
+    assert len(record["diagnoses"]) == 1000
+    assert "finding 999" in record["diagnoses"]
+
+def test_every_diagnosis_section_first_history_section():
+    text = (
+        "Diagnosis: lumbar strain\n\n"
+        "Allergies: penicillin\n\n"
+        "Assessment:\nsciatica\n"
+        "Allergies: latex\n"
+        "Impression: chronic pain\n\n"
+        "Follow-up Diagnosis: not a heading\n"
+    )
+
+    record = extract_record(text)
+
+    assert sorted(record["diagnoses"]) == ["chronic pain", "lumbar strain", "sciatica"]
+    assert record["medical_history"]["allergies"] == ["penicillin"]
+
+def test_one_heading_scan_per_window():
+    extractor = StreamingRecordExtractor(window_pages=8)
+    for index in range(400):
+        extractor.feed(f"Visit {index}\nImpression: finding {index}\n\nSurgical History: none\n\n")
+
+    record = extractor.finish()
+
+    assert len(record["diagnoses"]) == 400
+    # One scan per window (8/7 of the text with the overlap) plus the
+    # section bodies, instead of one scan per heading pattern
+    assert extractor.passes < 1.5
+
+@pytest.mark.asyncio
+async def test_agent_streaming_mode(make_pdf, sample_pages):
+    path = make_pdf("record.pdf", sample_pages)
+    config = PDFParserAgentConfig(
+        ingestion_workers=2, pages_per_chunk=2, streaming=True, window_pages=2
+    )
+    agent = PDFParserAgent(config)
+
+    try:
+        [streamed] = await agent._parse_medical_records([path])
+    finally:
+        agent.shutdown()
+
+    whole = extract_record_pages(list(iter_page_texts(str(path))))
+    assert sorted(streamed["diagnoses"]) == sorted(whole["diagnoses"])
+    assert streamed["medications"] == whole["medications"]
+    assert streamed["medical_history"] == whole["medical_history"]
@@ -0,0 +1,73 @@
+import json
+from uuid import uuid4
+import pytest
+from agents.base import AgentContext
+from agents.documentation_agent import DocumentationAgent, DocumentationAgentConfig
+from agents.report_batch import BatchCheckpoint
+
+def _jobs(count, template_id="progress"):
+    return [({"id": str(uuid4()), "client": index}, {"id": str(uuid4())}, template_id) for index in range(count)]
+
+@pytest.fixture
+def agent(tmp_path):
+    template_dir = tmp_path / "templates"
+    template_dir.mkdir()
+    (template_dir / "progress.jinja2").write_text("Progress report {{ assessment.client }}")
+    agent = DocumentationAgent(DocumentationAgentConfig(
+        template_dir=template_dir, output_dir=tmp_path / "reports", bulk_concurrency=4
+    ))
+    agent.pdf_generator.render_service.start = lambda: None
+    agent.rendered = []
+
+    async def generate_pdf(report, chunks=None):
+        body = "".join(chunks)
+        if body in agent.fail_bodies:
+            raise RuntimeError("render worker died")
+        agent.rendered.append(body)
+        return body.encode()
+
+    agent.fail_bodies = set()
+    agent.pdf_generator.generate_pdf = generate_pdf
+    yield agent
+    agent.shutdown()
+
+@pytest.mark.asyncio
+async def test_bulk_generates_every_report(agent):
+    updates = []
+
+    result = await agent.generate_bulk(
+        AgentContext(session_id=uuid4()), _jobs(10), batch_id="march",
+        progress=lambda state: updates.append(state.completed)
+    )
+
+    assert result.progress.completed == 10
+    assert result.failures == []
+    assert len(result.reports) == 10
+    assert sorted(updates) == list(range(1, 11))
+    assert agent.template_manager.compile_count == 1
+    assert not agent.active_contexts
+
+@pytest.mark.asyncio
+async def test_interrupted_batch_resumes(agent):
+    jobs = _jobs(5)
+    agent.fail_bodies = {"Progress report 3"}
+
+    first = await agent.generate_bulk(AgentContext(session_id=uuid4()), jobs, batch_id="march")
+    assert (first.progress.completed, first.progress.failed) == (4, 1)
+    assert first.failures[0]["error"] == "render worker died"
+
+    agent.fail_bodies = set()
+    agent.rendered.clear()
+    second = await agent.generate_bulk(AgentContext(session_id=uuid4()), jobs, batch_id="march")
+
+    assert (second.progress.skipped, second.progress.completed, second.progress.remaining) == (4, 1, 0)
+    assert agent.rendered == ["Progress report 3"]
+
+def test_checkpoint_ignores_torn_line(tmp_path):
+    path = tmp_path / "batch.jsonl"
+    path.write_text(json.dumps({"key": "a"}) + "\n" + '{"key": "b", "rep')
+    checkpoint = BatchCheckpoint(path)
+
+    assert set(checkpoint.load()) == {"a"}
+    checkpoint.record({"key": "c"})
+    assert set(BatchCheckpoint(path).load()) == {"a", "c"}
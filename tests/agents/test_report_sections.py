@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+from agents.documentation_agent import ContentGenerator, Template, TemplateManager
+from agents.report_sections import SECTION_RENDERERS, FragmentLibrary, SectionRegistry
+
+SECTIONS = [
+    {"id": "summary", "type": "summary", "title": "Executive Summary"},
+    {"id": "assessment", "type": "assessment", "subsections": ["mobility"],
+     "boilerplate": "Findings from the in-home visit."},
+    {"id": "recommendations", "type": "recommendations", "tables": ["scale"]}
+]
+METADATA = {
+    "name": "Progress Report",
+    "footer": "Confidential",
+    "tables": {"scale": {"columns": ["Score", "Meaning"], "rows": [[1, "Dependent"], [5, "Independent"]]}}
+}
+
+def test_library_streams_sections_between_static_fragments():
+    library = FragmentLibrary("Progress Report", SECTIONS, METADATA)
+
+    html = "".join(library.iter_html({"summary": "<p>S</p>", "recommendations": "<ol></ol>"}))
+
+    assert html.startswith('<!DOCTYPE html>') and html.endswith("<footer>Confidential</footer></body></html>")
+    assert html.index("<h2>Executive Summary</h2><p>S</p>") < html.index("<h2>Assessment</h2>")
+    assert "<h2>Assessment</h2><p>Findings from the in-home visit.</p></section>" in html
+    assert "<ol></ol><table><thead><tr><th>Score</th><th>Meaning</th></tr></thead>" in html
+
+def test_identical_fragments_are_shared_across_templates():
+    first = FragmentLibrary("Progress Report", SECTIONS, METADATA)
+    second = FragmentLibrary("Progress Report", SECTIONS, METADATA)
+
+    assert first.head is second.head
+    assert first.closings["recommendations"] is second.closings["recommendations"]
+
+def test_renderers_are_bound_once_per_template():
+    template = Template(id="progress", content="", sections=SECTIONS, metadata=METADATA)
+
+    library = template.fragment_library()
+
+    assert template.fragment_library() is library
+    html = library.renderers["assessment"]({"mobility": {"transfers": "Independent"}, "notes": "x"}, {})
+    assert html == "<h3>Mobility</h3><dl><dt>Transfers</dt><dd>Independent</dd></dl>"
+
+def test_renderers_escape_data():
+    html = SECTION_RENDERERS.renderer("recommendations")(
+        {}, {}, {"recommendations": ["Install <b>rails</b>", {"description": "Bath seat", "priority": "high"}]}
+    )
+
+    assert html == "<ol><li>Install &lt;b&gt;rails&lt;/b&gt;</li><li>Bath seat <em>(high priority)</em></li></ol>"
+
+def test_unknown_section_type():
+    with pytest.raises(ValueError, match="Unknown section type: chart"):
+        SectionRegistry().bind({"id": "chart", "type": "chart"})
+
+@pytest.mark.asyncio
+async def test_generator_uses_registered_renderers():
+    generator = ContentGenerator(concurrency=2)
+
+    try:
+        sections = await generator.generate_sections(
+            SECTIONS[:1], {"client_name": "Jane Roe"}, {"risk_level": "low", "id": "a1"}
+        )
+    finally:
+        generator.shutdown()
+
+    assert sections == {"summary": "<dl><dt>Client</dt><dd>Jane Roe</dd><dt>Risk level</dt><dd>low</dd></dl>"}
+
+@pytest.mark.asyncio
+async def test_default_template_streams_the_whole_document():
+    manager = TemplateManager(Path(__file__).parents[2] / "templates")
+    template = await manager.get_template("default")
+
+    html = "".join(template.stream(
+        {"client_name": "Jane <Roe>", "therapist_name": "Sam Lee"},
+        {},
+        {"summary": "<p>S</p>", "recommendations": "<ol></ol>"}
+    ))
+
+    assert html.startswith("<!DOCTYPE html>") and html.rstrip().endswith("</body></html>")
+    assert "<p>Name: Jane &lt;Roe&gt;</p>" in html
+    assert html.index("Client Information") < html.index("<p>S</p>") < html.index("<ol></ol>")
+    assert html.index("<ol></ol>") < html.index("<p>No additional notes.</p>")
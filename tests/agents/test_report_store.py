@@ -0,0 +1,95 @@
+import asyncio
+import hashlib
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+import pytest
+from agents.documentation_agent import (
+    DocumentationAgent, DocumentationAgentConfig, Report, ReportContent
+)
+from agents.report_store import ReportStore
+
+PDF = b"%PDF-1.7\n" + bytes(range(256)) * 8192
+
+@pytest.mark.asyncio
+async def test_identical_content_is_stored_once(tmp_path):
+    store = ReportStore(tmp_path)
+
+    first = await store.put(PDF)
+    second = await store.put(PDF)
+
+    assert first.sha256 == second.sha256 == hashlib.sha256(PDF).hexdigest()
+    assert (first.created, second.created) == (True, False)
+    assert first.path.read_bytes() == PDF
+    assert [path.name for path in tmp_path.rglob("*") if path.is_file()] == [first.sha256]
+
+@pytest.mark.asyncio
+async def test_streams_are_hashed_as_written(tmp_path):
+    store = ReportStore(tmp_path)
+
+    async def chunks():
+        for start in range(0, len(PDF), 65536):
+            yield PDF[start:start + 65536]
+
+    streamed = await store.put(chunks())
+
+    assert streamed.sha256 == hashlib.sha256(PDF).hexdigest()
+    assert streamed.size == len(PDF)
+    assert (await store.put(iter([PDF]))).created is False
+
+@pytest.mark.asyncio
+async def test_failed_stream_leaves_nothing_behind(tmp_path):
+    store = ReportStore(tmp_path)
+
+    def chunks():
+        yield PDF[:1024]
+        raise OSError("upstream closed")
+
+    with pytest.raises(OSError):
+        await store.put(chunks())
+
+    assert list(tmp_path.rglob("*")) == []
+
+def test_rejects_non_digest_names(tmp_path):
+    with pytest.raises(ValueError, match="Invalid blob digest"):
+        ReportStore(tmp_path).path("../../etc/passwd")
+
+class RecordingDatabase:
+    def __init__(self):
+        self.rows = []
+
+    def add_report_document(self, assessment_id, content_sha256, size_bytes, file_path, metadata):
+        self.rows.append((assessment_id, content_sha256, size_bytes, file_path, metadata))
+        return SimpleNamespace(version=f"{len(self.rows)}.0")
+
+@pytest.mark.asyncio
+async def test_save_report_records_blob(tmp_path):
+    database = RecordingDatabase()
+    agent = DocumentationAgent(
+        DocumentationAgentConfig(template_dir=tmp_path, output_dir=tmp_path / "reports"),
+        database=database
+    )
+    report = Report(
+        id=uuid4(),
+        content=ReportContent(sections={"summary": "..."}, metadata={"template_id": "default"}),
+        template_id="default",
+        created_at=datetime.utcnow(),
+        version="1.0",
+        assessment_id=uuid4(),
+        analysis_id=uuid4()
+    )
+
+    try:
+        await agent._save_report(report, PDF)
+        await agent._save_report(report, PDF)
+    finally:
+        agent.shutdown()
+
+    digest = hashlib.sha256(PDF).hexdigest()
+    assert report.content.metadata["pdf_sha256"] == digest
+    assert len(database.rows) == 2
+    assessment_id, sha256, size, file_path, metadata = database.rows[0]
+    assert (assessment_id, sha256, size) == (report.assessment_id, digest, len(PDF))
+    assert file_path == str(agent.report_store.path(digest))
+    assert metadata["sections"] == ["summary"]
+    assert database.rows[1][3] == file_path
@@ -0,0 +1,101 @@
+import pytest
+from datetime import datetime, timedelta
+from uuid import uuid4
+from agents.analysis_agent import AnalysisAgent
+from agents.analysis_history import HistoryPoint
+from agents.base import AgentContext
+from agents.result_cache import ResultCache, content_hash
+
+@pytest.fixture
+def sample_assessment_data():
+    return {
+        "id": uuid4(),
+        "client_id": uuid4(),
+        "functional_changes": {
+            "adl_changes": [{"activity": "mobility outdoors"}]
+        },
+        "risk_factors": [{"type": "physical", "severity": "high"}],
+        "metrics": {"functional_status": {"independent": 0.4, "unable": 0.2}}
+    }
+
+def test_content_hash_is_canonical():
+    client_id = uuid4()
+    first = {"b": [1, 2], "a": {"when": datetime(2025, 1, 1), "client": client_id}}
+    second = {"a": {"client": client_id, "when": datetime(2025, 1, 1)}, "b": [1, 2]}
+
+    assert content_hash(first, "analysis", "1.0") == content_hash(second, "analysis", "1.0")
+    assert content_hash(first, "analysis", "1.0") != content_hash(first, "analysis", "1.1")
+    assert content_hash(first, "analysis", "1.0") != content_hash(first, "assessment", "1.0")
+
+def test_lru_eviction_and_metrics():
+    cache = ResultCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    metrics = cache.get_metrics()
+    assert metrics["memory_hits"] == 3
+    assert metrics["misses"] == 1
+    assert metrics["evictions"] == 1
+
+def test_cached_values_are_isolated():
+    cache = ResultCache()
+    value = {"items": [1]}
+    cache.set("key", value)
+    value["items"].append(2)
+    cache.get("key")["items"].append(3)
+
+    assert cache.get("key") == {"items": [1]}
+
+def test_disk_tier_survives_memory_loss(tmp_path):
+    cache = ResultCache(max_entries=1, disk_dir=tmp_path)
+    cache.set("0123abcd", {"risk_score": 4.2})
+    cache.clear()
+
+    assert cache.get("0123abcd") == {"risk_score": 4.2}
+    assert cache.stats.disk_hits == 1
+
+    fresh = ResultCache(disk_dir=tmp_path)
+    assert "0123abcd" in fresh
+    fresh.invalidate("0123abcd")
+    assert fresh.get("0123abcd") is None
+
+@pytest.mark.asyncio
+async def test_analysis_retry_skips_work(sample_assessment_data):
+    agent = AnalysisAgent()
+    context = AgentContext(session_id=uuid4(), user_id=uuid4())
+
+    first = await agent.analyze_assessment(sample_assessment_data, context)
+    second = await agent.analyze_assessment(dict(sample_assessment_data), context)
+
+    assert second.risk_score == first.risk_score
+    assert second.recommendations == first.recommendations
+    assert agent.result_cache.stats.memory_hits == 1
+    # A retry of the same assessment adds no history point
+    assert len(agent.history) == 1
+
+    sample_assessment_data["risk_factors"] = []
+    third = await agent.analyze_assessment(sample_assessment_data, context)
+    assert third.risk_score != first.risk_score
+    assert len(agent.history) == 1
+
+@pytest.mark.asyncio
+async def test_analysis_cache_hit_uses_current_history(sample_assessment_data):
+    agent = AnalysisAgent()
+    context = AgentContext(session_id=uuid4(), user_id=uuid4())
+    client_id = sample_assessment_data["client_id"]
+
+    first = await agent.analyze_assessment(sample_assessment_data, context)
+    assert first.insights["functional_impact"]["trends"]["risk_trajectory"] == "stable"
+
+    # History recorded since (here: a much lower earlier score) changes the trend
+    agent.history.record(client_id, HistoryPoint(datetime.utcnow() - timedelta(days=60), 0.0, 1, 0, 1))
+    second = await agent.analyze_assessment(sample_assessment_data, context)
+
+    assert agent.result_cache.stats.memory_hits == 1
+    assert second.insights["functional_impact"]["trends"]["risk_trajectory"] == "escalating"
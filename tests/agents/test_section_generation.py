@@ -0,0 +1,162 @@
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from agents.documentation_agent import ContentGenerator
+from agents.result_cache import ResultCache
+
+class SlowGenerator(ContentGenerator):
+    """Sections that block for a configurable time and record their thread"""
+
+    def __init__(self, delays, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = delays
+        self.threads = {}
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _section_builder(self, section_config, assessment_data, analysis_results):
+        def build():
+            with self._lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            time.sleep(self.delays.get(section_config['id'], 0.05))
+            self.threads[section_config['id']] = threading.current_thread().name
+            with self._lock:
+                self.running -= 1
+            return f"content of {section_config['id']}"
+        return build
+
+def _sections(count, section_type="analysis"):
+    return [{"id": f"section_{index}", "type": section_type} for index in range(count)]
+
+@pytest.mark.asyncio
+async def test_latency_approaches_slowest_section():
+    sections = _sections(20)
+    delays = {section["id"]: 0.05 for section in sections}
+    delays["section_7"] = 0.2
+    generator = SlowGenerator(delays, concurrency=20)
+
+    try:
+        start = time.perf_counter()
+        result = await generator.generate_sections(sections, {}, {})
+        elapsed = time.perf_counter() - start
+    finally:
+        generator.shutdown()
+
+    # Sequential generation would take 1.15s
+    assert elapsed < 0.5
+    assert list(result) == [section["id"] for section in sections]
+    assert result["section_7"] == "content of section_7"
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    generator = SlowGenerator({}, concurrency=3, max_workers=10)
+
+    try:
+        await generator.generate_sections(_sections(12), {}, {})
+    finally:
+        generator.shutdown()
+
+    assert generator.peak <= 3
+
+@pytest.mark.asyncio
+async def test_inline_sections_stay_on_the_loop():
+    generator = SlowGenerator({}, concurrency=4)
+    sections = [
+        {"id": "summary", "type": "summary"},
+        {"id": "analysis", "type": "analysis"},
+        {"id": "forced", "type": "summary", "threaded": True}
+    ]
+
+    try:
+        await generator.generate_sections(sections, {}, {})
+    finally:
+        generator.shutdown()
+
+    assert generator.threads["summary"] == threading.current_thread().name
+    assert generator.threads["analysis"].startswith("report-section")
+    assert generator.threads["forced"].startswith("report-section")
+
+@pytest.mark.asyncio
+async def test_unknown_section_type_fails_the_report():
+    generator = ContentGenerator(concurrency=2)
+
+    with pytest.raises(ValueError, match="Unknown section type: chart"):
+        await generator.generate_sections(
+            [{"id": "summary", "type": "summary"}, {"id": "chart", "type": "chart"}], {}, {}
+        )
+    generator.shutdown()
+
+class CountingGenerator(ContentGenerator):
+    """Sections whose content reflects their inputs, counting each build"""
+
+    def __init__(self, **kwargs):
+        super().__init__(cache=ResultCache(), **kwargs)
+        self.builds = []
+
+    def _section_builder(self, section_config, assessment_data, analysis_results):
+        def build():
+            self.builds.append(section_config['id'])
+            return f"{section_config['id']}: {assessment_data} {analysis_results}"
+        return build
+
+REPORT_SECTIONS = [
+    {"id": "summary", "type": "summary"},
+    {"id": "mobility", "type": "assessment", "fields": {"assessment": ["mobility"]}},
+    {"id": "adl", "type": "assessment", "fields": {"assessment": ["adl"]}},
+    {"id": "recommendations", "type": "recommendations"}
+]
+
+@pytest.mark.asyncio
+async def test_regeneration_rebuilds_only_changed_sections():
+    generator = CountingGenerator(concurrency=4)
+    assessment = {"mobility": "independent", "adl": "needs help"}
+    analysis = {"risk": "low"}
+
+    try:
+        first = await generator.generate_sections(REPORT_SECTIONS, assessment, analysis)
+        generator.builds.clear()
+        edited = dict(assessment, adl="independent")
+        second = await generator.generate_sections(REPORT_SECTIONS, edited, analysis)
+    finally:
+        generator.shutdown()
+
+    # Only the adl section reads adl
+    assert generator.builds == ["adl"]
+    assert second["summary"] == first["summary"]
+    assert second["mobility"] == first["mobility"]
+    assert second["recommendations"] == first["recommendations"]
+    assert "'adl': 'independent'" in second["adl"]
+
+@pytest.mark.asyncio
+async def test_section_config_is_part_of_the_fingerprint():
+    generator = CountingGenerator()
+
+    await generator.generate_sections([{"id": "summary", "type": "summary"}], {}, {})
+    await generator.generate_sections([{"id": "summary", "type": "summary", "title": "Overview"}], {}, {})
+    await generator.generate_sections([{"id": "summary", "type": "summary"}], {}, {})
+
+    assert generator.builds == ["summary", "summary"]
+
+@pytest.mark.asyncio
+async def test_default_template_sections_read_only_their_own_keys():
+    sections = json.loads((Path(__file__).parents[2] / "templates" / "default.json").read_text())["sections"]
+    generator = CountingGenerator(concurrency=4)
+    assessment = {"client_name": "Jane Roe", "mobility": "independent", "notes": "Stairs at entry"}
+    analysis = {"risk_level": "low", "recommendations": ["Grab bars"]}
+
+    try:
+        await generator.generate_sections(sections, assessment, analysis)
+        generator.builds.clear()
+        await generator.generate_sections(sections, dict(assessment, mobility="walker"), analysis)
+        edited = dict(analysis, recommendations=["Grab bars", "Bath seat"])
+        await generator.generate_sections(sections, dict(assessment, mobility="walker"), edited)
+    finally:
+        generator.shutdown()
+
+    assert generator.builds == ["assessment", "recommendations"]
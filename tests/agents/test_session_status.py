@@ -0,0 +1,56 @@
+from uuid import uuid4
+import pytest
+from agents.message_bus import AgentEvent
+from agents.session_status import DOCUMENTING, IN_PROGRESS, REPORT_READY, SessionStatusProjection
+
+def test_events_move_sessions_along():
+    sessions = SessionStatusProjection()
+    session_id = uuid4()
+    sessions.open(session_id, assessment_type="adl", next_step="step-1")
+
+    sessions.apply(AgentEvent("step_completed", session_id=session_id, data={"next_step": "step-2"}))
+    status = sessions.get(session_id)
+    assert (status["status"], status["assessment"], status["version"]) == (IN_PROGRESS, "step-2", 1)
+
+    sessions.apply(AgentEvent("assessment_completed", session_id=session_id))
+    assert sessions.get(session_id)["status"] == DOCUMENTING
+    assert sessions.get(session_id)["assessment"] is None
+
+    sessions.update(session_id, status=REPORT_READY, report="report")
+    status = sessions.get(session_id)
+    assert (status["status"], status["report"], status["version"]) == (REPORT_READY, "report", 3)
+    assert sessions.record(session_id).terminal
+
+def test_step_events_without_a_next_step_keep_the_current_one():
+    sessions = SessionStatusProjection()
+    session_id = uuid4()
+    sessions.open(session_id, next_step="step-1")
+
+    sessions.apply(AgentEvent("step_completed", session_id=session_id))
+
+    assert sessions.get(session_id)["assessment"] == "step-1"
+
+def test_unrelated_and_unknown_events_are_ignored():
+    sessions = SessionStatusProjection()
+    session_id = uuid4()
+    sessions.open(session_id)
+
+    assert sessions.apply(AgentEvent("metric_update", session_id=session_id)) is None
+    assert sessions.apply(AgentEvent("step_completed", session_id=uuid4())) is None
+    assert sessions.get(session_id)["version"] == 0
+
+def test_batch_status():
+    sessions = SessionStatusProjection()
+    known = [uuid4() for _ in range(3)]
+    for session_id in known:
+        sessions.open(session_id)
+    unknown = uuid4()
+
+    statuses = sessions.get_many(known + [unknown])
+
+    assert [statuses[session_id]["session_id"] for session_id in known] == known
+    assert statuses[unknown] is None
+
+def test_unknown_session_is_invalid():
+    with pytest.raises(ValueError, match="Invalid session ID"):
+        SessionStatusProjection().get(uuid4())
@@ -0,0 +1,149 @@
+import time
+from datetime import datetime
+from uuid import uuid4
+import pytest
+from agents.session_status import IN_PROGRESS, REPORT_READY
+from agents.session_store import SessionStore
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class MemorySpill:
+    def __init__(self):
+        self.rows = {}
+        self.loads = 0
+
+    async def save(self, records):
+        for record in records:
+            self.rows[record["session_id"]] = record
+
+    async def load(self, session_ids):
+        self.loads += 1
+        return {session_id: self.rows[str(session_id)] for session_id in session_ids if str(session_id) in self.rows}
+
+    async def purge(self, updated_before):
+        expired = [key for key, row in self.rows.items()
+                   if datetime.utcfromtimestamp(row["updated_at"]) < updated_before]
+        for key in expired:
+            del self.rows[key]
+        return len(expired)
+
+def _finish(store, session_id):
+    store.open(session_id)
+    store.update(session_id, status=REPORT_READY, report={"summary": "done"})
+
+def test_live_sessions_are_never_evicted():
+    store = SessionStore(max_terminal=2, terminal_ttl=10, clock=Clock())
+    live = [uuid4() for _ in range(5)]
+    for session_id in live:
+        store.open(session_id)
+    for _ in range(5):
+        _finish(store, uuid4())
+
+    assert all(session_id in store for session_id in live)
+    metrics = store.get_metrics()
+    assert (metrics["live"], metrics["terminal"], metrics["evicted"]) == (5, 2, 3)
+
+@pytest.mark.asyncio
+async def test_abandoned_live_sessions_are_spilled_after_idle_ttl():
+    clock = Clock()
+    spill = MemorySpill()
+    store = SessionStore(idle_ttl=600, spill=spill, clock=clock)
+    abandoned, active = uuid4(), uuid4()
+    store.open(abandoned)
+    store.open(active)
+
+    clock.now = 500
+    store.update(active, next_step="mobility")
+    clock.now = 700
+    assert store.sweep() == 1
+    assert abandoned not in store and active in store
+
+    await store.flush()
+    assert (await store.lookup(abandoned))["status"] == IN_PROGRESS
+    metrics = store.get_metrics()
+    assert (metrics["live"], metrics["abandoned"]) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_spilled_statuses_are_purged_after_retention():
+    spill = MemorySpill()
+    store = SessionStore(max_terminal=2, spill=spill, clock=Clock(), spill_retention=3600)
+    old, recent = uuid4(), uuid4()
+    for session_id in (old, recent, uuid4(), uuid4()):
+        _finish(store, session_id)
+    await store.flush()
+    spill.rows[str(old)]["updated_at"] = time.time() - 7200
+
+    assert await store.purge_spilled() == 1
+    assert set(spill.rows) == {str(recent)}
+    assert store.get_metrics()["purged"] == 1
+
+def test_finished_sessions_expire_after_ttl():
+    clock = Clock()
+    store = SessionStore(terminal_ttl=60, clock=clock)
+    stale, recent = uuid4(), uuid4()
+    _finish(store, stale)
+    clock.now = 30
+    _finish(store, recent)
+
+    clock.now = 70
+    assert store.sweep() == 1
+    assert stale not in store and recent in store
+
+def test_lookups_keep_finished_sessions_warm():
+    clock = Clock()
+    store = SessionStore(max_terminal=2, terminal_ttl=60, clock=clock)
+    polled, other = uuid4(), uuid4()
+    _finish(store, polled)
+    _finish(store, other)
+
+    clock.now = 50
+    store.get(polled)
+    _finish(store, uuid4())  # Over the limit: the least recently used goes
+    clock.now = 100
+
+    assert store.sweep() == 0
+    assert polled in store and other not in store
+
+@pytest.mark.asyncio
+async def test_evicted_sessions_are_served_from_the_spill():
+    spill = MemorySpill()
+    store = SessionStore(max_terminal=1, spill=spill, clock=Clock())
+    first, second = uuid4(), uuid4()
+    _finish(store, first)
+    _finish(store, second)
+
+    # Queued but not yet flushed
+    assert (await store.lookup(first))["status"] == REPORT_READY
+    assert spill.loads == 0
+
+    assert await store.flush() == 1
+    statuses = await store.lookup_many([first, second, uuid4()])
+
+    assert statuses[first]["report"] == {"summary": "done"}
+    assert statuses[first]["session_id"] == str(first)
+    assert statuses[second]["session_id"] == second
+    assert spill.loads == 1
+    metrics = store.get_metrics()
+    assert (metrics["spilled"], metrics["spill_hits"], metrics["spill_misses"], metrics["pending_spill"]) == (1, 1, 1, 0)
+
+    with pytest.raises(ValueError, match="Invalid session ID"):
+        await store.lookup(uuid4())
+
+def test_memory_stays_flat_under_sustained_load():
+    clock = Clock()
+    store = SessionStore(max_terminal=100, terminal_ttl=60, clock=clock)
+
+    for index in range(5000):
+        clock.now = index * 0.1
+        _finish(store, uuid4())
+        if index == 999:
+            settled = store.get_metrics()["approx_bytes"]
+
+    metrics = store.get_metrics()
+    assert metrics["sessions"] == 100
+    assert metrics["approx_bytes"] <= settled
@@ -0,0 +1,75 @@
+import json
+import os
+import pytest
+from agents.documentation_agent import TemplateManager
+
+def _write_template(template_dir, template_id, content, sections=()):
+    path = template_dir / f"{template_id}.jinja2"
+    path.write_text(content)
+    path.with_suffix(".json").write_text(json.dumps({"sections": list(sections)}))
+    return path
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+@pytest.mark.asyncio
+async def test_templates_compile_once(tmp_path):
+    _write_template(tmp_path, "default", "Hello {{ name }}", [{"id": "summary", "type": "summary"}])
+    manager = TemplateManager(tmp_path, check_interval=0)
+
+    first = await manager.get_template("default")
+    second = await manager.get_template("default")
+
+    assert first is second
+    assert first.render(name="Ada") == "Hello Ada"
+    assert second.render(name="Grace") == "Hello Grace"
+    assert first.sections == [{"id": "summary", "type": "summary"}]
+    assert manager.compile_count == 1
+
+@pytest.mark.asyncio
+async def test_edited_template_is_recompiled(tmp_path):
+    path = _write_template(tmp_path, "default", "v1")
+    manager = TemplateManager(tmp_path, check_interval=0)
+    assert (await manager.get_template("default")).render() == "v1"
+
+    # Touched without edits: revalidated by content hash, not recompiled
+    _bump_mtime(path)
+    await manager.get_template("default")
+    assert manager.compile_count == 1
+
+    path.write_text("v2")
+    _bump_mtime(path)
+
+    assert (await manager.get_template("default")).render() == "v2"
+    assert manager.compile_count == 2
+
+@pytest.mark.asyncio
+async def test_check_interval_skips_stat(tmp_path):
+    path = _write_template(tmp_path, "default", "v1")
+    manager = TemplateManager(tmp_path, check_interval=3600)
+    await manager.get_template("default")
+
+    path.write_text("v2")
+    _bump_mtime(path)
+
+    assert (await manager.get_template("default")).render() == "v1"
+
+@pytest.mark.asyncio
+async def test_preload(tmp_path):
+    _write_template(tmp_path, "default", "a")
+    _write_template(tmp_path, "brief", "b")
+    manager = TemplateManager(tmp_path)
+
+    assert await manager.preload() == ["brief", "default"]
+    assert set(manager.template_cache) == {"brief", "default"}
+    assert manager.compile_count == 2
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("template_id", ["missing", "../default", ""])
+async def test_unknown_templates(tmp_path, template_id):
+    _write_template(tmp_path, "default", "a")
+    manager = TemplateManager(tmp_path)
+
+    with pytest.raises(ValueError, match="Template not found"):
+        await manager.get_template(template_id)
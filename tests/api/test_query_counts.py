@@ -0,0 +1,286 @@
+"""Database round trips per API call and per loading profile.
+
+Statements are counted at the DBAPI cursor, so a lazy load or an N+1 loop
+shows up as extra round trips. Runs against a file-backed SQLite database
+(aiosqlite).
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import InvalidRequestError
+
+from api.container import AppContainer
+from api.router import router
+from database.engine import create_database_engine
+from database.models import AssessmentStatus
+from database.queries import FULL, SUMMARY, WITH_LATEST_STAGE, caseload_slopes_query
+
+ASSESSMENTS = 12
+STAGES = ("analysis", "documentation")  # After each assessment's intake stage
+
+class QueryCounter:
+    """Counts statements sent to the database by an engine"""
+
+    def __init__(self, engine):
+        self.statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._executed)
+
+    def _executed(self, connection, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+class StubCoordinator:
+    """Stands in for the agent coordinator, which these tests do not exercise"""
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def cancel_assessment(self, assessment_id):
+        pass
+
+class RegrSlope:
+    """SQLite stand-in for PostgreSQL's regr_slope(y, x) aggregate"""
+
+    def __init__(self):
+        self.points = []
+
+    def step(self, y, x):
+        if y is not None and x is not None:
+            self.points.append((x, y))
+
+    def finalize(self):
+        n = len(self.points)
+        mean_x = sum(x for x, _ in self.points) / n if n else 0.0
+        mean_y = sum(y for _, y in self.points) / n if n else 0.0
+        sxx = sum((x - mean_x) ** 2 for x, _ in self.points)
+        sxy = sum((x - mean_x) * (y - mean_y) for x, y in self.points)
+        return sxy / sxx if sxx else None
+
+@asynccontextmanager
+async def seeded_api(tmp_path):
+    """API client over seeded assessments, with a counter on its engine"""
+    engine = create_database_engine(f"sqlite+aiosqlite:///{tmp_path / 'api.db'}")
+    container = await AppContainer.create(
+        engine=engine, coordinator_factory=StubCoordinator, start_queue=False
+    )
+    db = container.database
+    await db.create_tables()
+
+    client = await db.create_client("query-client", "Query", "Client", datetime(1980, 1, 1), {})
+    therapist = await db.create_therapist("query-therapist", "Query", "Therapist", {}, [], {})
+    ids = []
+    for _ in range(ASSESSMENTS):
+        assessment = await db.create_assessment(client.id, therapist.id, "initial")
+        for stage_type in STAGES:
+            await db.create_assessment_stage(assessment.id, stage_type)
+        await db.add_assessment_document(assessment.id, "intake_form", "/forms/intake.pdf")
+        ids.append(assessment.id)
+
+    app = FastAPI()
+    app.include_router(router)
+    app.state.container = container
+    counter = QueryCounter(engine)
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            yield http, container, counter, ids
+    finally:
+        await container.dispose()
+
+@pytest.mark.asyncio
+async def test_get_assessment_round_trips(tmp_path):
+    async with seeded_api(tmp_path) as (http, container, counter, ids):
+        response = await http.get(f"/assessments/{ids[0]}")
+
+        assert response.status_code == 200
+        assert counter.count == 1
+
+@pytest.mark.asyncio
+async def test_list_assessments_round_trips_independent_of_page_size(tmp_path):
+    async with seeded_api(tmp_path) as (http, container, counter, ids):
+        for limit in (1, ASSESSMENTS):
+            counter.reset()
+            response = await http.get("/assessments", params={"limit": limit})
+
+            assert response.status_code == 200
+            assert len(response.json()) == limit
+            assert counter.count == 1
+
+@pytest.mark.asyncio
+async def test_cancel_assessment_round_trips(tmp_path):
+    async with seeded_api(tmp_path) as (http, container, counter, ids):
+        response = await http.post(f"/assessments/{ids[0]}/cancel")
+
+        assert response.status_code == 200
+        assert counter.count == 1
+
+@pytest.mark.asyncio
+async def test_queue_status_round_trips(tmp_path):
+    async with seeded_api(tmp_path) as (http, container, counter, ids):
+        response = await http.get("/queue/status")
+
+        assert response.status_code == 200
+        assert response.json()["intake"] == ASSESSMENTS
+        assert counter.count == len(AssessmentStatus)
+
+@pytest.mark.asyncio
+async def test_process_queue_checks_stages_without_extra_round_trips(tmp_path):
+    async with seeded_api(tmp_path) as (http, container, counter, ids):
+        for assessment_id in ids:
+            await container.database.update_assessment_status(assessment_id, AssessmentStatus.PROCESSING)
+        counter.reset()
+
+        # Stall checks read every active assessment's latest stage
+        await container.queue_manager._process_queue()
+
+        assert counter.count == 4  # One per queued status, no per-assessment loads
+
+@pytest.mark.asyncio
+async def test_load_profiles(tmp_path):
+    async with seeded_api(tmp_path) as (http, container, counter, ids):
+        db = container.database
+        expected = {SUMMARY: 1, WITH_LATEST_STAGE: 1, FULL: 3}
+        for profile, round_trips in expected.items():
+            counter.reset()
+            assessments = await db.get_assessments_by_status(AssessmentStatus.INTAKE, profile)
+
+            assert len(assessments) == ASSESSMENTS
+            assert counter.count == round_trips, profile
+
+        # Relationships outside the profile raise instead of querying
+        summary = await db.get_assessment(ids[0], SUMMARY)
+        with pytest.raises(InvalidRequestError):
+            summary.stages
+
+        latest = await db.get_assessment(ids[0], WITH_LATEST_STAGE)
+        assert latest.latest_stage.stage_type == STAGES[-1]
+
+        full = await db.get_assessment(ids[0], FULL)
+        assert [stage.stage_type for stage in full.stages] == ["intake", *STAGES]
+        assert full.client.external_id == "query-client"
+        assert len(full.documents) == 1
+
+        with pytest.raises(ValueError):
+            await db.get_assessment(ids[0], "everything")
+
+@pytest.mark.asyncio
+async def test_save_session_statuses_is_one_upsert(tmp_path):
+    async with seeded_api(tmp_path) as (http, container, counter, ids):
+        db = container.database
+        records = [
+            {"session_id": str(uuid4()), "status": "report_ready", "updated_at": 1700000000.0 + index}
+            for index in range(ASSESSMENTS)
+        ]
+        await db.save_session_statuses(records)
+
+        counter.reset()
+        updated = [dict(record, status="failed") for record in records]
+        await db.save_session_statuses(updated + updated[:1])
+
+        assert counter.count == 1
+        statuses = await db.get_session_statuses([UUID(record["session_id"]) for record in records])
+        assert {payload["status"] for payload in statuses.values()} == {"failed"}
+        assert len(statuses) == ASSESSMENTS
+
+@pytest.mark.asyncio
+async def test_analysis_history_keeps_one_point_per_assessment(tmp_path):
+    async with seeded_api(tmp_path) as (http, container, counter, ids):
+        db = container.database
+        full = await db.get_assessment(ids[0], FULL)
+        recorded_at = datetime(2025, 1, 1)
+        await db.add_analysis_history(full.client_id, ids[0], recorded_at, 3.0, {"independent": 5})
+
+        counter.reset()
+        await db.add_analysis_history(full.client_id, ids[0], datetime(2025, 2, 1), 6.0, {"independent": 2})
+
+        assert counter.count == 1
+        rows = await db.get_analysis_history(client_id=full.client_id)
+        assert [(row[2], row[3], row[4]) for row in rows] == [(ids[0], recorded_at, 6.0)]
+
+@pytest.mark.asyncio
+async def test_purge_session_statuses_by_age(tmp_path):
+    async with seeded_api(tmp_path) as (http, container, counter, ids):
+        db = container.database
+        old, recent = str(uuid4()), str(uuid4())
+        await db.save_session_statuses([
+            {"session_id": old, "status": "failed", "updated_at": datetime(2025, 1, 1).timestamp()},
+            {"session_id": recent, "status": "failed", "updated_at": datetime(2025, 3, 1).timestamp()}
+        ])
+
+        counter.reset()
+        assert await db.purge_session_statuses(datetime(2025, 2, 1)) == 1
+
+        assert counter.count == 1
+        assert set(await db.get_session_statuses([UUID(old), UUID(recent)])) == {UUID(recent)}
+
+@pytest.mark.asyncio
+async def test_caseload_slopes_cover_all_points_of_caseload_clients(tmp_path):
+    async with seeded_api(tmp_path) as (http, container, counter, ids):
+        db = container.database
+        full = await db.get_assessment(ids[0], FULL)
+        therapist_id, client_id = full.therapist_id, full.client_id
+        other_therapist = await db.create_therapist("other-therapist", "Other", "Therapist", {}, [], {})
+        other_client = await db.create_client("other-client", "Other", "Client", datetime(1970, 1, 1), {})
+        start = datetime(2025, 1, 1)
+        points = [
+            # The caseload's client, last seen by another therapist
+            (client_id, therapist_id, 0, 1.0, 0.2),
+            (client_id, therapist_id, 10, 2.0, 0.4),
+            (client_id, other_therapist.id, 20, 6.0, 0.3),
+            # Only ever seen by the other therapist
+            (other_client.id, other_therapist.id, 0, 1.0, 0.1),
+            (other_client.id, other_therapist.id, 10, 9.0, 0.9)
+        ]
+        for assessment_id, (client, therapist, day, risk, independent) in zip(ids, points):
+            await db.add_analysis_history(
+                client, assessment_id, start + timedelta(days=day), risk, {"independent": independent}, therapist
+            )
+
+    # regr_slope is PostgreSQL-only; run the shared query on SQLite with a stand-in
+    engine = create_engine(f"sqlite:///{tmp_path / 'api.db'}")
+    event.listen(engine, "connect", lambda connection, record: connection.create_aggregate("regr_slope", 2, RegrSlope))
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(caseload_slopes_query(therapist_id)).all()
+    finally:
+        engine.dispose()
+
+    assert [tuple(row) for row in rows] == [(client_id, 3, pytest.approx(0.25), pytest.approx(0.005))]
+
+@pytest.mark.asyncio
+async def test_coordinator_persistence_uses_the_async_service(tmp_path):
+    from agents.analysis_history import DatabaseAnalysisHistory, HistoryPoint
+    from agents.session_store import DatabaseSessionSpill
+
+    async with seeded_api(tmp_path) as (http, container, counter, ids):
+        full = await container.database.get_assessment(ids[0], FULL)
+        history = DatabaseAnalysisHistory(container.database)
+        spill = DatabaseSessionSpill(container.database)
+        point = HistoryPoint(
+            recorded_at=datetime(2025, 1, 1), risk_score=4.0, independent=6.0, unable=2.0, total_activities=10.0
+        )
+        session_id = uuid4()
+
+        counter.reset()
+        await history.save(full.client_id, ids[0], point, full.therapist_id)
+        rows = await history.load(full.client_id)
+        await spill.save([{"session_id": str(session_id), "status": "failed", "updated_at": 1700000000.0}])
+        statuses = await spill.load([session_id])
+
+        # Every statement goes through the container's engine
+        assert counter.count == 4
+        assert rows == [(full.client_id, full.therapist_id, ids[0], point.recorded_at, 4.0, 6.0, 2.0, 10.0)]
+        assert statuses[session_id]["status"] == "failed"